@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+🌐 Advisory-Client für OSV-kompatible APIs
+
+Parallele Abfragen mit Token-Bucket-Ratenbegrenzung, Wiederholung bei
+429/5xx und Cache; dazu ein lokaler Stand-in-Server auf Basis der
+Offline-Datenbank für Tests und Benchmarks.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vulndb import (VulnerabilityDatabase, VulnerabilityMatch, normalize_package_name, parse_osv_advisory,
+                    version_in_range)
+
+# 🌐 Advisory-Client für OSV-kompatible APIs
+ADVISORY_QUERY_PATH = "/v1/query"
+
+def osv_vulnerability_match(vuln: Dict, ecosystem: str, name: str, version: Optional[str]) -> Dict[str, any]:
+    """
+    📄 OSV-Vulnerability aus einer API-Antwort -> VulnerabilityMatch-Felder
+    
+    Fix-Version ist die des Bereichs, in dem die abgefragte Version liegt.
+    """
+    advisory, ranges = parse_osv_advisory(vuln)
+    package = normalize_package_name(ecosystem, name)
+    fixed_in = None
+    for _, range_name, lower, lower_inc, upper, upper_inc, fixed in ranges:
+        if range_name == package and fixed and (version is None or version_in_range(version, lower, lower_inc, upper, upper_inc)):
+            fixed_in = fixed
+            break
+    return {"advisory_id": advisory[0], "cve_id": advisory[1], "summary": advisory[2], "severity": advisory[3], "fixed_in": fixed_in}
+
+class RateLimiter:
+    """
+    ⏱️ Token-Bucket-Ratenbegrenzung (thread-safe, rate <= 0 = unbegrenzt)
+    """
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class AdvisoryCache:
+    """
+    💾 Persistenter CVE-Cache mit TTL
+    
+    Antworten der Advisory-API werden pro (Ökosystem, Package, Version)
+    gespeichert; abgelaufene Einträge werden beim Laden und Speichern entfernt.
+    """
+    
+    def __init__(self, path: str, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self.entries: Dict[str, Dict] = {}  # Schlüssel -> {fetched, vulns}
+        self.dirty = False
+        self.lock = threading.Lock()
+    
+    def load(self):
+        """📂 Lade Cache von Disk"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.evict_expired()
+    
+    def evict_expired(self):
+        """🧹 Entferne abgelaufene Einträge"""
+        deadline = time.time() - self.ttl
+        with self.lock:
+            expired = [key for key, entry in self.entries.items() if entry["fetched"] < deadline]
+            for key in expired:
+                del self.entries[key]
+            if expired:
+                self.dirty = True
+    
+    def get(self, key: str) -> Optional[List[Dict]]:
+        entry = self.entries.get(key)
+        if entry is None or entry["fetched"] < time.time() - self.ttl:
+            return None
+        return entry["vulns"]
+    
+    def put(self, key: str, vulns: List[Dict]):
+        with self.lock:
+            self.entries[key] = {"fetched": time.time(), "vulns": vulns}
+            self.dirty = True
+    
+    def save(self):
+        """💾 Speichere Cache atomar"""
+        self.evict_expired()
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self.lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            self.dirty = False
+        os.replace(tmp_path, self.path)
+
+class AdvisoryClient:
+    """
+    🌐 Nebenläufiger Client für eine OSV-kompatible Advisory-API (/v1/query)
+    
+    Abfragen laufen über einen begrenzten Thread-Pool und wiederverwendete
+    HTTP-Verbindungen (requests.Session mit Connection-Pool, ohne requests
+    eine Keep-Alive-Verbindung pro Thread). Gleiche Abfragen, die gerade
+    laufen, werden zusammengelegt; der Token-Bucket begrenzt die Rate,
+    429/5xx werden mit Backoff wiederholt. Antworten landen im AdvisoryCache.
+    Ist die API nicht erreichbar, schlagen alle weiteren Abfragen sofort fehl.
+    """
+    
+    def __init__(self, base_url: str, cache: Optional[AdvisoryCache] = None, workers: int = 8,
+                 rate_limit: float = 250.0, timeout: float = 10.0, retries: int = 3):
+        from concurrent.futures import ThreadPoolExecutor
+        from urllib.parse import urlsplit
+        
+        self.base_url = base_url.rstrip('/')
+        self.url = urlsplit(self.base_url + ADVISORY_QUERY_PATH)
+        self.cache = cache
+        self.timeout = timeout
+        self.retries = retries
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="advisory")
+        self._inflight: Dict[str, "Future"] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.unreachable = threading.Event()  # Nach Verbindungsfehlern keine weiteren Versuche
+        self.requests_sent = 0
+        
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            self.session = None
+        else:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, workers))
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self.session is not None:
+            self.session.close()
+    
+    def submit(self, ecosystem: str, name: str, version: Optional[str]) -> "Future":
+        """
+        🔍 Abfrage einplanen (Cache-Treffer und laufende gleiche Abfragen werden wiederverwendet)
+        """
+        from concurrent.futures import Future
+        
+        key = f"{ecosystem}:{name}@{version or ''}"
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self.executor.submit(self._fetch, key, ecosystem, name, version)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._inflight.pop(key, None))
+        return future
+    
+    def lookup(self, ecosystem: str, packages: Iterable[Tuple[str, Optional[str]]]) -> Dict[Tuple[str, Optional[str]], List[VulnerabilityMatch]]:
+        """
+        🔍 Alle Packages nebenläufig abfragen: (Package, Version) -> Advisories
+        """
+        futures = {package: self.submit(ecosystem, *package) for package in set(packages)}
+        results = {}
+        errors = []
+        for package, future in futures.items():
+            try:
+                vulns = future.result()
+            except Exception as error:
+                errors.append(f"{package[0]}: {error}")
+                continue
+            if vulns:
+                results[package] = [VulnerabilityMatch(**vuln) for vuln in vulns]
+        if errors:
+            raise AdvisoryLookupError(results, errors)
+        return results
+    
+    def _fetch(self, key: str, ecosystem: str, name: str, version: Optional[str]) -> List[Dict]:
+        if self.unreachable.is_set():
+            raise RuntimeError(f"Advisory-API {self.base_url} nicht erreichbar")
+        payload = {"package": {"ecosystem": ecosystem, "name": name}}
+        if version:
+            payload["version"] = version
+        
+        vulns = []
+        while True:
+            data = self._query(payload)
+            vulns.extend(osv_vulnerability_match(vuln, ecosystem, name, version) for vuln in data.get("vulns") or [])
+            if not data.get("next_page_token"):
+                break
+            payload["page_token"] = data["next_page_token"]
+        
+        if self.cache is not None:
+            self.cache.put(key, vulns)
+        return vulns
+    
+    def _query(self, payload: Dict) -> Dict:
+        delay = 0.5
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                status, body, retry_after = self._post(payload)
+            except OSError as error:
+                if attempt == self.retries or self.unreachable.is_set():
+                    self.unreachable.set()
+                    raise
+                status, body, retry_after = None, str(error), None
+            
+            if status == 200:
+                return json.loads(body)
+            if status is not None and status != 429 and status < 500:
+                raise RuntimeError(f"HTTP {status}: {body[:200]}")
+            if attempt < self.retries:
+                time.sleep(float(retry_after) if retry_after and retry_after.isdigit() else delay)
+                delay *= 2
+        raise RuntimeError(f"HTTP {status}: Anfrage nach {self.retries + 1} Versuchen aufgegeben")
+    
+    def _post(self, payload: Dict) -> Tuple[int, str, Optional[str]]:
+        # Läuft in den Pool-Threads - += ist nicht atomar
+        with self._lock:
+            self.requests_sent += 1
+        body = json.dumps(payload)
+        if self.session is not None:
+            response = self.session.post(self.url.geturl(), data=body, timeout=self.timeout,
+                                         headers={"Content-Type": "application/json"})
+            return response.status_code, response.text, response.headers.get("Retry-After")
+        
+        import http.client
+        
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.url.scheme == "https" else http.client.HTTPConnection
+            connection = self._local.connection = connection_class(self.url.netloc, timeout=self.timeout)
+        try:
+            connection.request("POST", self.url.path, body.encode('utf-8'), {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            return response.status, response.read().decode('utf-8', errors='replace'), response.getheader("Retry-After")
+        except (http.client.HTTPException, OSError) as error:
+            connection.close()
+            self._local.connection = None
+            raise OSError(str(error)) from error
+
+class AdvisoryLookupError(Exception):
+    """
+    ⚠️ Einzelne Advisory-Abfragen sind fehlgeschlagen (Teilergebnis in results)
+    """
+    
+    def __init__(self, results: Dict, errors: List[str]):
+        super().__init__(f"{len(errors)} Advisory-Abfragen fehlgeschlagen: {'; '.join(errors[:3])}")
+        self.results = results
+        self.errors = errors
+
+class AdvisoryStandInServer:
+    """
+    🧪 Lokaler Stand-in-Server mit OSV-kompatibler /v1/query-API
+    
+    Beantwortet Abfragen aus einer VulnerabilityDatabase - für Tests des
+    AdvisoryClient (Port 0 = freier Port) und als Advisory-Spiegel für
+    andere Rechner im Air-Gap-Netz.
+    """
+    
+    def __init__(self, database: VulnerabilityDatabase, host: str = "127.0.0.1", port: int = 0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        server = self
+        self.database = database
+        self.lock = threading.Lock()  # SQLite-Verbindung nur aus einem Thread gleichzeitig
+        self.requests_handled = 0
+        self.faults: List[int] = []  # Fehlerinjektion: HTTP-Status der nächsten Anfragen (mit Retry-After: 0)
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Header und Body getrennt geschrieben - sonst Delayed-ACK-Pausen
+            
+            def do_POST(self):
+                if self.path != ADVISORY_QUERY_PATH:
+                    self.send_error(404)
+                    return
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                fault = server.next_fault()
+                if fault is not None:
+                    self.send_response(fault)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                try:
+                    query = json.loads(raw)
+                    body = json.dumps(server.query(query)).encode('utf-8')
+                except (ValueError, KeyError, TypeError) as error:
+                    self.send_error(400, str(error))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def next_fault(self) -> Optional[int]:
+        """💥 Nächsten injizierten Fehlerstatus entnehmen (None = normal antworten)"""
+        with self.lock:
+            return self.faults.pop(0) if self.faults else None
+    
+    def query(self, query: Dict) -> Dict:
+        """🔍 /v1/query beantworten"""
+        ecosystem, name = query["package"]["ecosystem"], query["package"]["name"]
+        version = query.get("version")
+        with self.lock:
+            self.requests_handled += 1
+            matches = self.database.lookup(ecosystem, [(name, version)]).get((name, version), [])
+        return {"vulns": [
+            {
+                "id": match.advisory_id,
+                "aliases": [match.cve_id] if match.cve_id != match.advisory_id else [],
+                "summary": match.summary,
+                "database_specific": {"severity": match.severity.upper()},
+                "affected": [{
+                    "package": {"ecosystem": ecosystem, "name": name},
+                    "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}] + (
+                        [{"fixed": match.fixed_in}] if match.fixed_in else []
+                    )}]
+                }]
+            }
+            for match in matches
+        ]}
+    
+    def start(self) -> "AdvisoryStandInServer":
+        """▶️ Im Hintergrund-Thread starten"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+📌 Bekannte Findings: Inline-Unterdrückungen und Baseline
+
+Unterdrückungen im Quelltext (security-audit: ignore...), stabile
+Fingerprints und die committete Baseline-Datei für den Neu-Findings-Modus.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import re
+import json
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+from models import SecurityIssue
+
+# 🤫 Unterdrückungen im Quelltext (in einem beliebigen Kommentar):
+#   <Marker> ignore            - Findings dieser Zeile
+#   <Marker> ignore-next-line  - Findings der folgenden Zeile
+#   <Marker> ignore-file       - Findings der ganzen Datei
+# Optional nur bestimmte Regeln: ignore[VUL-012, QUA-004]
+SUPPRESSION_MARKER = "security-audit:"
+_SUPPRESSION_PATTERN = re.compile(re.escape(SUPPRESSION_MARKER) + r"\s*(ignore(?:-next-line|-file)?)(?:\[([^\]]*)\])?")
+
+class Suppressions:
+    """
+    🤫 Unterdrückungen einer Datei: Zeilennummer (0 = ganze Datei) -> Regel-IDs (None = alle)
+    """
+    
+    def __init__(self):
+        self.lines: Dict[int, Optional[FrozenSet[str]]] = {}
+    
+    def add(self, line_num: int, rule_ids: Optional[FrozenSet[str]]):
+        current = self.lines.get(line_num, frozenset())
+        self.lines[line_num] = None if rule_ids is None or current is None else current | rule_ids
+    
+    def suppressed(self, rule_id: Optional[str], line_num: int) -> bool:
+        """
+        🤫 Ist ein Finding der Regel in dieser Zeile unterdrückt?
+        """
+        for key in (0, line_num):
+            if key in self.lines:
+                rule_ids = self.lines[key]
+                if rule_ids is None or rule_id in rule_ids:
+                    return True
+        return False
+
+def find_suppressions(lines: Iterable[str]) -> Optional[Suppressions]:
+    """
+    🤫 Unterdrückungen in Zeilen finden (None wenn keine vorhanden)
+    """
+    suppressions = None
+    targets = {"ignore": 0, "ignore-next-line": 1}
+    for line_num, line in enumerate(lines, 1):
+        if SUPPRESSION_MARKER not in line:
+            continue
+        for match in _SUPPRESSION_PATTERN.finditer(line):
+            kind, rule_list = match.groups()
+            rule_ids = frozenset(filter(None, (rule_id.strip() for rule_id in rule_list.split(',')))) if rule_list else None
+            if suppressions is None:
+                suppressions = Suppressions()
+            suppressions.add(line_num + targets[kind] if kind in targets else 0, rule_ids)
+    return suppressions
+
+def parse_suppressions(content) -> Optional[Suppressions]:
+    """
+    🤫 Unterdrückungen eines Datei-Inhalts (str, Bytes oder mmap)
+    
+    Ohne Marker im Inhalt (der Normalfall) kostet das eine einzige Suche.
+    """
+    if isinstance(content, str):
+        if SUPPRESSION_MARKER not in content:
+            return None
+        return find_suppressions(content.split('\n'))
+    if content.find(SUPPRESSION_MARKER.encode('ascii')) < 0:
+        return None
+    return find_suppressions(content[:].decode('utf-8', errors='ignore').split('\n'))
+
+# 📌 Baseline bekannter Findings (Neu-Findings-Modus)
+BASELINE_VERSION = 2
+# Version 1 enthielt zusätzlich die Meldung - Fingerprints sind identisch, Laden bleibt möglich
+BASELINE_COMPATIBLE_VERSIONS = (1, BASELINE_VERSION)
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+def issue_fingerprint(issue: SecurityIssue, line_text: Optional[str], occurrence: int = 0) -> str:
+    """
+    📌 Stabiler Fingerprint eines Findings: Regel, Pfad, normalisierter Zeileninhalt
+    
+    Die Zeilennummer geht nicht ein - verschobener Code bleibt bekannt.
+    occurrence zählt gleiche Zeilen derselben Regel in einer Datei durch.
+    Ohne Zeileninhalt (z.B. CVE-Findings ohne Zeile) zählt die Meldung.
+    """
+    import hashlib
+    
+    rule = issue.rule_id or issue.cve_id or issue.type
+    path = os.path.normpath(issue.file).replace(os.sep, '/')
+    content = _WHITESPACE_RUN.sub(' ', line_text).strip() if line_text is not None else issue.message
+    return hashlib.sha256(f"{rule}\0{path}\0{content}\0{occurrence}".encode('utf-8')).hexdigest()[:20]
+
+class FindingBaseline:
+    """
+    📌 Baseline-Datei: Fingerprints bekannter Findings als Set (O(1)-Lookup)
+    
+    Die Datei wird committet; neben dem Fingerprint stehen nur Regel, Datei
+    und Zeile, damit Änderungen im Review lesbar bleiben. Meldungen (z.B.
+    gekürzte Secret-Treffer) werden bewusst nicht gespeichert.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.fingerprints: Set[str] = set()
+    
+    def load(self) -> bool:
+        """
+        📂 Lade Baseline (False wenn keine Datei vorhanden ist)
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        if data.get("version") not in BASELINE_COMPATIBLE_VERSIONS:
+            raise ValueError(f"{self.path}: Baseline-Version {data.get('version')} nicht unterstützt")
+        self.fingerprints = {entry["fingerprint"] for entry in data["findings"]}
+        return True
+    
+    def save(self, issues: Iterable[SecurityIssue], fingerprints: Iterable[str]):
+        """
+        💾 Baseline atomar schreiben (sortiert nach Datei, diff-freundlich)
+        """
+        findings = sorted(
+            (
+                {
+                    "fingerprint": fingerprint,
+                    "rule_id": issue.rule_id or issue.cve_id or issue.type,
+                    "file": os.path.normpath(issue.file).replace(os.sep, '/'),
+                    "line": issue.line,
+                }
+                for issue, fingerprint in zip(issues, fingerprints)
+            ),
+            key=itemgetter("file", "rule_id", "fingerprint")
+        )
+        self.fingerprints = {finding["fingerprint"] for finding in findings}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": BASELINE_VERSION, "created": datetime.now().isoformat(), "findings": findings}, f, indent=1)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+    
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.fingerprints
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark-Suite für den Security-Audit-Agenten
+
+Erzeugt einen reproduzierbaren, synthetischen Quellbaum (gemischte Sprachen,
+Lockfiles, minifizierte Bundles, platzierte Secrets, pathologisch lange
+Zeilen) und misst die einzelnen Phasen des Agenten:
+- find_files_to_scan (Datei-Walk)
+- scan_secrets / scan_vulnerabilities / scan_code_quality (je Regel-Typ)
+- scan_files (kombinierter Scan wie in run())
+- Vulnerability-Datenbank-Import und scan_dependencies
+- generate_result + save_report
+- Start: Import von run.py + SecurityAuditAgent() in einem frischen Interpreter
+
+Ausgabe ist JSON (Dateien/s, MB/s, Peak-RSS, Zeit pro Phase). Mit einer
+committeten Baseline werden Regressionen erkannt: Laufzeiten werden relativ
+zu einer Kalibrierungs-Schleife verglichen (maschinenunabhängiger), die
+Anzahl der Findings muss exakt übereinstimmen. Beim Start dürfen keine
+schweren Module (subprocess, hashlib, sqlite3, multiprocessing, logging, ...)
+geladen werden - sie werden erst in den Funktionen importiert, die sie brauchen.
+
+Verwendung:
+    python agents/security-audit/benchmark.py                      # Report auf stdout
+    python agents/security-audit/benchmark.py --baseline agents/security-audit/benchmark-baseline.json
+    python agents/security-audit/benchmark.py --write-baseline agents/security-audit/benchmark-baseline.json
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import sys
+import json
+import py_compile
+import random
+import shutil
+import tempfile
+import time
+import contextlib
+import logging
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run import SecurityAuditAgent, SecurityConfig  # noqa: E402
+
+BENCHMARK_VERSION = 1
+
+# 📁 Korpus-Profile: Anzahl Dateien pro Art
+CORPUS_PROFILES = {
+    "small": {"source": 300, "minified": 3, "long_lines": 3, "lockfile_packages": 1500},
+    "medium": {"source": 1500, "minified": 10, "long_lines": 10, "lockfile_packages": 5000},
+    "large": {"source": 6000, "minified": 30, "long_lines": 30, "lockfile_packages": 20000},
+}
+
+# Vorlagen für platzierte Secrets ({token} wird zufällig befüllt)
+PLANTED_SECRETS = [
+    "api_key = 'sk_live_{token}'",
+    "const token = \"ghp_{token}\"",
+    "password = \"sk_{token}\"",
+    "AWS_KEY: access_token = 'AKIA{token}'",
+]
+
+# Module, die beim Import von run.py + SecurityAuditAgent() nicht geladen sein dürfen
+# (inklusive der Teilsysteme neben run.py, die nur einzelne Modi brauchen)
+STARTUP_LAZY_MODULES = ["subprocess", "hashlib", "sqlite3", "multiprocessing", "concurrent.futures",
+                        "http.client", "socket", "socketserver", "ctypes", "mmap", "logging",
+                        "pathlib", "requests", "fnmatch", "tempfile", "numpy",
+                        "vulndb", "advisory", "history", "scan_server", "watcher"]
+
+WORDS = ["user", "order", "invoice", "session", "config", "result", "value", "item", "cache", "report",
+         "customer", "payload", "handler", "service", "client", "request", "response", "token", "record"]
+
+def _identifier(rng: random.Random) -> str:
+    return f"{rng.choice(WORDS)}_{rng.choice(WORDS)}{rng.randint(0, 99)}"
+
+def _python_file(rng: random.Random, lines: int) -> List[str]:
+    out = ["import os", "import json", ""]
+    while len(out) < lines:
+        name = _identifier(rng)
+        out += [
+            f"def {name}(data):",
+            f"    \"\"\"{rng.choice(WORDS)} verarbeiten\"\"\"",
+            f"    {_identifier(rng)} = data.get('{rng.choice(WORDS)}', {rng.randint(0, 999)})",
+            f"    if {_identifier(rng)} > {rng.randint(0, 50)}:",
+            f"        return json.dumps({{'{rng.choice(WORDS)}': {_identifier(rng)}}})",
+            "    return None",
+            "",
+        ]
+        if rng.random() < 0.15:
+            out.append(f"print('{rng.choice(WORDS)}')  # TODO: entfernen")
+        if rng.random() < 0.05:
+            out.append(f"cursor.execute(\"SELECT * FROM {rng.choice(WORDS)} WHERE id = '\" + {_identifier(rng)} + \"'\")")
+    return out
+
+def _ts_file(rng: random.Random, lines: int) -> List[str]:
+    out = ["import { useState } from 'react';", ""]
+    while len(out) < lines:
+        name = _identifier(rng)
+        out += [
+            f"export function {name}(props: {{ {rng.choice(WORDS)}: string }}) {{",
+            f"  const [{_identifier(rng)}, set{rng.choice(WORDS).title()}] = useState<number>({rng.randint(0, 9)});",
+            f"  const {_identifier(rng)} = props.{rng.choice(WORDS)}.trim();",
+            f"  return <div className=\"{rng.choice(WORDS)}\">{{{_identifier(rng)}}}</div>;",
+            "}",
+            "",
+        ]
+        if rng.random() < 0.2:
+            out.append(f"console.log('{rng.choice(WORDS)}', {_identifier(rng)});")
+        if rng.random() < 0.05:
+            out.append(f"element.innerHTML = '<b>' + {_identifier(rng)};")
+    return out
+
+def _yaml_file(rng: random.Random, lines: int) -> List[str]:
+    out = ["version: 1", "services:"]
+    while len(out) < lines:
+        out += [f"  {rng.choice(WORDS)}:", f"    image: {rng.choice(WORDS)}:{rng.randint(1, 9)}.{rng.randint(0, 9)}",
+                f"    replicas: {rng.randint(1, 5)}"]
+    return out
+
+def _package_lock(rng: random.Random, packages: int) -> Dict:
+    entries = {"": {"name": "benchmark", "version": "1.0.0"}}
+    for index in range(packages):
+        name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{index}"
+        path = f"node_modules/{name}" if rng.random() < 0.8 else f"node_modules/{rng.choice(WORDS)}/node_modules/{name}"
+        entries[path] = {"version": f"{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 30)}",
+                         "resolved": f"https://registry.npmjs.org/{name}/-/{name}.tgz", "integrity": "sha512-x"}
+    return {"name": "benchmark", "version": "1.0.0", "lockfileVersion": 3, "requires": True, "packages": entries}
+
+def generate_corpus(root: str, profile: str = "small", seed: int = 42) -> Dict[str, int]:
+    """
+    🏗️ Erzeuge einen reproduzierbaren Quellbaum unter root
+    
+    Liefert Eckdaten (Dateien, Bytes, platzierte Secrets, Advisory-Treffer).
+    """
+    rng = random.Random(seed)
+    sizes = CORPUS_PROFILES[profile]
+    planted = 0
+    
+    def write(path: str, content: str):
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(content)
+    
+    generators = [(".py", _python_file), (".ts", _ts_file), (".tsx", _ts_file), (".js", _ts_file), (".yml", _yaml_file)]
+    for index in range(sizes["source"]):
+        extension, generator = generators[index % len(generators)]
+        directory = f"src/{rng.choice(WORDS)}/{rng.choice(WORDS)}"
+        lines = generator(rng, rng.randint(20, 400))
+        if rng.random() < 0.1:
+            secret = rng.choice(PLANTED_SECRETS).format(token=''.join(rng.choice("abcdef0123456789") for _ in range(24)))
+            lines.insert(rng.randint(0, len(lines)), secret)
+            planted += 1
+        write(f"{directory}/{extension[1:]}_{index}{extension}", "\n".join(lines) + "\n")
+    
+    # Minifizierte Bundles: eine sehr lange Zeile
+    for index in range(sizes["minified"]):
+        statements = [f"var {_identifier(rng)}=function(e){{return e.{rng.choice(WORDS)}+{rng.randint(0, 99)}}};"
+                      for _ in range(rng.randint(3000, 8000))]
+        write(f"dist/bundle.{index}.min.js", "".join(statements))
+    
+    # Pathologisch lange Zeilen mit vielen Beinahe-Treffern
+    for index in range(sizes["long_lines"]):
+        near_misses = [
+            "password = '" + "x" * 5000,
+            "execute('" + "' + '".join(rng.choice(WORDS) for _ in range(2000)),
+            "innerHTML = " + " + ".join(rng.choice(WORDS) for _ in range(3000)),
+            " ".join(f"token{index}=" for index in range(4000)),
+        ]
+        write(f"src/generated/long_{index}.ts", "\n".join(near_misses) + "\n")
+    
+    # Ignorierte Verzeichnisse (dürfen nicht gescannt werden)
+    for index in range(50):
+        write(f"node_modules/pkg{index}/index.js", "\n".join(_ts_file(rng, 50)))
+    
+    # Lockfiles und Manifeste
+    lock = _package_lock(rng, sizes["lockfile_packages"])
+    write("package-lock.json", json.dumps(lock, indent=2))
+    write("frontend/package-lock.json", json.dumps(lock, indent=2))  # identischer Inhalt (Deduplizierung)
+    write("requirements.txt", "\n".join(f"{rng.choice(WORDS)}-{index}=={rng.randint(0, 5)}.{rng.randint(0, 9)}"
+                                        for index in range(200)) + "\nrequests==2.25.0\n")
+    
+    # Advisory-Feed: Treffer für einige Packages aus dem Lockfile
+    vulnerable = [path.rsplit("node_modules/", 1)[1] for path in list(lock["packages"])[1::97]]
+    advisories = [
+        {"id": f"GHSA-bench-{index}", "aliases": [f"CVE-2099-{index}"], "summary": "Benchmark-Advisory",
+         "database_specific": {"severity": "HIGH"},
+         "affected": [{"package": {"ecosystem": "npm", "name": name}, "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}, {"fixed": "99.0.0"}]}]}]}
+        for index, name in enumerate(vulnerable)
+    ]
+    advisories.append({"id": "GHSA-bench-py", "summary": "Benchmark-Advisory", "affected": [
+        {"package": {"ecosystem": "PyPI", "name": "requests"}, "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "2.31.0"}]}]}]})
+    write("security-advisories/osv.json", json.dumps(advisories))
+    write(".scanignore", "security-advisories/\n")
+    
+    total_files = total_bytes = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            total_files += 1
+            total_bytes += os.path.getsize(os.path.join(directory, name))
+    return {"files": total_files, "bytes": total_bytes, "planted_secrets": planted, "advisories": len(advisories)}
+
+def peak_rss_kb() -> Optional[int]:
+    """📈 Peak-RSS des Prozesses in KiB (None ohne resource-Modul, z.B. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def calibrate() -> float:
+    """
+    ⚖️ Feste Referenz-Arbeitslast (Regex + Python-Schleifen) - Maßstab für relative Zeiten
+    """
+    import re
+    
+    pattern = re.compile(r"(?i)api_key\s*=\s*['\"][^'\"]+['\"]")
+    lines = [f"value_{index} = compute({index}, 'x' * {index % 17})" for index in range(20000)]
+    start = time.perf_counter()
+    for _ in range(10):
+        hits = 0
+        for line in lines:
+            if pattern.search(line):
+                hits += 1
+        sorted(lines, key=len)
+    return time.perf_counter() - start
+
+def measure_startup(repeat: int = 5) -> Dict:
+    """
+    🚀 Startzeit: frischer Interpreter mit Import von run.py + SecurityAuditAgent()
+    
+    Gemessen wird der Aufpreis gegenüber einem leeren Interpreter (schnellster
+    von repeat Läufen) und welche schweren Module dabei eager geladen werden.
+    """
+    agent_dir = os.path.dirname(os.path.abspath(__file__))
+    probe = (f"import sys; sys.path.insert(0, {agent_dir!r}); import run; run.SecurityAuditAgent(); "
+             f"print(','.join(m for m in {STARTUP_LAZY_MODULES!r} if m in sys.modules))")
+    
+    def best_of(code: str) -> Tuple[float, str]:
+        best, output = None, ""
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output.strip()
+    
+    # Bytecode-Cache von run.py und seinen Modulen anlegen (auch bei PYTHONDONTWRITEBYTECODE)
+    for name in sorted(os.listdir(agent_dir)):
+        if name.endswith(".py") and not name.startswith("test_"):
+            py_compile.compile(os.path.join(agent_dir, name))
+    interpreter, _ = best_of("pass")
+    startup, eager = best_of(probe)
+    return {
+        "interpreter_ms": round(interpreter * 1000, 2),
+        "import_ms": round((startup - interpreter) * 1000, 2),
+        "relative": round((startup - interpreter) / interpreter, 4),
+        "eager_modules": eager.split(",") if eager else [],
+    }
+
+def run_benchmark(corpus: str, workdir: str, jobs: int = 1) -> Dict[str, Dict]:
+    """
+    ⏱️ Miss alle Phasen einmal auf einem erzeugten Korpus
+    """
+    phases: Dict[str, Dict] = {}
+    
+    def record(name: str, seconds: float, files: int = 0, size: int = 0, issues: Optional[int] = None):
+        phases[name] = {
+            "seconds": round(seconds, 6),
+            "files_per_s": round(files / seconds, 1) if files and seconds else None,
+            "mb_per_s": round(size / seconds / (1024 * 1024), 2) if size and seconds else None,
+            "issues": issues,
+            "peak_rss_kb": peak_rss_kb(),
+        }
+    
+    os.makedirs(os.path.join(workdir, "logs"), exist_ok=True)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        config = SecurityConfig(
+            jobs=jobs, cache_path=None, auto_block=False,
+            vulnerability_feeds=[os.path.join(corpus, "security-advisories")],
+            vulnerability_db_path=os.path.join(workdir, "vulndb.sqlite"),
+        )
+        agent = SecurityAuditAgent(config)
+        logging.getLogger().setLevel(logging.WARNING)
+        agent.logger.setLevel(logging.WARNING)
+        
+        # 1. Datei-Walk
+        start = time.perf_counter()
+        files = list(agent.iter_files_to_scan(corpus))
+        record("find_files_to_scan", time.perf_counter() - start, len(files))
+        manifests = agent.manifests
+        total_bytes = sum(os.path.getsize(path) for path in files)
+        
+        # 2. Einzelne Regel-Typen auf vorab gelesenen Zeilen
+        contents = []
+        for path in files:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                contents.append((path, f.read().split('\n')))
+        for phase in ("scan_secrets", "scan_vulnerabilities", "scan_code_quality"):
+            method = getattr(agent, phase)
+            agent.get_engines({"scan_secrets": "secret", "scan_vulnerabilities": "vulnerability",
+                               "scan_code_quality": "code_quality"}[phase])
+            before = len(agent.results)
+            start = time.perf_counter()
+            for path, lines in contents:
+                method(path, lines)
+            record(phase, time.perf_counter() - start, len(files), total_bytes, len(agent.results) - before)
+        del contents
+        
+        # 3. Kombinierter Datei-Scan wie in run()
+        agent = SecurityAuditAgent(config)
+        agent.logger.setLevel(logging.WARNING)
+        agent.get_engines()
+        start = time.perf_counter()
+        scanned = agent.scan_files(files)
+        record("scan_files", time.perf_counter() - start, scanned, total_bytes, len(agent.results))
+        
+        # 4. Dependencies: Datenbank-Import (einmalig) und Abfrage
+        start = time.perf_counter()
+        agent.open_vulnerability_db()
+        record("vulndb_import", time.perf_counter() - start)
+        agent.manifests = manifests
+        before = len(agent.results)
+        start = time.perf_counter()
+        agent.scan_dependencies()
+        record("scan_dependencies", time.perf_counter() - start, len(agent.manifests), issues=len(agent.results) - before)
+        
+        # 5. Ergebnis und Report
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result = agent.generate_result()
+            agent.save_report(result)
+        record("save_report", time.perf_counter() - start, issues=result.total_issues)
+    finally:
+        os.chdir(previous_cwd)
+    
+    return phases
+
+def benchmark(profile: str = "small", seed: int = 42, repeat: int = 3, jobs: int = 1) -> Dict:
+    """
+    ⏱️ Korpus erzeugen und Phasen repeat-mal messen (pro Phase zählt der schnellste Lauf)
+    """
+    tmp = tempfile.mkdtemp(prefix="security-audit-bench-")
+    try:
+        corpus = os.path.join(tmp, "corpus")
+        corpus_info = generate_corpus(corpus, profile, seed)
+        calibration = min(calibrate() for _ in range(3))
+        
+        runs = []
+        for index in range(repeat):
+            workdir = os.path.join(tmp, f"work-{index}")
+            runs.append(run_benchmark(corpus, workdir, jobs))
+        
+        phases = {}
+        for name in runs[0]:
+            best = min((run[name] for run in runs), key=lambda phase: phase["seconds"])
+            phases[name] = dict(best, relative=round(best["seconds"] / calibration, 4))
+        
+        return {
+            "version": BENCHMARK_VERSION,
+            "profile": profile,
+            "seed": seed,
+            "repeat": repeat,
+            "jobs": jobs,
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "corpus": corpus_info,
+            "calibration_seconds": round(calibration, 6),
+            "total_seconds": round(sum(phase["seconds"] for phase in phases.values()), 6),
+            "peak_rss_kb": peak_rss_kb(),
+            "phases": phases,
+            "startup": measure_startup(),
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    📊 Regressionen gegenüber der Baseline (leere Liste = keine)
+    
+    Zeiten werden relativ zur Kalibrierung verglichen; Findings müssen exakt gleich sein.
+    Die Startzeit wird relativ zum leeren Interpreter verglichen.
+    """
+    problems = []
+    for key in ("profile", "seed"):
+        if report[key] != baseline.get(key):
+            problems.append(f"Baseline passt nicht: {key} {baseline.get(key)} != {report[key]}")
+    if problems:
+        return problems
+    
+    for name, expected in baseline["phases"].items():
+        actual = report["phases"].get(name)
+        if actual is None:
+            problems.append(f"{name}: Phase fehlt")
+            continue
+        if expected.get("issues") is not None and actual["issues"] != expected["issues"]:
+            problems.append(f"{name}: {actual['issues']} Findings statt {expected['issues']}")
+        limit = expected["relative"] * (1 + tolerance)
+        # Sehr kurze Phasen schwanken stark - erst ab 50 ms Laufzeit bewerten
+        if actual["relative"] > limit and actual["seconds"] > 0.05:
+            problems.append(f"{name}: {actual['relative']:.3f} statt <= {limit:.3f} (relativ zur Kalibrierung, "
+                            f"{actual['seconds']:.3f}s)")
+    
+    startup = report["startup"]
+    if startup["eager_modules"]:
+        problems.append(f"startup: schwere Module beim Import geladen: {', '.join(startup['eager_modules'])}")
+    expected = baseline.get("startup")
+    if expected:
+        limit = expected["relative"] * (1 + tolerance)
+        if startup["relative"] > limit:
+            problems.append(f"startup: {startup['relative']:.3f} statt <= {limit:.3f} (relativ zum Interpreter-Start, "
+                            f"{startup['import_ms']:.1f} ms)")
+    return problems
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="⏱️ Benchmark für den Security-Audit-Agenten")
+    parser.add_argument("--profile", choices=sorted(CORPUS_PROFILES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Messläufe pro Phase (schnellster zählt)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker-Prozesse für scan_files")
+    parser.add_argument("--output", "-o", metavar="PATH", help="Report zusätzlich als JSON-Datei schreiben")
+    parser.add_argument("--baseline", metavar="PATH", help="Mit Baseline vergleichen (Exit-Code 1 bei Regression)")
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="Erlaubte relative Verlangsamung gegenüber der Baseline (1.0 = doppelt so langsam)")
+    parser.add_argument("--write-baseline", metavar="PATH", help="Report als neue Baseline speichern")
+    parser.add_argument("--generate", metavar="DIR", help="Nur den Korpus erzeugen (kein Benchmark)")
+    args = parser.parse_args(argv)
+    
+    if args.generate:
+        print(json.dumps(generate_corpus(args.generate, args.profile, args.seed), indent=2))
+        return 0
+    
+    report = benchmark(args.profile, args.seed, args.repeat, args.jobs)
+    output = json.dumps(report, indent=2)
+    print(output)
+    for path in filter(None, (args.output, args.write_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            problems = compare_to_baseline(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"❌ Regression: {problem}", file=sys.stderr)
+        if problems:
+            return 1
+        print("✅ Keine Regression gegenüber der Baseline", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+🔌 Schlanker Client für den Security-Audit-Scan-Server
+
+Commit-Hooks schicken gestagte Pfade an den laufenden Scan-Server
+(python agents/security-audit/run.py --serve) und bekommen Verdict und
+Issues zurück - ohne run.py zu importieren oder Regeln zu kompilieren.
+Läuft kein Server (oder gehört er zu einem anderen Repository), wird
+in-process gescannt; die Antwort hat dasselbe Format.
+
+Verwendung:
+    python agents/security-audit/client.py                  # gestagte Dateien
+    python agents/security-audit/client.py --staged-lines   # nur hinzugefügte Zeilen
+    python agents/security-audit/client.py --files a.py b.js
+
+Exit-Code 1, wenn der Scan blockiert (kritische Issues) oder nicht bestanden ist.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import sys
+import json
+import socket
+from typing import Dict, List, Optional
+
+# Wie scan_server.SCAN_SOCKET_PATH (hier dupliziert, damit run.py nicht importiert wird)
+SCAN_SOCKET_PATH = ".security-audit-cache/scan.sock"
+RESPONSE_TIMEOUT = 60.0  # Sekunden (Server arbeitet Anfragen nacheinander ab)
+
+def request_scan(request: Dict[str, any], socket_path: str = SCAN_SOCKET_PATH,
+                 timeout: float = RESPONSE_TIMEOUT) -> Optional[Dict[str, any]]:
+    """
+    🔌 Anfrage an den Scan-Server (None wenn keiner erreichbar ist oder er ablehnt)
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+            with sock.makefile('rb') as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+    
+    response = json.loads(line) if line else None
+    if response is None or "error" in response:
+        return None
+    return response
+
+def scan_in_process(request: Dict[str, any]) -> Dict[str, any]:
+    """
+    🐍 Fallback ohne Server: Agent im eigenen Prozess
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from run import SecurityAuditAgent, load_security_config
+    
+    return SecurityAuditAgent(load_security_config()).handle_scan_request(request)
+
+def scan(scope: str = "staged", paths: Optional[List[str]] = None,
+         socket_path: str = SCAN_SOCKET_PATH) -> Dict[str, any]:
+    """
+    🔍 Pfade prüfen lassen - über den Server, sonst in-process
+    
+    Die Antwort enthält zusätzlich "server": True/False.
+    """
+    request = {"op": "scan", "scope": scope, "cwd": os.getcwd()}
+    if paths is not None:
+        request["paths"] = paths
+    
+    response = request_scan(request, socket_path)
+    if response is not None:
+        response["server"] = True
+        return response
+    response = scan_in_process(request)
+    response["server"] = False
+    return response
+
+def print_verdict(response: Dict[str, any]):
+    """
+    📊 Kurzes Verdict für die Hook-Ausgabe
+    """
+    for issue in response["issues"]:
+        if issue["severity"] in ("critical", "high"):
+            print(f"  🚨 {issue['file']}:{issue['line']} [{issue['severity']}] {issue['message']}")
+    source = "Scan-Server" if response.get("server") else "in-process"
+    status = "❌ BLOCKIERT" if response["blocked"] else ("✅ BESTANDEN" if response["passed"] else "⚠️ NICHT BESTANDEN")
+    print(f"🛡️ Security-Scan ({source}): {response['files_scanned']} Dateien, {response['total_issues']} Issues "
+          f"({response['critical_issues']} kritisch, {response['high_issues']} hoch) - {status}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="🔌 Security-Audit-Client für Commit-Hooks")
+    parser.add_argument("--staged-lines", action="store_true",
+                        help="Nur hinzugefügte Zeilen gestagter Dateien prüfen")
+    parser.add_argument("--files", nargs="+", metavar="PATH",
+                        help="Diese Dateien im Arbeitsverzeichnis prüfen statt des Git-Index")
+    parser.add_argument("--socket", default=SCAN_SOCKET_PATH,
+                        help=f"Socket des Scan-Servers (Standard: {SCAN_SOCKET_PATH})")
+    parser.add_argument("--json", action="store_true",
+                        help="Antwort als JSON ausgeben")
+    args = parser.parse_args(argv)
+    
+    if args.files:
+        response = scan("files", args.files, args.socket)
+    else:
+        response = scan("staged-lines" if args.staged_lines else "staged", socket_path=args.socket)
+    
+    if args.json:
+        print(json.dumps(response, indent=2))
+    else:
+        print_verdict(response)
+    return 1 if response["blocked"] or not response["passed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+🎲 Secret-Erkennung über Indikatoren und Entropie
+
+Zugewiesene String-Literale werden batchweise nach Shannon-Entropie und
+Zeichenklassen bewertet (mit numpy, falls installiert und der Scan groß
+genug ist).
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import re
+from typing import List, Tuple
+
+from models import DEFAULT_SECRET_NAMES
+from rule_engine import keyword_trie_pattern
+
+# 🔐 Typische Präfixe echter Secrets (case-sensitive)
+SECRET_INDICATORS = [
+    'sk_', 'pk_', 'AKIA', 'ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_',
+    'AIza', 'ya29.', '1//', '4/0A', 'AIzaSy'
+]
+
+# Alle Indikatoren in einem Suchdurchlauf
+SECRET_INDICATOR_MATCHER = re.compile(keyword_trie_pattern(sorted(SECRET_INDICATORS)))
+
+# 🎲 Entropie-Erkennung: zugewiesene String-Literale werden nach Shannon-Entropie
+# (Bit pro Byte) und Zeichenklassen bewertet
+ENTROPY_RULE_ID = "ENT-001"
+ENTROPY_CANDIDATE_PATTERN = r"[:=]\s*['\"]([A-Za-z0-9+/=_\-.~]{20,})['\"]"
+ENTROPY_MIN_LENGTH = 16
+ENTROPY_KEYWORD_THRESHOLD = 3.0  # Wert unter einem Secret-Namen (Regel-Anker oder Schlüsselwort im Namen)
+ENTROPY_THRESHOLD = 4.5          # Wert unter beliebigem Namen (zusätzlich Klein-, Großbuchstaben und Ziffern)
+# numpy lohnt ab ENTROPY_NUMPY_MIN_BATCH Token pro Batch (gemessen: 8 Token 62 µs statt 116 µs in Python,
+# 1 Token 44 µs statt 15 µs). Der Import (~130 ms) spart sich erst nach ENTROPY_NUMPY_MIN_TOKENS bewerteten
+# Token im Prozess ein (~8 µs pro Token) - Commit-Hook und kleine Repos bleiben in reinem Python.
+ENTROPY_NUMPY_MIN_BATCH = 8
+ENTROPY_NUMPY_MIN_TOKENS = 16384
+ENTROPY_NUMPY_CHUNK = 4096       # Token pro Histogramm-Matrix (4096 x 256 Zähler)
+# Namen, deren Werte hohe Entropie haben, aber keine Secrets sind (Hashes, IDs, URLs)
+ENTROPY_IGNORED_NAMES = ("integrity", "hash", "checksum", "digest", "sha", "resolved", "url", "uri",
+                         "href", "src", "path", "file", "version", "uuid", "guid", "etag", "commit",
+                         "datei", "pfad")
+ENTROPY_PLACEHOLDERS = ("example", "placeholder", "changeme", "your", "xxxx", "dummy", "sample",
+                        "abcdefgh", "12345678")
+
+# Zeichenklassen als Bitmaske pro Byte
+CHAR_LOWER, CHAR_UPPER, CHAR_DIGIT, CHAR_OTHER, CHAR_NON_HEX, CHAR_NOISE = 1, 2, 4, 8, 16, 32
+_CHAR_CLASSES = bytes(
+    (CHAR_LOWER if 97 <= byte <= 122 else CHAR_UPPER if 65 <= byte <= 90 else CHAR_DIGIT if 48 <= byte <= 57 else CHAR_OTHER)
+    | (0 if chr(byte) in "0123456789abcdefABCDEF" else CHAR_NON_HEX)
+    | (CHAR_NOISE if byte < 33 or byte > 126 or chr(byte) in "$%{}<>:\\`" else 0)
+    for byte in range(256)
+)
+
+_SECRET_KEYWORD_MATCHER = re.compile(keyword_trie_pattern(sorted(set(DEFAULT_SECRET_NAMES) | {"passw", "pwd", "private"})), re.IGNORECASE)
+_ENTROPY_IGNORED_MATCHER = re.compile(keyword_trie_pattern(sorted(ENTROPY_IGNORED_NAMES)), re.IGNORECASE)
+_ENTROPY_PLACEHOLDER_MATCHER = re.compile(keyword_trie_pattern(sorted(ENTROPY_PLACEHOLDERS)), re.IGNORECASE)
+# Name und Wert der Zuweisung am Ende eines Treffers (name = "wert", "name": "wert")
+_ASSIGNED_VALUE = re.compile(r"([\w.\-]*)['\"]?\s*[:=]\s*['\"]([^'\"]*)['\"]$")
+
+# numpy ist optional: None = noch nicht geprüft, False = nicht installiert
+_numpy = None
+# Im Prozess bisher bewertete Token (für ENTROPY_NUMPY_MIN_TOKENS)
+_scored_tokens = 0
+
+def optional_numpy():
+    """
+    🔢 numpy-Modul (beim ersten Aufruf importiert) oder None
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            _numpy = False
+        else:
+            _numpy = numpy
+    return _numpy or None
+
+def secret_candidate(match: "re.Match") -> Tuple[str, str]:
+    """
+    🔑 Name und Wert der zugewiesenen Zeichenkette eines Secret-Treffers
+    
+    Der Name steht bei Entropie-Treffern vor dem Match, daher wird ein
+    Stück der Zeile davor mitgelesen. Ohne erkennbare Zuweisung ist der
+    Name leer und der Wert der ganze Treffer.
+    """
+    segment = match.string[max(0, match.start() - 64):match.end()]
+    assignment = _ASSIGNED_VALUE.search(segment)
+    if assignment is None:
+        return "", match.group()
+    return assignment.group(1), assignment.group(2)
+
+def _entropy_stats_python(tokens: List[bytes]) -> Tuple[List[float], List[int]]:
+    from collections import Counter
+    from math import log2
+    
+    entropies, masks = [], []
+    for token in tokens:
+        counts = Counter(token)
+        length = len(token)
+        entropies.append(log2(length) - sum(count * log2(count) for count in counts.values()) / length)
+        mask = 0
+        for byte in counts:
+            mask |= _CHAR_CLASSES[byte]
+        masks.append(mask)
+    return entropies, masks
+
+def _entropy_stats_numpy(np, tokens: List[bytes]) -> Tuple[List[float], List[int]]:
+    classes = np.frombuffer(_CHAR_CLASSES, dtype=np.uint8)
+    entropies, masks = [], []
+    for start in range(0, len(tokens), ENTROPY_NUMPY_CHUNK):
+        chunk = tokens[start:start + ENTROPY_NUMPY_CHUNK]
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        flat = np.frombuffer(b"".join(chunk), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(chunk), dtype=np.int64), lengths)
+        # Byte-Histogramm pro Token in einem bincount über (Zeile, Byte)
+        counts = np.bincount(rows * 256 + flat, minlength=len(chunk) * 256).reshape(len(chunk), 256)
+        weighted = (counts * np.log2(np.maximum(counts, 1))).sum(axis=1)
+        entropies.extend((np.log2(lengths) - weighted / lengths).tolist())
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        masks.extend(np.bitwise_or.reduceat(classes[flat], offsets).tolist())
+    return entropies, masks
+
+def token_entropy_stats(tokens: List[bytes]) -> Tuple[List[float], List[int]]:
+    """
+    🎲 Shannon-Entropie (Bit pro Byte, 6 Nachkommastellen) und
+    Zeichenklassen-Maske (CHAR_*) für einen Batch nicht-leerer Token
+    
+    Batches ab ENTROPY_NUMPY_MIN_BATCH werden mit numpy vektorisiert (ein
+    Histogramm pro Token über alle Token gleichzeitig), sobald der Prozess
+    ENTROPY_NUMPY_MIN_TOKENS Token bewertet hat; sonst und ohne numpy in
+    reinem Python - beide Wege liefern dieselben Werte.
+    """
+    global _scored_tokens
+    _scored_tokens += len(tokens)
+    use_numpy = len(tokens) >= ENTROPY_NUMPY_MIN_BATCH and (_numpy or _scored_tokens >= ENTROPY_NUMPY_MIN_TOKENS)
+    np = optional_numpy() if use_numpy else None
+    entropies, masks = _entropy_stats_numpy(np, tokens) if np is not None else _entropy_stats_python(tokens)
+    return [round(entropy, 6) for entropy in entropies], masks
+
+def score_secret_candidates(candidates: List[Tuple[str, str, bool]]) -> List[bool]:
+    """
+    🎯 Bewerte Secret-Kandidaten (Name, Wert, von einer Secret-Regel verankert)
+    
+    Echt ist ein Wert, der mit einem Secret-Präfix beginnt oder genug
+    Entropie hat: unter einem Secret-Namen reicht ENTROPY_KEYWORD_THRESHOLD
+    mit Buchstaben und Ziffern, sonst braucht es ENTROPY_THRESHOLD und
+    Klein-, Großbuchstaben und Ziffern. Platzhalter, Template-Ausdrücke
+    und Hash-/URL-/Pfad-Felder zählen nicht.
+    """
+    verdicts = [False] * len(candidates)
+    pending = []
+    for index, (name, value, anchored) in enumerate(candidates):
+        if SECRET_INDICATOR_MATCHER.match(value):
+            verdicts[index] = True
+        elif len(value) >= ENTROPY_MIN_LENGTH and not _ENTROPY_PLACEHOLDER_MATCHER.search(value):
+            pending.append(index)
+    if not pending:
+        return verdicts
+    
+    entropies, masks = token_entropy_stats([candidates[index][1].encode('utf-8') for index in pending])
+    mixed = CHAR_LOWER | CHAR_UPPER | CHAR_DIGIT
+    letters = CHAR_LOWER | CHAR_UPPER
+    for index, entropy, mask in zip(pending, entropies, masks):
+        if mask & CHAR_NOISE:
+            continue
+        name, _, anchored = candidates[index]
+        if anchored or _SECRET_KEYWORD_MATCHER.search(name):
+            verdicts[index] = entropy >= ENTROPY_KEYWORD_THRESHOLD and bool(mask & CHAR_DIGIT) and bool(mask & letters)
+        elif not _ENTROPY_IGNORED_MATCHER.search(name):
+            verdicts[index] = entropy >= ENTROPY_THRESHOLD and mask & mixed == mixed
+    return verdicts
+
+def is_real_secret(match: str) -> bool:
+    """
+    🔍 Einzelprüfung eines Secret-Treffers: Indikator-Präfix oder Entropie des Werts
+    """
+    if SECRET_INDICATOR_MATCHER.search(match):
+        return True
+    assignment = _ASSIGNED_VALUE.search(match)
+    name, value = assignment.groups() if assignment else ("", match)
+    return score_secret_candidates([(name, value, True)])[0]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+📈 Scan-Historie des Security-Audit-Agenten (SQLite)
+
+Läufe vollständiger Scans mit ihren Findings, indiziert für Trends,
+First-/Last-Seen und Regressionen, sowie die Abfrage für --history.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from models import SEVERITY_LEVELS, SecurityIssue
+
+# 📈 Scan-Historie (SQLite)
+HISTORY_QUERIES = ("runs", "trend", "findings", "regressions")
+HISTORY_DEFAULT_DAYS = 30  # Zeitraum von trend/runs ohne --since
+HISTORY_QUERY_LIMIT = 1000
+
+class HistoryStore:
+    """
+    📈 Indizierte Scan-Historie (SQLite)
+    
+    Jeder vollständige Scan hängt einen Lauf mit seinen Findings an
+    (Baseline-Fingerprints, siehe issue_fingerprint). Die Tabelle
+    fingerprints führt erstes/letztes Auftreten pro Finding mit, sodass
+    First-/Last-Seen, Trends und Regressionen ohne Report-Dateien und
+    ohne Scan über alle Läufe beantwortet werden.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY, timestamp TEXT, total INTEGER,
+            critical INTEGER, high INTEGER, medium INTEGER, low INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS findings (run_id INTEGER, fingerprint TEXT, line INTEGER);
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            fingerprint TEXT PRIMARY KEY, rule_id TEXT, file TEXT, type TEXT, severity TEXT, message TEXT,
+            first_run INTEGER, last_run INTEGER, runs INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+        CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id);
+        CREATE INDEX IF NOT EXISTS findings_fingerprint ON findings (fingerprint, run_id);
+        CREATE INDEX IF NOT EXISTS fingerprints_rule ON fingerprints (rule_id);
+        CREATE INDEX IF NOT EXISTS fingerprints_file ON fingerprints (file);
+    """
+    
+    def __init__(self, path: str):
+        import sqlite3
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(self.SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def append_run(self, issues: Sequence[SecurityIssue], fingerprints: Sequence[str], timestamp: Optional[str] = None) -> int:
+        """
+        ➕ Lauf mit seinen Findings anhängen (ID des Laufs)
+        """
+        severities = {severity: 0 for severity in SEVERITY_LEVELS}
+        findings: Dict[str, SecurityIssue] = {}
+        for issue, fingerprint in zip(issues, fingerprints):
+            findings.setdefault(fingerprint, issue)
+            severities[issue.severity] = severities.get(issue.severity, 0) + 1
+        
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (timestamp, total, critical, high, medium, low) VALUES (?, ?, ?, ?, ?, ?)",
+                (timestamp or datetime.now().isoformat(timespec='seconds'), len(issues),
+                 severities["critical"], severities["high"], severities["medium"], severities["low"])
+            ).lastrowid
+            rows = [
+                (fingerprint, issue.rule_id or issue.cve_id or issue.type, os.path.normpath(issue.file).replace(os.sep, '/'),
+                 issue.line, issue.severity, issue.type, issue.message)
+                for fingerprint, issue in findings.items()
+            ]
+            self.connection.executemany(
+                "INSERT INTO findings VALUES (?, ?, ?)",
+                [(run_id, fingerprint, line) for fingerprint, _, _, line, _, _, _ in rows]
+            )
+            self.connection.executemany(
+                "INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT (fingerprint) DO UPDATE SET last_run = excluded.last_run, runs = runs + 1, "
+                "severity = excluded.severity, message = excluded.message",
+                [(fingerprint, rule, path, kind, severity, message, run_id, run_id)
+                 for fingerprint, rule, path, _, severity, kind, message in rows]
+            )
+        return run_id
+    
+    def latest_runs(self, count: int = 2) -> List[int]:
+        """
+        🕒 IDs der letzten Läufe (neuester zuerst)
+        """
+        return [row[0] for row in self.connection.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?", (count,))]
+    
+    def runs(self, since: str) -> List[Dict[str, any]]:
+        """
+        📋 Alle Läufe ab since (ISO-Datum/-Zeit)
+        """
+        return [dict(row) for row in self.connection.execute(
+            "SELECT * FROM runs WHERE timestamp >= ? ORDER BY id", (since,)
+        )]
+    
+    def trend(self, since: str) -> List[Dict[str, any]]:
+        """
+        📈 Issue-Zahlen pro Tag (letzter Lauf des Tages) ab since
+        """
+        return [dict(row) for row in self.connection.execute(
+            "SELECT substr(timestamp, 1, 10) AS day, total, critical, high, medium, low FROM runs "
+            "WHERE id IN (SELECT MAX(id) FROM runs WHERE timestamp >= ? GROUP BY substr(timestamp, 1, 10)) ORDER BY id",
+            (since,)
+        )]
+    
+    def findings(self, rule_id: Optional[str] = None, file: Optional[str] = None,
+                 fingerprint: Optional[str] = None, limit: int = HISTORY_QUERY_LIMIT) -> List[Dict[str, any]]:
+        """
+        🔍 Erstes/letztes Auftreten von Findings (neueste zuerst), optional
+        gefiltert nach Regel, Datei oder Fingerprint
+        
+        active gibt an, ob das Finding im letzten Lauf noch vorkam.
+        """
+        conditions, params = [], []
+        for column, value in (("rule_id", rule_id), ("file", file), ("fingerprint", fingerprint)):
+            if value is not None:
+                conditions.append(f"f.{column} = ?")
+                params.append(os.path.normpath(value).replace(os.sep, '/') if column == "file" else value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return [{**row, "active": bool(row["active"])} for row in map(dict, self.connection.execute(
+            "SELECT f.fingerprint, f.rule_id, f.file, f.type, f.severity, f.message, "
+            "fr.timestamp AS first_seen, lr.timestamp AS last_seen, f.runs, "
+            "f.last_run = (SELECT MAX(id) FROM runs) AS active "
+            "FROM fingerprints f JOIN runs fr ON fr.id = f.first_run JOIN runs lr ON lr.id = f.last_run "
+            f"{where} ORDER BY f.first_run DESC, f.file, f.rule_id LIMIT ?",
+            params + [limit]
+        ))]
+    
+    def regressions(self, run_id: Optional[int] = None) -> Dict[str, any]:
+        """
+        🔁 Findings eines Laufs (Standard: letzter), die im Lauf davor fehlten
+        
+        status "new" = erstmals aufgetreten, "reappeared" = war schon einmal
+        da und zwischenzeitlich behoben. fixed zählt die Findings des
+        vorherigen Laufs, die nicht mehr vorkommen.
+        """
+        if run_id is None:
+            latest = self.latest_runs(1)
+            if not latest:
+                return {"run": None, "previous": None, "fixed": 0, "findings": []}
+            run_id = latest[0]
+        row = self.connection.execute("SELECT MAX(id) FROM runs WHERE id < ?", (run_id,)).fetchone()
+        previous = row[0] if row[0] is not None else -1
+        findings = [dict(row) for row in self.connection.execute(
+            "SELECT CASE WHEN fp.first_run = r.run_id THEN 'new' ELSE 'reappeared' END AS status, "
+            "r.fingerprint, fp.rule_id, fp.file, r.line, fp.severity, fp.message, fr.timestamp AS first_seen "
+            "FROM findings r JOIN fingerprints fp ON fp.fingerprint = r.fingerprint JOIN runs fr ON fr.id = fp.first_run "
+            "WHERE r.run_id = ? AND NOT EXISTS "
+            "(SELECT 1 FROM findings p WHERE p.fingerprint = r.fingerprint AND p.run_id = ?) "
+            "ORDER BY fp.file, r.line",
+            (run_id, previous)
+        )]
+        fixed = self.connection.execute(
+            "SELECT COUNT(*) FROM findings p WHERE p.run_id = ? AND NOT EXISTS "
+            "(SELECT 1 FROM findings r WHERE r.fingerprint = p.fingerprint AND r.run_id = ?)",
+            (previous, run_id)
+        ).fetchone()[0]
+        return {"run": run_id, "previous": previous if previous >= 0 else None, "fixed": fixed, "findings": findings}
+
+def query_history(path: Optional[str], args) -> any:
+    """
+    📈 Abfrage der Scan-Historie für die Kommandozeile
+    """
+    from datetime import timedelta
+    
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Keine Scan-Historie unter {path}")
+    since = args.since or (datetime.now() - timedelta(days=HISTORY_DEFAULT_DAYS)).date().isoformat()
+    history = HistoryStore(path)
+    try:
+        if args.history == "runs":
+            return history.runs(since)
+        if args.history == "trend":
+            return history.trend(since)
+        if args.history == "findings":
+            return history.findings(args.rule, args.file, args.fingerprint)
+        return history.regressions()
+    finally:
+        history.close()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+📦 Dependency-Manifeste und Lockfiles
+
+Streamende Parser für package-lock.json, Pipfile.lock, poetry.lock,
+requirements.txt und package.json: (Package, Version, Zeile).
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import re
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+
+def parse_requirement(line: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    🐍 requirements.txt-Zeile -> (Package, gepinnte Version oder Mindestversion)
+    """
+    line = line.split('#', 1)[0].split(';', 1)[0].strip()
+    if not line or line.startswith('-'):
+        return None
+    match = re.match(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*)", line)
+    if not match:
+        return None
+    return match.group(1), pinned_version(match.group(2))
+
+def pinned_version(spec: str) -> Optional[str]:
+    """
+    📌 Version aus einer Versionsangabe: exakter Pin, sonst die Mindestversion
+    
+    "==1.2.3" -> 1.2.3, "^15.0.0" / ">=2.0,<3" -> 15.0.0 / 2.0, "*" / "" -> None.
+    """
+    if not isinstance(spec, str):
+        return None
+    exact = re.search(r"===?\s*v?(\d[\w.+-]*)", spec)
+    if exact:
+        return exact.group(1)
+    lower = re.match(r"\s*(?:\^|~=?|>=?|=)?\s*v?(\d[\w.+-]*)", spec)
+    return lower.group(1) if lower else None
+
+def json_key_lines(content: str) -> Dict[str, int]:
+    """
+    🔢 Zeilennummer des ersten Vorkommens jedes JSON-Schlüssels (für Manifest-Findings)
+    """
+    lines: Dict[str, int] = {}
+    for line_num, line in enumerate(content.split('\n'), 1):
+        match = re.match(r'\s*"([^"]+)"\s*:', line)
+        if match:
+            lines.setdefault(match.group(1), line_num)
+    return lines
+
+class JsonStreamReader:
+    """
+    📄 Inkrementeller JSON-Leser für große Lockfiles
+    
+    Die Datei wird blockweise gelesen; Objekte lassen sich Schlüssel für
+    Schlüssel durchlaufen (iter_object), einzelne Werte werden mit dem
+    Standard-Decoder gelesen (read_value). Im Speicher liegt nur der gerade
+    benötigte Ausschnitt, nie das ganze Dokument. line liefert die aktuelle
+    Zeilennummer für Findings.
+    """
+    
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.offset = 0          # Absolute Position von buffer[0]
+        self._line = 1           # Zeile an buffer[_line_pos]
+        self._line_pos = 0
+        self._decoder = json.JSONDecoder()
+    
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        # Verbrauchten Teil verwerfen (Zeilen vorher mitzählen)
+        self._line += self.buffer.count('\n', self._line_pos, self.pos)
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:]
+        self.pos = self._line_pos = 0
+        
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer += data
+        return True
+    
+    @property
+    def line(self) -> int:
+        self._line += self.buffer.count('\n', self._line_pos, self.pos)
+        self._line_pos = self.pos
+        return self._line
+    
+    def peek(self) -> str:
+        """Nächstes Zeichen nach Whitespace (ohne es zu verbrauchen, '' am Ende)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill(self.chunk_size):
+                return self.buffer[self.pos:self.pos + 1]
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON: '{char}' erwartet bei Offset {self.offset + self.pos}")
+        self.pos += 1
+    
+    def read_value(self):
+        """Nächsten vollständigen JSON-Wert lesen"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                value, end = None, -1
+            # Zahlen/Werte am Pufferende könnten abgeschnitten sein
+            if end != -1 and (end < len(self.buffer) or self.eof):
+                self.pos = end
+                return value
+            if not self._fill(size):
+                if end != -1:
+                    self.pos = end
+                    return value
+                raise ValueError(f"JSON: unvollständiger Wert bei Offset {self.offset + self.pos}")
+            size *= 2  # Große Werte: Puffer geometrisch wachsen lassen
+    
+    def iter_object(self) -> Iterator[str]:
+        """
+        Schlüssel eines Objekts durchlaufen
+        
+        Nach jedem Schlüssel muss der Aufrufer den Wert lesen (read_value,
+        iter_object) - nicht gelesene Werte werden übersprungen.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            value_start = self.offset + self.pos
+            yield key
+            if self.offset + self.pos == value_start:
+                self.read_value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"JSON: ',' oder '}}' erwartet bei Offset {self.offset + self.pos - 1}")
+
+def iter_package_lock(path: str) -> Iterator[Tuple[str, Optional[str], int]]:
+    """
+    🟢 package-lock.json (v1-v3) -> (Package, installierte Version, Zeile)
+    
+    v2/v3: flache "packages"-Map (node_modules/...-Pfade), v1: verschachtelte
+    "dependencies". Workspace-Links und das Root-Projekt werden übersprungen.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = JsonStreamReader(f)
+        has_packages = False
+        for key in reader.iter_object():
+            if key == "packages":
+                has_packages = True
+                for package_path in reader.iter_object():
+                    line_num = reader.line
+                    entry = reader.read_value()
+                    if "node_modules/" not in package_path or not isinstance(entry, dict) or entry.get("link"):
+                        continue
+                    name = entry.get("name") or package_path.rsplit("node_modules/", 1)[1]
+                    yield name, entry.get("version"), line_num
+            elif key == "dependencies" and not has_packages:
+                yield from _iter_lock_dependencies(reader)
+
+def _iter_lock_dependencies(reader: JsonStreamReader) -> Iterator[Tuple[str, Optional[str], int]]:
+    # package-lock v1: {"name": {"version": ..., "dependencies": {...}}}
+    for name in reader.iter_object():
+        line_num = reader.line
+        version = None
+        for field in reader.iter_object():
+            if field == "version":
+                version = reader.read_value()
+            elif field == "dependencies":
+                yield from _iter_lock_dependencies(reader)
+        yield name, version, line_num
+
+def iter_pipfile_lock(path: str) -> Iterator[Tuple[str, Optional[str], int]]:
+    """
+    🐍 Pipfile.lock -> (Package, Version, Zeile) aus "default" und "develop"
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = JsonStreamReader(f)
+        for section in reader.iter_object():
+            if section not in ("default", "develop"):
+                continue
+            for name in reader.iter_object():
+                line_num = reader.line
+                entry = reader.read_value()
+                version = entry.get("version") if isinstance(entry, dict) else None
+                yield name, pinned_version(version), line_num
+
+def iter_poetry_lock(path: str) -> Iterator[Tuple[str, Optional[str], int]]:
+    """
+    🐍 poetry.lock -> (Package, Version, Zeile), zeilenweise über die [[package]]-Blöcke
+    """
+    name = version = None
+    line_num = 0
+    in_package = False
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if line.startswith('['):
+                if name:
+                    yield name, version, line_num
+                name = version = None
+                in_package = line == '[[package]]'
+                continue
+            if not in_package:
+                continue
+            match = re.match(r'(name|version)\s*=\s*"([^"]*)"', line)
+            if match and match.group(1) == "name":
+                name, line_num = match.group(2), number
+            elif match:
+                version = match.group(2)
+    if name:
+        yield name, version, line_num
+
+def iter_requirements(path: str) -> Iterator[Tuple[str, Optional[str], int]]:
+    """
+    🐍 requirements.txt -> (Package, gepinnte Version oder Mindestversion, Zeile)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_num, requirement in enumerate(f, 1):
+            parsed = parse_requirement(requirement)
+            if parsed:
+                yield parsed[0], parsed[1], line_num
+
+def iter_package_json(path: str) -> Iterator[Tuple[str, Optional[str], int]]:
+    """
+    🟢 package.json -> (Package, Mindestversion, Zeile) der direkten Dependencies
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    package_data = json.loads(content)
+    line_numbers = json_key_lines(content)
+    all_deps = {**package_data.get('dependencies', {}), **package_data.get('devDependencies', {})}
+    for package, version in all_deps.items():
+        yield package, pinned_version(version), line_numbers.get(package, 1)
+
+# 📦 Dependency-Manifeste: Dateiname -> (Package-Manager, Parser)
+# Lockfiles (exakte, transitive Versionen) ersetzen das jeweilige Manifest
+DEPENDENCY_MANIFESTS = {
+    "package-lock.json": ("npm", iter_package_lock),
+    "package.json": ("npm", iter_package_json),
+    "poetry.lock": ("pip", iter_poetry_lock),
+    "Pipfile.lock": ("pip", iter_pipfile_lock),
+    "requirements.txt": ("pip", iter_requirements),
+}
+MANIFEST_SUPERSEDED_BY = {"package.json": "package-lock.json"}
+
+# 📌 Regel-ID des Findings für Packages ohne auflösbare Version (latest, *, Git-/URL-Abhängigkeit)
+UNPINNED_RULE_ID = "DEP-001"
+
+def parse_manifest(path: str) -> List[Tuple[str, Optional[str], int]]:
+    """
+    📦 Packages eines Manifests bzw. Lockfiles (gleiche Package-Version nur einmal)
+    """
+    parser = DEPENDENCY_MANIFESTS[os.path.basename(path)][1]
+    packages = []
+    seen = set()
+    for name, version, line_num in parser(path):
+        if (name, version) not in seen:
+            seen.add((name, version))
+            packages.append((name, version, line_num))
+    return packages
+
+def file_sha256(path: str) -> str:
+    """
+    🔑 SHA-256 eines Dateiinhalts (blockweise gelesen)
+    """
+    import hashlib
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+📋 Datenmodell des Security-Audit-Agenten
+
+Konfiguration, Issues, Ergebnis, kompakter Issue-Speicher mit laufender
+Aggregation und Regeln - gemeinsam genutzt von run.py und den Modulen
+daneben (Regel-Engine, Cache, Baseline, Historie).
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import heapq
+from array import array
+from dataclasses import dataclass, fields
+from collections.abc import Sequence
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+# 📁 Zu scannende Dateiendungen
+SCAN_EXTENSIONS = ('.py', '.js', '.ts', '.tsx', '.jsx', '.json', '.yml', '.yaml', '.env', '.sh', '.ps1')
+SCAN_EXTENSION_SET = frozenset(SCAN_EXTENSIONS)
+
+# 🗂️ Sprachen und ihre Dateiendungen (Regeln werden nur auf passende Dateien angewendet)
+LANGUAGE_EXTENSIONS: Dict[str, Tuple[str, ...]] = {
+    "python": ('.py',),
+    "javascript": ('.js', '.jsx'),
+    "typescript": ('.ts', '.tsx'),
+    "json": ('.json',),
+    "yaml": ('.yml', '.yaml'),
+    "env": ('.env',),
+    "shell": ('.sh',),
+    "powershell": ('.ps1',),
+}
+
+# 🔒 Generierte Lockfiles voller Integritäts-Hashes (Regeln mit skip_lockfiles greifen hier nicht)
+LOCKFILE_NAMES = frozenset(["package-lock.json", "npm-shrinkwrap.json", "pnpm-lock.yaml", "yarn.lock",
+                            "composer.lock", "Pipfile.lock", "poetry.lock", "Cargo.lock", "Gemfile.lock"])
+
+# 📊 Severity-Stufen (absteigend) und Anzahl Top-Offender in der Zusammenfassung
+SEVERITY_LEVELS = ("critical", "high", "medium", "low")
+TOP_OFFENDERS = 10
+
+# ⏱️ Regel-ID des "Scan abgebrochen"-Findings (Zeitbudget pro Datei überschritten)
+SCAN_BUDGET_RULE_ID = "SCAN-001"
+
+# 🔐 Eingebaute Secret-Namen; ein Name steht für die Zuweisung eines String-Literals
+SECRET_ASSIGNMENT_PATTERN = r"{}\s*=\s*['\"][^'\"]+['\"]"
+DEFAULT_SECRET_NAMES = ("api_key", "password", "token", "secret", "key", "credential", "auth",
+                        "private_key", "ssh_key", "access_token")
+
+# 📋 Security-Audit-Konfiguration
+@dataclass
+class SecurityConfig:
+    scan_frequency: str = "on-commit"
+    cve_database: str = "nvd"
+    secret_patterns: List[str] = None
+    vulnerability_threshold: str = "high"
+    auto_block: bool = True
+    jobs: int = 1  # Anzahl Worker-Prozesse für den Datei-Scan (0 = alle CPU-Kerne)
+    cache_path: Optional[str] = ".security-audit-cache/scan-cache.json"  # None = Cache deaktiviert
+    scan_scope: str = "all"  # all, staged (gestagte Dateien), staged-lines (nur hinzugefügte Zeilen)
+    max_file_size: int = 5 * 1024 * 1024  # Größere Dateien werden übersprungen (0 = kein Limit)
+    skip_binary: bool = True
+    follow_symlinks: bool = False
+    report_format: str = "json"  # json (ein Dokument am Ende), ndjson (Issues werden laufend gestreamt)
+    vulnerability_feeds: List[str] = None  # OSV-/NVD-JSON-Dumps (Dateien, Verzeichnisse, .zip, .json.gz)
+    vulnerability_db_path: str = ".security-audit-cache/vulndb.sqlite"
+    advisory_url: Optional[str] = None  # OSV-kompatible API (z.B. https://api.osv.dev oder lokaler Spiegel), None = nur offline
+    advisory_workers: int = 8
+    advisory_rate_limit: float = 250.0  # Anfragen pro Sekunde (0 = unbegrenzt)
+    cve_cache_path: str = ".security-audit-cache/cve-cache.json"
+    cve_cache_ttl: int = 24 * 3600  # Sekunden
+    profile_rules: bool = False  # Regel-Profiling (Auswertungen, Treffer, Zeit pro Regel) im Report
+    watch_interval: float = 1.0  # Watch-Modus: Polling-Intervall bzw. Wartezeit pro inotify-Runde (Sekunden)
+    live_report_path: str = "reports/security-audit-live.json"  # Watch-Modus: laufend aktualisierter Report
+    max_line_length: int = 4096  # Längere Zeilen werden in Fenstern geprüft (0 = kein Limit)
+    file_time_budget: float = 2.0  # Sekunden pro Datei, danach "Scan abgebrochen"-Finding (0 = kein Limit)
+    rule_packs: List[str] = None  # Regel-Packs: JSON-Dateien oder Verzeichnisse (alle *.json)
+    rules: List[Dict[str, any]] = None  # Inline-Regeln im Regel-Pack-Format
+    rule_cache_dir: Optional[str] = ".security-audit-cache/rules"  # Validierte Regel-Packs (None = kein Cache)
+    baseline_path: str = ".security-audit-baseline.json"  # Fingerprints bekannter Findings (wird committet)
+    new_findings_only: bool = False  # Nur Findings außerhalb der Baseline berichten und bewerten
+    history_path: Optional[str] = ".security-audit-cache/history.sqlite"  # Scan-Historie vollständiger Scans (None = aus)
+    record_history: bool = True  # False: Lauf nicht in der Historie ablegen (z.B. Baseline-Pflege)
+    
+    def __post_init__(self):
+        if self.vulnerability_feeds is None:
+            self.vulnerability_feeds = ["security-advisories"]
+        if self.secret_patterns is None:
+            self.secret_patterns = [SECRET_ASSIGNMENT_PATTERN.format(name) for name in DEFAULT_SECRET_NAMES]
+        if self.rule_packs is None:
+            self.rule_packs = []
+        if self.rules is None:
+            self.rules = []
+
+# 📋 Security-Issue
+@dataclass
+class SecurityIssue:
+    file: str
+    line: int
+    column: int
+    severity: str  # low, medium, high, critical
+    type: str      # vulnerability, secret, cve, dependency
+    message: str
+    cve_id: Optional[str] = None
+    description: Optional[str] = None
+    recommendation: Optional[str] = None
+    fixed_in: Optional[str] = None
+    rule_id: Optional[str] = None  # Regel-ID (SEC-/VUL-/QUA-###) bei Code-Findings
+
+# 📋 Security-Audit-Ergebnis
+@dataclass
+class SecurityAuditResult:
+    timestamp: str
+    total_issues: int
+    critical_issues: int
+    high_issues: int
+    medium_issues: int
+    low_issues: int
+    issues: Sequence[SecurityIssue]
+    summary: Dict[str, any]
+    passed: bool
+
+def issue_to_dict(issue: SecurityIssue) -> Dict[str, any]:
+    """
+    📋 Security-Issue als Report-Dict
+    """
+    return {
+        "file": issue.file,
+        "line": issue.line,
+        "column": issue.column,
+        "severity": issue.severity,
+        "type": issue.type,
+        "message": issue.message,
+        "cve_id": issue.cve_id,
+        "description": issue.description,
+        "recommendation": issue.recommendation,
+        "fixed_in": issue.fixed_in,
+        "rule_id": issue.rule_id
+    }
+
+def issue_from_dict(data: Dict[str, any]) -> SecurityIssue:
+    """
+    📋 Security-Issue aus einem Report-Dict
+    """
+    return SecurityIssue(**{field.name: data.get(field.name) for field in fields(SecurityIssue)})
+
+class IssueStats:
+    """
+    📊 Laufende Issue-Aggregation
+    
+    Zähler pro Severity, Typ, Regel und Datei werden beim Erfassen (und
+    Entfernen) eines Issues mitgeführt. Histogramme und Regel-Aufschlüsselung
+    stehen damit sofort bereit, unabhängig von der Anzahl der Findings.
+    Regel-Schlüssel ist die Regel-ID, bei CVE-Findings Typ und Advisory-ID
+    (z.B. "cve:CVE-2021-0001"). rule_info führt die höchste Severity der
+    Regel und den Typ ihres ersten Issues.
+    """
+    
+    def __init__(self):
+        self.by_severity: Dict[str, int] = dict.fromkeys(SEVERITY_LEVELS, 0)
+        self.by_type: Dict[str, int] = {}
+        self.by_rule: Dict[str, int] = {}
+        self.by_file: Dict[str, int] = {}
+        self.rule_info: Dict[str, Tuple[str, str]] = {}  # Regel -> (Severity, Typ)
+        self.rule_files: Dict[str, int] = {}             # Regel -> Anzahl betroffener Dateien
+        self._rule_file: Dict[Tuple[str, str], int] = {}
+        self._rule_severity: Dict[Tuple[str, str], int] = {}
+    
+    @staticmethod
+    def _add(counter: Dict, key, delta: int) -> int:
+        value = counter.get(key, 0) + delta
+        if value:
+            counter[key] = value
+        else:
+            del counter[key]
+        return value
+    
+    def count(self, file_path: str, severity: str, issue_type: str, rule_key: str, delta: int = 1):
+        """📊 Zähle ein Issue (delta=-1 nimmt es wieder heraus)"""
+        self.by_severity[severity] = self.by_severity.get(severity, 0) + delta
+        self._add(self.by_type, issue_type, delta)
+        self._add(self.by_file, file_path, delta)
+        self._add(self._rule_severity, (rule_key, severity), delta)
+        if self._add(self.by_rule, rule_key, delta):
+            highest = next((level for level in SEVERITY_LEVELS if (rule_key, level) in self._rule_severity), severity)
+            self.rule_info[rule_key] = (highest, self.rule_info.get(rule_key, (None, issue_type))[1])
+        else:
+            del self.rule_info[rule_key]
+        
+        value = self._add(self._rule_file, (rule_key, file_path), delta)
+        if delta > 0 and value == delta:
+            self._add(self.rule_files, rule_key, 1)
+        elif delta < 0 and value == 0:
+            self._add(self.rule_files, rule_key, -1)
+    
+    def top_files(self, limit: int = TOP_OFFENDERS) -> List[Dict[str, any]]:
+        """🏆 Dateien mit den meisten Issues"""
+        return [{"file": file_path, "issues": count}
+                for file_path, count in heapq.nlargest(limit, self.by_file.items(), key=itemgetter(1))]
+    
+    def top_rules(self, limit: int = TOP_OFFENDERS) -> List[Dict[str, any]]:
+        """🏆 Regeln mit den meisten Treffern"""
+        return [{"rule": rule_key, "issues": count}
+                for rule_key, count in heapq.nlargest(limit, self.by_rule.items(), key=itemgetter(1))]
+    
+    def rule_breakdown(self) -> Dict[str, Dict[str, any]]:
+        """📋 Aufschlüsselung pro Regel"""
+        return {
+            rule_key: {
+                "issues": count,
+                "files": self.rule_files.get(rule_key, 0),
+                "severity": self.rule_info[rule_key][0],
+                "type": self.rule_info[rule_key][1]
+            }
+            for rule_key, count in sorted(self.by_rule.items())
+        }
+
+class IssueStore(Sequence):
+    """
+    🗃️ Kompakter, spaltenorientierter Issue-Speicher
+    
+    Pro Finding werden nur vier Integer-Spalten belegt (Datei-ID, Zeile,
+    Spalte, Vorlagen-ID). Dateipfade und die übrigen Felder (Severity, Typ,
+    Meldung, CVE, Beschreibung, Empfehlung, Fix-Version) werden interniert -
+    Regeltexte liegen damit nur einmal pro Regel im Speicher, egal wie oft
+    sie treffen. Lesezugriffe liefern SecurityIssue-Objekte als View.
+    
+    Die Aggregation (stats) wird bei jedem Hinzufügen/Entfernen mitgeführt.
+    """
+    
+    def __init__(self, issues: Iterable[SecurityIssue] = ()):
+        self.files: List[str] = []
+        self.templates: List[tuple] = []
+        self._file_ids: Dict[str, int] = {}
+        self._template_ids: Dict[tuple, int] = {}
+        self.file_ids = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.template_ids = array('i')
+        self.stats = IssueStats()
+        self.extend(issues)
+    
+    def intern_file(self, file_path: str) -> int:
+        """📁 Datei-ID für einen Pfad (einmal pro Pfad vergeben)"""
+        file_id = self._file_ids.get(file_path)
+        if file_id is None:
+            file_id = self._file_ids[file_path] = len(self.files)
+            self.files.append(file_path)
+        return file_id
+    
+    def intern_template(self, template: tuple) -> int:
+        """📋 Vorlagen-ID für die nicht-positionsbezogenen Issue-Felder"""
+        template_id = self._template_ids.get(template)
+        if template_id is None:
+            template_id = self._template_ids[template] = len(self.templates)
+            self.templates.append(template)
+        return template_id
+    
+    def _count(self, index: int, delta: int):
+        template = self.templates[self.template_ids[index]]
+        # template: (severity, type, message, cve_id, ..., rule_id)
+        rule_key = template[7] or (f"{template[1]}:{template[3]}" if template[3] else template[1])
+        self.stats.count(self.files[self.file_ids[index]], template[0], template[1], rule_key, delta)
+    
+    def append(self, issue: SecurityIssue):
+        self.file_ids.append(self.intern_file(issue.file))
+        self.lines.append(issue.line)
+        self.columns.append(issue.column)
+        self.template_ids.append(self.intern_template((
+            issue.severity, issue.type, issue.message, issue.cve_id,
+            issue.description, issue.recommendation, issue.fixed_in, issue.rule_id
+        )))
+        self._count(len(self.lines) - 1, 1)
+    
+    def extend(self, issues: Iterable[SecurityIssue]):
+        for issue in issues:
+            self.append(issue)
+    
+    def _view(self, index: int) -> SecurityIssue:
+        return SecurityIssue(
+            self.files[self.file_ids[index]], self.lines[index], self.columns[index],
+            *self.templates[self.template_ids[index]]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.lines)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._view(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("issue index out of range")
+        return self._view(index)
+    
+    def __delitem__(self, index):
+        removed = range(*index.indices(len(self))) if isinstance(index, slice) else [index + len(self) if index < 0 else index]
+        for i in removed:
+            self._count(i, -1)
+        # Internierte Pfade/Vorlagen bleiben stehen - sie werden wiederverwendet
+        for column in (self.file_ids, self.lines, self.columns, self.template_ids):
+            del column[index]
+    
+    def __iter__(self) -> Iterator[SecurityIssue]:
+        files, templates = self.files, self.templates
+        for file_id, line, column, template_id in zip(self.file_ids, self.lines, self.columns, self.template_ids):
+            yield SecurityIssue(files[file_id], line, column, *templates[template_id])
+
+# 📋 Security-Regel
+@dataclass(frozen=True)
+class SecurityRule:
+    rule_id: str
+    type: str      # secret, vulnerability, code_quality
+    pattern: str
+    message: str
+    severity: str
+    ignore_case: bool = True
+    find_all: bool = False  # True: alle Treffer pro Zeile (finditer), sonst nur der erste (search)
+    description: Optional[str] = None
+    recommendation: Optional[str] = None
+    languages: Optional[Tuple[str, ...]] = None   # Sprachen (LANGUAGE_EXTENSIONS), None = alle
+    extensions: Optional[Tuple[str, ...]] = None  # Zusätzliche Dateiendungen, z.B. ('.mjs',)
+    skip_lockfiles: bool = False  # True: nicht auf Lockfiles (LOCKFILE_NAMES) anwenden
+    
+    def file_extensions(self) -> Optional[FrozenSet[str]]:
+        """
+        🗂️ Dateiendungen, auf die die Regel angewendet wird (None = alle)
+        """
+        if self.languages is None and self.extensions is None:
+            return None
+        languages = (LANGUAGE_EXTENSIONS[language] for language in self.languages or ())
+        return frozenset(chain(self.extensions or (), *languages))
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+📦 Regeln und Konfiguration des Security-Audit-Agenten
+
+Eingebaute Regel-Tabellen, validierte Regel-Packs (JSON, mit Artefakt-Cache)
+und der Block agents.security-audit.config aus agent-config.json.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import re
+import json
+from dataclasses import astuple
+from typing import Iterable, List, Optional, Tuple
+
+from entropy import ENTROPY_CANDIDATE_PATTERN, ENTROPY_RULE_ID
+from models import LANGUAGE_EXTENSIONS, SECRET_ASSIGNMENT_PATTERN, SEVERITY_LEVELS, SecurityConfig, SecurityRule
+from rule_engine import pattern_lint, remember_pattern_analysis, rule_anchors
+from scan_cache import SCAN_CACHE_VERSION
+
+# Sprachgruppen für die Regel-Tabellen
+CODE_LANGUAGES = ("python", "javascript", "typescript")
+JS_LANGUAGES = ("javascript", "typescript")
+SCRIPT_LANGUAGES = CODE_LANGUAGES + ("shell", "powershell")
+
+# 🚨 Vulnerability-Regeln (Regel-ID, Pattern, Meldung, Sprachen - None = alle)
+VULNERABILITY_PATTERNS: List[Tuple[str, str, str, Optional[Tuple[str, ...]]]] = [
+    # SQL Injection
+    ("VUL-001", r"execute\s*\(\s*[\"'].*\+.*[\"']", "SQL Injection Risk", CODE_LANGUAGES),
+    ("VUL-002", r"query\s*\(\s*[\"'].*\+.*[\"']", "SQL Injection Risk", CODE_LANGUAGES),
+    
+    # XSS
+    ("VUL-003", r"innerHTML\s*=\s*.*\+", "XSS Risk", JS_LANGUAGES),
+    ("VUL-004", r"document\.write\s*\(\s*.*\+", "XSS Risk", JS_LANGUAGES),
+    
+    # Command Injection
+    ("VUL-005", r"os\.system\s*\(\s*.*\+", "Command Injection Risk", ("python",)),
+    ("VUL-006", r"subprocess\.call\s*\(\s*.*\+", "Command Injection Risk", ("python",)),
+    
+    # Hardcoded Credentials
+    ("VUL-007", r"password\s*=\s*[\"'][^\"']{8,}[\"']", "Hardcoded Password", None),
+    ("VUL-008", r"api_key\s*=\s*[\"'][^\"']{8,}[\"']", "Hardcoded API Key", None),
+    
+    # Weak Crypto
+    ("VUL-009", r"md5\s*\(", "Weak Hash Function (MD5)", CODE_LANGUAGES),
+    ("VUL-010", r"sha1\s*\(", "Weak Hash Function (SHA1)", CODE_LANGUAGES),
+    
+    # Debug Code
+    ("VUL-011", r"console\.log\s*\(", "Debug Code in Production", JS_LANGUAGES),
+    ("VUL-012", r"print\s*\(", "Debug Code in Production", ("python",)),
+    ("VUL-013", r"debugger;", "Debug Statement", JS_LANGUAGES),
+]
+
+# 📊 Code-Qualitäts-Regeln (Regel-ID, Pattern, Meldung, Sprachen)
+QUALITY_PATTERNS: List[Tuple[str, str, str, Optional[Tuple[str, ...]]]] = [
+    # Unused Imports
+    ("QUA-001", r"import\s+[^#\n]+", "Unused Import", CODE_LANGUAGES),
+    
+    # Dead Code
+    ("QUA-002", r"if\s+False:", "Dead Code", ("python",)),
+    ("QUA-003", r"if\s+0:", "Dead Code", ("python",)),
+    
+    # Magic Numbers
+    ("QUA-004", r"\b\d{4,}\b", "Magic Number", SCRIPT_LANGUAGES),
+    
+    # Long Functions
+    ("QUA-005", r"def\s+\w+\s*\([^)]*\):", "Long Function", ("python",)),
+]
+
+def build_secret_rules(patterns: List[str]) -> Tuple[SecurityRule, ...]:
+    """
+    🔐 Baue Secret-Regeln aus den konfigurierten Patterns (plus Entropie-Regel)
+    """
+    return tuple(
+        SecurityRule(
+            rule_id=f"SEC-{index:03d}",
+            type="secret",
+            pattern=pattern,
+            message="Potentieller Secret gefunden",
+            severity="critical",
+            find_all=True,
+            description="Ein Secret wurde im Code gefunden. Dies ist ein Sicherheitsrisiko.",
+            recommendation="Secret in Umgebungsvariable oder Secrets-Manager verschieben"
+        )
+        for index, pattern in enumerate(patterns, 1)
+    ) + (
+        SecurityRule(
+            rule_id=ENTROPY_RULE_ID,
+            type="secret",
+            pattern=ENTROPY_CANDIDATE_PATTERN,
+            message="Zeichenkette mit hoher Entropie gefunden",
+            severity="critical",
+            find_all=True,
+            description="Ein zufällig wirkender Wert (Shannon-Entropie, Zeichenklassen) wird zugewiesen - vermutlich ein Secret.",
+            recommendation="Secret in Umgebungsvariable oder Secrets-Manager verschieben",
+            # Ohne Literal-Anker prüft der Vorfilter jede Zeile - Lockfiles bestehen aus Hashes, nicht aus Secrets
+            skip_lockfiles=True
+        ),
+    )
+
+def build_vulnerability_rules() -> Tuple[SecurityRule, ...]:
+    """
+    🚨 Baue Vulnerability-Regeln
+    """
+    return tuple(
+        SecurityRule(
+            rule_id=rule_id,
+            type="vulnerability",
+            pattern=pattern,
+            message=message,
+            severity="high" if "Injection" in message else "medium",
+            description=f"Potentielle Sicherheitslücke gefunden: {message}",
+            recommendation="Code überprüfen und sichere Alternative verwenden",
+            languages=languages
+        )
+        for rule_id, pattern, message, languages in VULNERABILITY_PATTERNS
+    )
+
+def build_quality_rules() -> Tuple[SecurityRule, ...]:
+    """
+    📊 Baue Code-Qualitäts-Regeln
+    """
+    return tuple(
+        SecurityRule(
+            rule_id=rule_id,
+            type="code_quality",
+            pattern=pattern,
+            message=message,
+            severity="low",
+            ignore_case=False,
+            description=f"Code-Qualitätsproblem: {message}",
+            recommendation="Code refactoren und verbessern",
+            languages=languages
+        )
+        for rule_id, pattern, message, languages in QUALITY_PATTERNS
+    )
+
+# 📦 Regel-Packs (JSON): {"name": ..., "rules": [{"id", "type", "pattern", "message", "severity", ...}]}
+RULE_PACK_VERSION = 1
+RULE_TYPES = ("secret", "vulnerability", "code_quality")
+RULE_PACK_REQUIRED = ("id", "type", "pattern", "message", "severity")
+# Optionale JSON-Felder -> SecurityRule-Feld
+RULE_PACK_FIELDS = {
+    "ignoreCase": "ignore_case",
+    "findAll": "find_all",
+    "description": "description",
+    "recommendation": "recommendation",
+    "languages": "languages",
+    "extensions": "extensions",
+}
+# Anzahl aufbewahrter Regel-Pack-Artefakte im Cache-Verzeichnis
+RULE_CACHE_KEEP = 8
+
+# ⚙️ Agent-Konfiguration: Block agents.security-audit.config -> SecurityConfig-Felder
+AGENT_CONFIG_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "agent-config.json"))
+# Schlüssel -> (Feld, erlaubter Typ, null erlaubt); Texte dürfen nicht leer sein
+AGENT_CONFIG_FIELDS = {
+    "autoBlock": ("auto_block", bool, False),
+    "baselinePath": ("baseline_path", str, False),
+    "newFindingsOnly": ("new_findings_only", bool, False),
+    "historyPath": ("history_path", str, True),
+}
+# Listen-Schlüssel mit eigener Auswertung in load_security_config
+AGENT_CONFIG_LISTS = ("secretPatterns", "rulePacks", "rules")
+
+class RuleConfigError(ValueError):
+    """
+    ❌ Ungültige Regel-Konfiguration (Quelle, Regel und Grund stehen in der Meldung)
+    """
+
+def build_pack_rule(entry: any, where: str) -> SecurityRule:
+    """
+    📦 Validiere einen Regel-Eintrag eines Regel-Packs und baue die Regel
+    """
+    if not isinstance(entry, dict):
+        raise RuleConfigError(f"{where}: Regel muss ein Objekt sein")
+    unknown = sorted(set(entry) - set(RULE_PACK_REQUIRED) - set(RULE_PACK_FIELDS))
+    if unknown:
+        raise RuleConfigError(f"{where}: unbekannte Felder {', '.join(unknown)}")
+    for key in RULE_PACK_REQUIRED:
+        if not isinstance(entry.get(key), str) or not entry[key]:
+            raise RuleConfigError(f"{where}: Feld '{key}' fehlt oder ist kein Text")
+    if entry["type"] not in RULE_TYPES:
+        raise RuleConfigError(f"{where}: type '{entry['type']}' unbekannt (erlaubt: {', '.join(RULE_TYPES)})")
+    if entry["severity"] not in SEVERITY_LEVELS:
+        raise RuleConfigError(f"{where}: severity '{entry['severity']}' unbekannt (erlaubt: {', '.join(SEVERITY_LEVELS)})")
+    
+    options = {}
+    for key, field_name in RULE_PACK_FIELDS.items():
+        if key not in entry:
+            continue
+        value = entry[key]
+        if key in ("ignoreCase", "findAll"):
+            valid = isinstance(value, bool)
+        elif key in ("languages", "extensions"):
+            valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+            value = tuple(value) if valid else value
+        else:
+            valid = isinstance(value, str)
+        if not valid:
+            raise RuleConfigError(f"{where}: Feld '{key}' hat den falschen Typ")
+        options[field_name] = value
+    
+    unknown = [language for language in options.get("languages", ()) if language not in LANGUAGE_EXTENSIONS]
+    if unknown:
+        raise RuleConfigError(f"{where}: Sprache {', '.join(unknown)} unbekannt (erlaubt: {', '.join(LANGUAGE_EXTENSIONS)})")
+    invalid = [extension for extension in options.get("extensions", ()) if not extension.startswith('.')]
+    if invalid:
+        raise RuleConfigError(f"{where}: Endungen müssen mit '.' beginnen ({', '.join(invalid)})")
+    
+    rule = SecurityRule(
+        rule_id=entry["id"],
+        type=entry["type"],
+        pattern=entry["pattern"],
+        message=entry["message"],
+        severity=entry["severity"],
+        **options
+    )
+    try:
+        re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+    except re.error as error:
+        raise RuleConfigError(f"{where}: ungültiges Pattern ({error})")
+    return rule
+
+def parse_rule_pack(data: any, source: str) -> List[SecurityRule]:
+    """
+    📦 Validiere ein Regel-Pack (Objekt mit "rules" oder direkt eine Regel-Liste)
+    """
+    entries = data.get("rules") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise RuleConfigError(f"{source}: 'rules' muss eine Liste sein")
+    return [
+        build_pack_rule(entry, f"{source}: Regel {entry.get('id') if isinstance(entry, dict) and entry.get('id') else f'#{index}'}")
+        for index, entry in enumerate(entries, 1)
+    ]
+
+def read_rule_sources(paths: Iterable[str]) -> List[Tuple[str, bytes]]:
+    """
+    📂 Lies Regel-Pack-Dateien (Verzeichnisse: alle *.json, sortiert)
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json')]
+        else:
+            files = [path]
+        for file_path in files:
+            try:
+                with open(file_path, 'rb') as f:
+                    sources.append((file_path, f.read()))
+            except OSError as error:
+                raise RuleConfigError(f"{file_path}: Regel-Pack nicht lesbar ({error.strerror})")
+    return sources
+
+def load_rule_packs(sources: List[Tuple[str, bytes]], reserved_ids: Iterable[str] = (),
+                    cache_dir: Optional[str] = None) -> Tuple[SecurityRule, ...]:
+    """
+    📦 Lade und validiere Regel-Packs (Ergebnis als Artefakt gecacht)
+    
+    Schlüssel des Artefakts ist ein SHA-256 über alle Regel-Dateien. Bei einem
+    Treffer entfallen JSON-Parsing, Validierung und die Pattern-Analysen
+    (Anker, Linter) - die Regel-Engine kompiliert nur noch die Patterns.
+    reserved_ids sind bereits vergebene Regel-IDs (eingebaute Regeln).
+    """
+    import hashlib
+    
+    if not sources:
+        return ()
+    reserved_ids = sorted(reserved_ids)
+    digest = hashlib.sha256(json.dumps([RULE_PACK_VERSION, SCAN_CACHE_VERSION, reserved_ids]).encode('utf-8'))
+    for name, content in sources:
+        digest.update(name.encode('utf-8') + b"\0" + hashlib.sha256(content).digest())
+    cache_file = os.path.join(cache_dir, f"{digest.hexdigest()}.json") if cache_dir else None
+    
+    if cache_file:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                artifact = json.load(f)
+            rules = tuple(
+                SecurityRule(*(tuple(value) if isinstance(value, list) else value for value in values))
+                for values in artifact["rules"]
+            )
+            for rule, anchors, lint in zip(rules, artifact["anchors"], artifact["lint"]):
+                remember_pattern_analysis(rule.pattern, frozenset(anchors) if anchors is not None else None, lint)
+            return rules
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Kein oder veraltetes Artefakt - neu aufbauen
+    
+    rules = []
+    seen = set(reserved_ids)
+    for name, content in sources:
+        try:
+            data = json.loads(content)
+        except ValueError as error:
+            raise RuleConfigError(f"{name}: kein gültiges JSON ({error})")
+        for rule in parse_rule_pack(data, name):
+            if rule.rule_id in seen:
+                raise RuleConfigError(f"{name}: Regel-ID {rule.rule_id} ist mehrfach vergeben")
+            seen.add(rule.rule_id)
+            rules.append(rule)
+    
+    if cache_file:
+        anchors = [rule_anchors(rule.pattern) for rule in rules]
+        artifact = {
+            "version": RULE_PACK_VERSION,
+            "sources": [name for name, _ in sources],
+            "rules": [astuple(rule) for rule in rules],
+            "anchors": [sorted(anchor) if anchor is not None else None for anchor in anchors],
+            "lint": [pattern_lint(rule.pattern) for rule in rules],
+        }
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_file + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(artifact, f)
+            os.replace(cache_file + ".tmp", cache_file)
+            # Nur die zuletzt genutzten Artefakte behalten
+            artifacts = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.json')]
+            for stale in sorted(artifacts, key=os.path.getmtime, reverse=True)[RULE_CACHE_KEEP:]:
+                os.remove(stale)
+        except OSError:
+            pass  # Cache ist optional
+    return tuple(rules)
+
+def load_security_config(path: Optional[str] = None) -> SecurityConfig:
+    """
+    ⚙️ SecurityConfig aus agent-config.json (ohne Datei: Standardwerte)
+    
+    Ausgewertet wird der Block agents.security-audit.config. secretPatterns
+    ergänzen die eingebauten Secret-Patterns (reine Namen wie "token" stehen
+    für die Zuweisung eines String-Literals), rulePacks werden relativ zur
+    Konfigurationsdatei aufgelöst, rules sind Inline-Regeln im Regel-Pack-Format.
+    Unbekannte Schlüssel, falsche Typen und leere Texte ergeben einen
+    RuleConfigError.
+    """
+    config = SecurityConfig()
+    config_path = path or AGENT_CONFIG_PATH
+    if path is None and not os.path.exists(config_path):
+        return config
+    
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            block = json.load(f)["agents"]["security-audit"].get("config", {})
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+        raise RuleConfigError(f"{config_path}: Agent-Konfiguration nicht lesbar ({error})")
+    
+    if not isinstance(block, dict):
+        raise RuleConfigError(f"{config_path}: 'config' muss ein Objekt sein")
+    unknown = sorted(set(block) - set(AGENT_CONFIG_FIELDS) - set(AGENT_CONFIG_LISTS))
+    if unknown:
+        raise RuleConfigError(f"{config_path}: unbekannte Felder {', '.join(unknown)} "
+                              f"(erlaubt: {', '.join(list(AGENT_CONFIG_FIELDS) + list(AGENT_CONFIG_LISTS))})")
+    
+    for key, (field_name, expected, nullable) in AGENT_CONFIG_FIELDS.items():
+        if key not in block:
+            continue
+        value = block[key]
+        if value is None and nullable:
+            setattr(config, field_name, None)
+            continue
+        # bool ist eine int-Unterklasse - Typ exakt prüfen
+        if type(value) is not expected:
+            allowed = expected.__name__ + (" oder null" if nullable else "")
+            raise RuleConfigError(f"{config_path}: {key} muss vom Typ {allowed} sein, nicht {type(value).__name__}")
+        if expected is str and not value.strip():
+            raise RuleConfigError(f"{config_path}: {key} darf nicht leer sein")
+        setattr(config, field_name, value)
+    
+    for key in AGENT_CONFIG_LISTS:
+        if not isinstance(block.get(key, []), list):
+            raise RuleConfigError(f"{config_path}: {key} muss eine Liste sein")
+    
+    for pattern in block.get("secretPatterns", []):
+        if not isinstance(pattern, str) or not pattern:
+            raise RuleConfigError(f"{config_path}: secretPatterns darf nur nicht-leere Texte enthalten")
+        if re.fullmatch(r"\w+", pattern):
+            pattern = SECRET_ASSIGNMENT_PATTERN.format(pattern)
+        try:
+            re.compile(pattern, re.IGNORECASE)
+        except re.error as error:
+            raise RuleConfigError(f"{config_path}: ungültiges secretPattern {pattern!r} ({error})")
+        if pattern not in config.secret_patterns:
+            config.secret_patterns.append(pattern)
+    
+    base = os.path.dirname(config_path)
+    for pack in block.get("rulePacks", []):
+        if not isinstance(pack, str) or not pack.strip():
+            raise RuleConfigError(f"{config_path}: rulePacks darf nur nicht-leere Pfade enthalten")
+    config.rule_packs = [os.path.join(base, pack) for pack in block.get("rulePacks", [])]
+    config.rules = block.get("rules", [])
+    return config
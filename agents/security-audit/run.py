@@ -8,6 +8,10 @@ Kontinuierliche Sicherheitsüberwachung für:
 - CVE-Datenbank-Abfragen
 - Security-Compliance-Prüfung
 
+Teilsysteme liegen als Module daneben: models, rule_engine, rule_config,
+entropy, scan_cache, baseline, history, manifests, vulndb, advisory,
+scan_server und watcher.
+
 @author Lopez IT Welt Team
 @version 1.0.0
 @date 2025-01-19
@@ -17,64 +21,158 @@ import os
 import sys
 import json
 import re
-import subprocess
-import requests
-import hashlib
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from dataclasses import astuple
+from collections.abc import Sequence
+from itertools import chain, islice, repeat
+
+from models import (IssueStore, SCAN_BUDGET_RULE_ID, SCAN_EXTENSIONS, SCAN_EXTENSION_SET, SecurityAuditResult,
+                    SecurityConfig, SecurityIssue, SecurityRule, issue_from_dict, issue_to_dict)
+from rule_engine import (RuleEngine, RuleProfile, ScanBudgetExceeded, file_dispatch_key, get_rule_dispatch,
+                         get_rule_engine, lint_rules)
+from entropy import ENTROPY_RULE_ID, SECRET_INDICATOR_MATCHER, is_real_secret, score_secret_candidates, secret_candidate
+from rule_config import (RuleConfigError, build_quality_rules, build_secret_rules, build_vulnerability_rules,
+                         load_rule_packs, load_security_config, read_rule_sources)
+from scan_cache import ScanCache, rule_fingerprint
+from baseline import FindingBaseline, Suppressions, find_suppressions, issue_fingerprint, parse_suppressions
+from manifests import DEPENDENCY_MANIFESTS, MANIFEST_SUPERSEDED_BY, UNPINNED_RULE_ID, file_sha256, parse_manifest
+# vulndb, advisory, history, scan_server und watcher werden erst in den
+# Methoden importiert, die sie brauchen (schneller Start, siehe benchmark.py)
+
+# 🙈 Immer ignorierte Verzeichnisse und Ignore-Dateien (pro Verzeichnis ausgewertet)
+IGNORED_DIRS = frozenset(['.git', 'node_modules', '__pycache__', '.venv', 'venv', '.security-audit-cache'])
+IGNORE_FILES = ('.gitignore', '.scanignore')
+
+# 📊 Reports des Agenten (Präfix relativ zum Arbeitsverzeichnis, werden nie gescannt)
+REPORT_PREFIX = "reports/security-audit-"
+
+# 📝 Log-Datei (relativ zum Arbeitsverzeichnis) und Format
+LOG_FILE = "logs/security-audit.log"
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Anzahl Bytes für die Binär-Erkennung
+BINARY_SNIFF_SIZE = 8192
 
-# 📋 Security-Audit-Konfiguration
-@dataclass
-class SecurityConfig:
-    scan_frequency: str = "on-commit"
-    cve_database: str = "nvd"
-    secret_patterns: List[str] = None
-    vulnerability_threshold: str = "high"
-    auto_block: bool = True
-    
-    def __post_init__(self):
-        if self.secret_patterns is None:
-            self.secret_patterns = [
-                r"api_key\s*=\s*['\"][^'\"]+['\"]",
-                r"password\s*=\s*['\"][^'\"]+['\"]",
-                r"token\s*=\s*['\"][^'\"]+['\"]",
-                r"secret\s*=\s*['\"][^'\"]+['\"]",
-                r"key\s*=\s*['\"][^'\"]+['\"]",
-                r"credential\s*=\s*['\"][^'\"]+['\"]",
-                r"auth\s*=\s*['\"][^'\"]+['\"]",
-                r"private_key\s*=\s*['\"][^'\"]+['\"]",
-                r"ssh_key\s*=\s*['\"][^'\"]+['\"]",
-                r"access_token\s*=\s*['\"][^'\"]+['\"]"
-            ]
+# 💾 SecurityConfig-Felder, die Findings bei gleichem Regelsatz ändern (Teil des Scan-Cache-Fingerprints)
+SCAN_CACHE_CONFIG_FIELDS = ("max_line_length", "skip_binary", "file_time_budget", "secret_patterns")
+# Alleinstehendes \r (alter Mac-Zeilenumbruch)
+_LONE_CR = re.compile(rb"\r(?!\n)")
 
-# 📋 Security-Issue
-@dataclass
-class SecurityIssue:
-    file: str
-    line: int
-    column: int
-    severity: str  # low, medium, high, critical
-    type: str      # vulnerability, secret, cve, dependency
-    message: str
-    cve_id: Optional[str] = None
-    description: Optional[str] = None
-    recommendation: Optional[str] = None
-    fixed_in: Optional[str] = None
+# Ausführliche Summary-Felder, die print_summary separat darstellt
+SUMMARY_DETAIL_KEYS = frozenset(["severity_histogram", "type_histogram", "top_files", "top_rules", "rules", "rule_profile"])
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    🙈 Übersetze ein gitignore-Glob in Regex-Quelltext
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i) and (i == 0 or pattern[i - 1] == '/'):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif char == '*':
+            out.append('[^/]*')
+            i += 1
+        elif char == '?':
+            out.append('[^/]')
+            i += 1
+        elif char == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        elif char == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return ''.join(out)
+
+def parse_ignore_pattern(base: str, line: str) -> Optional[Tuple[str, bool, bool]]:
+    """
+    🙈 Eine Zeile einer Ignore-Datei -> (Regex-Quelltext, negiert, nur Verzeichnisse)
+    
+    base ist der Pfad des Verzeichnisses der Ignore-Datei relativ zum Scan-Root.
+    """
+    line = line.rstrip('\r\n')
+    if not line or line.startswith('#'):
+        return None
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '  # "\ " am Ende ist ein maskiertes Leerzeichen
+    line = stripped
+    
+    negated = line.startswith('!')
+    if negated or line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    
+    # Mit Slash (außer am Ende) relativ zum Verzeichnis der Ignore-Datei, sonst in jeder Tiefe
+    anchored = '/' in line
+    prefix = re.escape(base + '/') if base else ''
+    source = prefix + ('' if anchored else '(?:.*/)?') + glob_to_regex(line.lstrip('/'))
+    try:
+        re.compile(source)
+    except re.error:
+        return None
+    return source, negated, dir_only
+
+class IgnoreMatcher:
+    """
+    🙈 Ignore-Regeln aus .gitignore/.scanignore (letzte passende Regel gewinnt)
+    
+    Alle Regeln einer Ebene werden in umgekehrter Reihenfolge zu einem Regex
+    kombiniert; die erste passende Alternative ist damit die letzte Regel.
+    """
+    
+    def __init__(self, rules: Tuple[Tuple[str, bool, bool], ...] = ()):
+        self.rules = rules
+        self.dir_matcher = self._compile(rules)
+        self.file_matcher = self._compile(tuple(rule for rule in rules if not rule[2]))
+    
+    @staticmethod
+    def _compile(rules: Tuple[Tuple[str, bool, bool], ...]) -> Optional[Tuple["re.Pattern", List[bool]]]:
+        if not rules:
+            return None
+        ordered = list(reversed(rules))
+        source = '|'.join(f"(?P<_i{index}>{rule[0]})" for index, rule in enumerate(ordered))
+        return re.compile(f"(?:{source})\\Z"), [rule[1] for rule in ordered]
+    
+    def extend(self, base: str, lines: Iterable[str]) -> "IgnoreMatcher":
+        """
+        ➕ Neue Ebene mit den Regeln einer Ignore-Datei aus Verzeichnis base
+        """
+        parsed = [parse_ignore_pattern(base, line) for line in lines]
+        return IgnoreMatcher(self.rules + tuple(rule for rule in parsed if rule))
+    
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        🔍 Prüfe einen Pfad (relativ zum Scan-Root, mit /)
+        """
+        compiled = self.dir_matcher if is_dir else self.file_matcher
+        if compiled is None:
+            return False
+        matcher, negated = compiled
+        match = matcher.match(rel_path)
+        if match is None:
+            return False
+        return not negated[int(match.lastgroup[2:])]
 
-# 📋 Security-Audit-Ergebnis
-@dataclass
-class SecurityAuditResult:
-    timestamp: str
-    total_issues: int
-    critical_issues: int
-    high_issues: int
-    medium_issues: int
-    low_issues: int
-    issues: List[SecurityIssue]
-    summary: Dict[str, any]
-    passed: bool
+# Dateien pro Batch im parallelen Scan
+PARALLEL_BATCH_SIZE = 32
 
 class SecurityAuditAgent:
     """
@@ -83,26 +181,62 @@ class SecurityAuditAgent:
     
     def __init__(self, config: Optional[SecurityConfig] = None):
         self.config = config or SecurityConfig()
-        self.results: List[SecurityIssue] = []
-        self.cve_cache: Dict[str, Dict] = {}
-        
-        # Logging-Setup
-        self.setup_logging()
+        self.results = IssueStore()
+        self.cve_cache: Optional["AdvisoryCache"] = None
+        self.advisory_client: Optional["AdvisoryClient"] = None
+        self.vulnerability_db: Optional["VulnerabilityDatabase"] = None
+        self.manifests: Optional[List[str]] = None  # Beim Datei-Walk gefundene Dependency-Manifeste
+        self.directories: Dict[str, Tuple[str, IgnoreMatcher]] = {}  # Beim Walk besuchte Verzeichnisse (relativer Pfad, Ignore-Regeln)
+        self.rule_profile: Optional[RuleProfile] = RuleProfile() if self.config.profile_rules else None
+        self.rules: Optional[Tuple[SecurityRule, ...]] = None  # Eingebaute Regeln + Regel-Packs (beim ersten Zugriff geladen)
+        self.engines: Dict[Tuple[Optional[str], Optional[str]], RuleEngine] = {}  # (Regel-Typ, Dateiendung) -> Engine
+        self.report_stream = None
+        self.streamed_count = 0
+        self.staged_contents: Dict[str, bytes] = {}  # Gestagte Inhalte (für Baseline-Fingerprints)
+        self.baselined_count: Optional[int] = None  # Herausgefilterte bekannte Findings (Neu-Findings-Modus)
+        self.files_scanned = 0
+        # Batch-Scan: Secret-Treffer je Datei und Positionen ihrer vorläufigen Issues (siehe collect_batch_issues)
+        self.pending_secrets: Optional[List[Tuple[List[Tuple[SecurityRule, int, "re.Match"]], List[Optional[int]]]]] = None
+        # Watch-Modus: residenter Index (Pfad -> (mtime_ns, Größe)) und Findings pro Datei
+        self.file_index: Dict[str, Tuple[int, int]] = {}
+        self.file_issues: Dict[str, List[SecurityIssue]] = {}
+        self.manifest_index: Dict[str, Tuple[int, int]] = {}
+        self.manifest_issues: Dict[str, List[SecurityIssue]] = {}
         
+        # Logging wird erst beim ersten Log-Aufruf eingerichtet (siehe logger)
+        self._logger = None
+    
+    @property
+    def logger(self) -> "logging.Logger":
+        """
+        📝 Logger - Handler werden beim ersten Zugriff eingerichtet, nicht beim Konstruieren
+        """
+        if self._logger is None:
+            self.setup_logging()
+        return self._logger
+    
     def setup_logging(self):
-        """📝 Logging-Setup"""
-        import logging
+        """
+        📝 Logging-Setup (einmal pro Prozess, nur für den Agent-Logger)
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('logs/security-audit.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger('SecurityAuditAgent')
+        Die Log-Datei wird nur genutzt, wenn ihr Verzeichnis existiert, und
+        erst beim ersten Eintrag geöffnet.
+        """
+        import logging
         
+        logger = logging.getLogger('SecurityAuditAgent')
+        if not logger.handlers:
+            handlers = [logging.StreamHandler()]
+            if os.path.isdir(os.path.dirname(LOG_FILE)):
+                handlers.append(logging.FileHandler(LOG_FILE, delay=True))
+            formatter = logging.Formatter(LOG_FORMAT)
+            for handler in handlers:
+                handler.setFormatter(formatter)
+                logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        self._logger = logger
+    
     def run(self) -> SecurityAuditResult:
         """
         🚀 Haupt-Methode für Security-Audit
@@ -111,13 +245,22 @@ class SecurityAuditAgent:
             self.logger.info("🛡️ Security-Audit-Agent startet...")
             start_time = datetime.now()
             
-            # Finde zu scannende Dateien
-            files_to_scan = self.find_files_to_scan()
-            self.logger.info(f"📁 {len(files_to_scan)} Dateien zum Scannen gefunden")
+            lint = lint_rules(self.get_rules())
+            if lint:
+                self.logger.info(f"🧯 {len(lint)} Regeln mit Backtracking-Risiko ({', '.join(lint)}) - "
+                                 f"Zeilen über {self.config.max_line_length} Zeichen werden fensterweise geprüft (Details: --lint-rules)")
             
-            # Führe Scans durch
-            for file_path in files_to_scan:
-                self.scan_file(file_path)
+            # Im Neu-Findings-Modus wird erst nach dem Baseline-Abgleich gestreamt
+            if self.config.report_format == "ndjson" and not self.config.new_findings_only:
+                self.open_report_stream()
+            
+            if self.config.scan_scope in ("staged", "staged-lines"):
+                # Commit-Modus: nur gestagte Inhalte aus dem Git-Index
+                self.scan_staged_files(added_lines_only=self.config.scan_scope == "staged-lines")
+            else:
+                # Dateien werden während des Walks gescannt
+                scanned_count = self.scan_files(self.iter_files_to_scan())
+                self.logger.info(f"📁 {scanned_count} Dateien gescannt")
             
             # Dependency-Scan
             self.scan_dependencies()
@@ -125,6 +268,15 @@ class SecurityAuditAgent:
             # CVE-Scan
             self.scan_cves()
             
+            # Historie vor dem Baseline-Filter: sie enthält immer alle Findings
+            record = self.config.record_history and self.config.history_path and self.config.scan_scope == "all"
+            fingerprints = self.record_history() if record else None
+            
+            if self.config.new_findings_only:
+                self.apply_baseline(fingerprints)
+                if self.config.report_format == "ndjson":
+                    self.open_report_stream()
+            
             # Generiere Ergebnis
             result = self.generate_result()
             
@@ -145,23 +297,506 @@ class SecurityAuditAgent:
             self.logger.error(f"❌ Security-Audit fehlgeschlagen: {error}")
             raise
     
+    def watch(self, max_cycles: Optional[int] = None):
+        """
+        👀 Watch-Modus: Regeln, Datei-Index und Findings bleiben im Speicher
+        
+        Nach dem ersten vollständigen Scan werden nur geänderte Dateien neu
+        gescannt (inotify, sonst mtime-Polling). Der Live-Report
+        (SecurityConfig.live_report_path) ist nach jeder Änderung aktuell.
+        max_cycles begrenzt die Warte-Runden (None = bis Strg+C).
+        """
+        from watcher import PollingWatcher
+        
+        self.logger.info("👀 Watch-Modus startet...")
+        cache = self.open_scan_cache()
+        start = time.perf_counter()
+        self.sync_watch_index(None, cache)
+        result = self.write_live_report()
+        self.logger.info(f"📁 {len(self.file_index)} Dateien indiziert in {time.perf_counter() - start:.2f}s - "
+                         f"{result.total_issues} Issues, Live-Report: {self.config.live_report_path}")
+        
+        watcher = self.open_watcher()
+        try:
+            cycles = 0
+            while max_cycles is None or cycles < max_cycles:
+                cycles += 1
+                changed = watcher.wait(self.config.watch_interval)
+                if changed is not None and not changed:
+                    continue
+                
+                start = time.perf_counter()
+                rescanned = self.sync_watch_index(changed, cache)
+                if changed is None:
+                    try:
+                        watcher.watch_directories(self.directories)
+                    except OSError as error:
+                        self.logger.warning(f"⚠️ inotify: {error} - wechsle zu mtime-Polling")
+                        watcher.close()
+                        watcher = PollingWatcher()
+                if not rescanned:
+                    continue
+                
+                result = self.write_live_report()
+                for path in rescanned:
+                    for issue in self.file_issues.get(path, []) + self.manifest_issues.get(path, []):
+                        if issue.severity in ("critical", "high"):
+                            self.logger.warning(f"🚨 {issue.file}:{issue.line} [{issue.severity}] {issue.message}")
+                self.logger.info(f"🔄 {len(rescanned)} Dateien neu gescannt in {(time.perf_counter() - start) * 1000:.0f} ms - "
+                                 f"{result.total_issues} Issues ({result.critical_issues} kritisch)")
+        except KeyboardInterrupt:
+            self.logger.info("👋 Watch-Modus beendet")
+        finally:
+            watcher.close()
+            if cache is not None:
+                try:
+                    cache.save()
+                except OSError as error:
+                    self.logger.warning(f"⚠️ Scan-Cache konnte nicht gespeichert werden: {error}")
+    
+    def open_watcher(self):
+        """
+        👀 inotify-Watcher für die indizierten Verzeichnisse, sonst mtime-Polling
+        """
+        from watcher import InotifyWatcher, PollingWatcher
+        
+        watcher = None
+        try:
+            watcher = InotifyWatcher()
+            watcher.watch_directories(self.directories)
+            self.logger.info(f"👀 inotify: {len(watcher.watches)} Verzeichnisse überwacht")
+            return watcher
+        except (OSError, AttributeError) as error:
+            if watcher is not None:
+                watcher.close()
+            self.logger.info(f"🔄 inotify nicht verfügbar ({error}) - mtime-Polling alle {self.config.watch_interval}s")
+            return PollingWatcher()
+    
+    def sync_watch_index(self, changed: Optional[Set[str]], cache: Optional[ScanCache] = None) -> List[str]:
+        """
+        🔄 Datei-Index abgleichen und nur geänderte Dateien neu scannen
+        
+        changed=None (oder eine geänderte Ignore-Datei bzw. ein Manifest)
+        führt einen vollständigen Walk mit mtime/Größen-Vergleich durch, sonst
+        werden nur die gemeldeten Pfade geprüft. Liefert die neu gescannten Pfade.
+        """
+        from watcher import watch_stat_key
+        
+        full = changed is None or any(
+            os.path.basename(path) in IGNORE_FILES or os.path.basename(path) in DEPENDENCY_MANIFESTS
+            for path in changed
+        )
+        paths = list(self.iter_files_to_scan()) if full else sorted(changed)
+        # Live-Report und Baseline liegen ggf. im überwachten Baum - nie scannen (sonst Endlosschleife)
+        if not full:
+            paths = [path for path in paths if not self.is_own_output(path)]
+        removed = set(self.file_index).difference(paths) if full else set()
+        
+        to_scan = []
+        for path in paths:
+            key = watch_stat_key(path)
+            watched = key is not None and (full or path in self.file_index or self.is_watched_file(path))
+            if not watched or (self.config.max_file_size and key[1] > self.config.max_file_size):
+                if path in self.file_index:
+                    removed.add(path)
+                continue
+            if self.file_index.get(path) != key:
+                self.file_index[path] = key
+                to_scan.append(path)
+        
+        for path in removed:
+            del self.file_index[path]
+            self.file_issues.pop(path, None)
+        
+        # Wenige Dateien seriell, erster Scan über Cache und Worker-Pool
+        if len(to_scan) > PARALLEL_BATCH_SIZE:
+            scanned = self.iter_file_issues(to_scan, cache)
+        else:
+            scanned = zip(to_scan, self.collect_batch_issues(to_scan), repeat(False))
+        for path, issues, from_cache in scanned:
+            self.file_issues[path] = issues
+            if cache is not None and not from_cache:
+                cache.store(path, issues)
+        
+        rechecked = self.sync_watch_manifests() if full else []
+        return sorted(removed) + to_scan + rechecked
+    
+    def sync_watch_manifests(self) -> List[str]:
+        """
+        📦 Geänderte Manifeste (laut letztem Walk) erneut gegen die Advisories prüfen
+        """
+        from watcher import watch_stat_key
+        
+        current = set(self.manifests or ())
+        recheck = []
+        for manifest in list(self.manifest_index):
+            if manifest not in current:
+                del self.manifest_index[manifest]
+                self.manifest_issues.pop(manifest, None)
+                recheck.append(manifest)
+        for manifest in self.manifests or ():
+            key = watch_stat_key(manifest)
+            if key is not None and self.manifest_index.get(manifest) != key:
+                self.manifest_index[manifest] = key
+                recheck.append(manifest)
+        
+        checked = [manifest for manifest in recheck if manifest in self.manifest_index]
+        if checked:
+            start = len(self.results)
+            try:
+                self.scan_manifests(checked)
+            except Exception as error:
+                self.logger.warning(f"⚠️ Fehler beim Dependency-Scan: {error}")
+            for manifest in checked:
+                self.manifest_issues[manifest] = []
+            for issue in self.results[start:]:
+                self.manifest_issues.setdefault(issue.file, []).append(issue)
+            del self.results[start:]
+        return recheck
+    
+    def is_watched_file(self, path: str) -> bool:
+        """
+        🔍 Gehört ein neu aufgetauchter Pfad zum Scan (Endung, Ignore-Regeln seines Verzeichnisses)?
+        """
+        directory, name = os.path.split(path)
+        known = self.directories.get(directory)
+        dot = name.rfind('.')
+        if known is None or dot < 0 or name[dot:] not in SCAN_EXTENSION_SET:
+            return False
+        rel_dir, matcher = known
+        return not matcher.is_ignored(f"{rel_dir}/{name}" if rel_dir else name, False)
+    
+    def write_live_report(self) -> SecurityAuditResult:
+        """
+        📊 Live-Report aus dem residenten Index schreiben (atomar über os.replace)
+        """
+        self.results = IssueStore(chain(
+            chain.from_iterable(self.file_issues.values()),
+            chain.from_iterable(self.manifest_issues.values())
+        ))
+        self.files_scanned = len(self.file_index)
+        if self.config.new_findings_only:
+            self.apply_baseline()
+        result = self.generate_result()
+        
+        report_path = self.config.live_report_path
+        os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+        with open(f"{report_path}.tmp", 'w') as f:
+            json.dump(self.report_data(result), f, indent=2)
+        os.replace(f"{report_path}.tmp", report_path)
+        return result
+    
+    def handle_scan_request(self, request: Dict[str, any]) -> Dict[str, any]:
+        """
+        🔌 Scan-Anfrage eines Commit-Hooks beantworten (Scan-Server oder In-Process-Fallback)
+        
+        request: {"scope": "staged" | "staged-lines" | "files", "paths": [...]}
+        Ohne paths werden im Staged-Modus alle gestagten Dateien geprüft.
+        Geänderte Dependency-Manifeste unter den Pfaden werden mitgeprüft.
+        Liefert Verdict (passed, blocked), Zähler und Issues.
+        """
+        scope = request.get("scope", "staged")
+        paths = request.get("paths")
+        self.results = IssueStore()
+        self.files_scanned = 0
+        self.staged_contents = {}
+        
+        if scope in ("staged", "staged-lines"):
+            self.scan_staged_files(added_lines_only=scope == "staged-lines", paths=paths)
+        elif scope == "files":
+            for path in paths or ():
+                if not path.endswith(SCAN_EXTENSIONS) or self.is_own_output(path):
+                    continue
+                self.files_scanned += 1
+                self.scan_file(os.path.join('.', path))
+        else:
+            raise ValueError(f"Unbekannter Scope: {scope}")
+        
+        manifests = [
+            os.path.join('.', path) for path in paths or ()
+            if os.path.basename(path) in DEPENDENCY_MANIFESTS and os.path.isfile(path)
+        ]
+        if manifests:
+            self.scan_manifests(manifests)
+        
+        if self.config.new_findings_only:
+            self.apply_baseline()
+        result = self.generate_result()
+        return {
+            "passed": result.passed,
+            "blocked": self.config.auto_block and result.critical_issues > 0,
+            "files_scanned": self.files_scanned,
+            "total_issues": result.total_issues,
+            "critical_issues": result.critical_issues,
+            "high_issues": result.high_issues,
+            "medium_issues": result.medium_issues,
+            "low_issues": result.low_issues,
+            "issues": [issue_to_dict(issue) for issue in result.issues]
+        }
+    
+    def own_outputs(self, root: str = '.') -> Tuple[Set[str], Set[str], str]:
+        """
+        🙈 Eigene Ausgaben des Agenten relativ zu root: (Dateien, Verzeichnisse, Report-Präfix)
+        
+        Baseline, Reports und Caches enthalten Meldungen früherer Läufe (z.B.
+        gekürzte Secret-Treffer) und werden nie gescannt - sonst meldet der
+        nächste Lauf sie als neue Findings. Cache-Verzeichnisse fallen ganz
+        heraus, außer der Cache liegt direkt in root.
+        """
+        config = self.config
+        base = os.path.abspath(root)
+        
+        def relative(path: str) -> str:
+            return os.path.relpath(os.path.abspath(path), base).replace(os.sep, '/')
+        
+        caches = [path for path in (config.cache_path, config.vulnerability_db_path, config.cve_cache_path,
+                                    config.history_path) if path and path != ":memory:"]
+        files = {relative(path) for path in [config.baseline_path, config.live_report_path] + caches if path}
+        files |= {f"{path}.tmp" for path in files}
+        directories = {relative(os.path.dirname(path) or '.') for path in caches}
+        if config.rule_cache_dir:
+            directories.add(relative(config.rule_cache_dir))
+        directories.discard('.')
+        return files, directories, relative(REPORT_PREFIX)
+    
+    def is_own_output(self, path: str) -> bool:
+        """
+        🙈 Gehört ein Pfad (relativ zum Arbeitsverzeichnis) zu den eigenen Ausgaben?
+        """
+        files, directories, report_prefix = self.own_outputs()
+        rel_path = os.path.relpath(os.path.abspath(path)).replace(os.sep, '/')
+        return (rel_path in files or rel_path.startswith(report_prefix)
+                or any(rel_path.startswith(f"{directory}/") for directory in directories))
+    
     def find_files_to_scan(self) -> List[str]:
         """
         🔍 Finde zu scannende Dateien
         """
-        files = []
-        scan_extensions = ['.py', '.js', '.ts', '.tsx', '.jsx', '.json', '.yml', '.yaml', '.env', '.sh', '.ps1']
+        return list(self.iter_files_to_scan())
+    
+    def iter_files_to_scan(self, root: str = '.') -> Iterator[str]:
+        """
+        🔍 Finde zu scannende Dateien (lazy, mit .gitignore/.scanignore)
+        
+        Reihenfolge wie os.walk (top-down): erst die Dateien eines Verzeichnisses,
+        dann die Unterverzeichnisse.
+        """
+        follow_symlinks = self.config.follow_symlinks
+        own_files, own_dirs, report_prefix = self.own_outputs(root)
+        visited = set()
+        stack: List[Tuple[str, str, IgnoreMatcher]] = [(root, '', IgnoreMatcher())]
+        # Dependency-Manifeste werden im selben Walk eingesammelt (für scan_dependencies)
+        self.manifests = []
+        self.directories = {}
         
-        for root, dirs, filenames in os.walk('.'):
-            # Ignoriere bestimmte Verzeichnisse
-            dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '__pycache__', '.venv', 'venv']]
+        while stack:
+            directory, rel_dir, matcher = stack.pop()
+            try:
+                if follow_symlinks:
+                    # Symlink-Schleifen vermeiden
+                    stat = os.stat(directory)
+                    if (stat.st_dev, stat.st_ino) in visited:
+                        continue
+                    visited.add((stat.st_dev, stat.st_ino))
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError as error:
+                self.logger.debug(f"Verzeichnis übersprungen {directory}: {error}")
+                continue
             
-            for filename in filenames:
-                if any(filename.endswith(ext) for ext in scan_extensions):
-                    file_path = os.path.join(root, filename)
-                    files.append(file_path)
+            names = {entry.name for entry in entries}
+            for ignore_file in IGNORE_FILES:
+                if ignore_file in names:
+                    matcher = matcher.extend(rel_dir, self.read_ignore_file(os.path.join(directory, ignore_file)))
+            self.directories[directory] = (rel_dir, matcher)
+            
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if name not in IGNORED_DIRS and rel_path not in own_dirs and not matcher.is_ignored(rel_path, True):
+                            subdirs.append((entry.path, rel_path, matcher))
+                        continue
+                except OSError:
+                    continue
+                
+                if name in DEPENDENCY_MANIFESTS and MANIFEST_SUPERSEDED_BY.get(name) not in names:
+                    if not matcher.is_ignored(rel_path, False):
+                        self.manifests.append(entry.path)
+                
+                dot = name.rfind('.')
+                if dot < 0 or name[dot:] not in SCAN_EXTENSION_SET:
+                    continue
+                if rel_path in own_files or rel_path.startswith(report_prefix):
+                    continue
+                if matcher.is_ignored(rel_path, False) or not self.is_scannable_file(entry):
+                    continue
+                yield entry.path
+            
+            stack.extend(reversed(subdirs))
+    
+    def read_ignore_file(self, path: str) -> List[str]:
+        """
+        🙈 Zeilen einer Ignore-Datei
+        """
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read().splitlines()
+        except OSError:
+            return []
+    
+    def is_scannable_file(self, entry: "os.DirEntry") -> bool:
+        """
+        📏 Größen-Limit (die Binär-Erkennung passiert erst beim Scan)
+        """
+        if not self.config.max_file_size:
+            return True
+        try:
+            if entry.stat().st_size > self.config.max_file_size:
+                self.logger.debug(f"Datei zu groß, übersprungen: {entry.path}")
+                return False
+        except OSError:
+            return False
+        return True
+    
+    def is_binary(self, head: bytes) -> bool:
+        """
+        🔍 Binär-Erkennung über NUL-Bytes im Dateianfang
+        """
+        return self.config.skip_binary and b'\0' in head[:BINARY_SNIFF_SIZE]
+    
+    def scan_files(self, files_to_scan: Iterable[str]) -> int:
+        """
+        📁 Scanne Dateien - unveränderte Dateien kommen aus dem Scan-Cache
+        
+        files_to_scan darf ein Generator sein; gescannt wird, während er läuft.
+        Liefert die Anzahl gescannter Dateien.
+        """
+        cache = self.open_scan_cache()
+        scanned_count = cached_count = 0
+        
+        for file_path, issues, from_cache in self.iter_file_issues(files_to_scan, cache):
+            self.results.extend(issues)
+            self.stream_issues()
+            scanned_count += 1
+            self.files_scanned += 1
+            if from_cache:
+                cached_count += 1
+            elif cache is not None:
+                cache.store(file_path, issues)
         
-        return files
+        if cache is not None:
+            self.logger.info(f"💾 {cached_count} von {scanned_count} Dateien aus dem Scan-Cache")
+            try:
+                cache.save()
+            except OSError as error:
+                self.logger.warning(f"⚠️ Scan-Cache konnte nicht gespeichert werden: {error}")
+        
+        return scanned_count
+    
+    def open_scan_cache(self) -> Optional[ScanCache]:
+        """
+        💾 Öffne den Scan-Cache (None wenn deaktiviert)
+        """
+        if not self.config.cache_path:
+            return None
+        settings = {name: getattr(self.config, name) for name in SCAN_CACHE_CONFIG_FIELDS}
+        cache = ScanCache(self.config.cache_path, rule_fingerprint(self.get_rules(), settings))
+        cache.load()
+        return cache
+    
+    def iter_file_issues(self, files_to_scan: Iterable[str], cache: Optional[ScanCache]) -> Iterator[Tuple[str, List[SecurityIssue], bool]]:
+        """
+        📁 Scanne Dateien seriell oder parallel (SecurityConfig.jobs)
+        
+        Liefert (Datei, Issues, aus Cache) in Eingabe-Reihenfolge.
+        """
+        jobs = self.config.jobs or os.cpu_count() or 1
+        cached: Dict[str, List[SecurityIssue]] = {}
+        
+        def batches() -> Iterator[List[Tuple[str, bool]]]:
+            # Cache-Treffer bleiben im Hauptprozess, Worker scannen nur den Rest
+            batch = []
+            for file_path in files_to_scan:
+                issues = cache.lookup(file_path) if cache is not None else None
+                if issues is not None:
+                    cached[file_path] = issues
+                batch.append((file_path, issues is None))
+                if len(batch) >= PARALLEL_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        
+        if jobs <= 1:
+            # Auch seriell batchweise: Secret-Treffer eines Batches werden gemeinsam bewertet
+            for batch in batches():
+                scanned = iter(self.collect_batch_issues([file_path for file_path, needs_scan in batch if needs_scan]))
+                for file_path, needs_scan in batch:
+                    if needs_scan:
+                        yield file_path, next(scanned), False
+                    else:
+                        yield file_path, cached.pop(file_path), True
+            return
+        
+        import multiprocessing
+        
+        self.logger.info(f"⚡ Paralleler Scan: {jobs} Worker")
+        
+        # imap liefert die Batches in Eingabe-Reihenfolge - Ergebnis identisch zum seriellen Scan
+        with multiprocessing.Pool(jobs, initializer=_init_scan_worker, initargs=(self.config,)) as pool:
+            for batch, profile in pool.imap(_scan_batch, batches()):
+                if profile:
+                    self.rule_profile.merge(profile)
+                for file_path, records in batch:
+                    if records is None:
+                        yield file_path, cached.pop(file_path), True
+                    else:
+                        yield file_path, [SecurityIssue(*record) for record in records], False
+    
+    def collect_file_issues(self, file_path: str) -> List[SecurityIssue]:
+        """
+        📝 Scanne eine Datei und liefere nur deren Findings
+        """
+        start = len(self.results)
+        self.scan_file(file_path)
+        issues = self.results[start:]
+        del self.results[start:]
+        return issues
+    
+    def collect_batch_issues(self, file_paths: List[str]) -> List[List[SecurityIssue]]:
+        """
+        📝 Scanne mehrere Dateien und liefere deren Findings pro Datei
+        
+        Secret-Treffer werden vorläufig übernommen und am Ende für alle
+        Dateien in einem Entropie-Batch bewertet (statt einem pro Datei);
+        unechte Treffer werden danach aus den Findings entfernt.
+        """
+        batch: List[List[SecurityIssue]] = []
+        pending = []  # (Index in batch, Secret-Treffer, Position ihres Issues in der Datei oder None)
+        self.pending_secrets = []
+        try:
+            for file_path in file_paths:
+                start = len(self.results)
+                batch.append(self.collect_file_issues(file_path))
+                for hits, positions in self.pending_secrets:
+                    offsets = [None if position is None else position - start for position in positions]
+                    pending.append((len(batch) - 1, hits, offsets))
+                self.pending_secrets.clear()
+        finally:
+            self.pending_secrets = None
+        
+        rejected: Dict[int, Set[int]] = {}
+        for (index, _, offsets), verdicts in zip(pending, self.classify_secrets([hits for _, hits, _ in pending])):
+            rejected.setdefault(index, set()).update(
+                offset for offset, real in zip(offsets, verdicts) if offset is not None and not real
+            )
+        for index, offsets in rejected.items():
+            if offsets:
+                batch[index] = [issue for offset, issue in enumerate(batch[index]) if offset not in offsets]
+        return batch
     
     def scan_file(self, file_path: str):
         """
@@ -169,263 +804,595 @@ class SecurityAuditAgent:
         """
         try:
             self.logger.debug(f"🔍 Scanne Datei: {file_path}")
+            if self.rule_profile is not None:
+                self.rule_profile.file = file_path
+            
+            engine = self.get_engine(file_path=file_path)
+            if not engine.rules:
+                return
+            if engine.locator is not None:
+                self.scan_mapped_file(file_path, engine)
+                return
+            
+            with open(file_path, 'rb') as f:
+                if self.is_binary(f.read(BINARY_SNIFF_SIZE)):
+                    return
             
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
                 lines = content.split('\n')
             
-            # Secrets-Scan
-            self.scan_secrets(file_path, lines)
-            
-            # Vulnerability-Scan
-            self.scan_vulnerabilities(file_path, lines)
-            
-            # Code-Quality-Scan
-            self.scan_code_quality(file_path, lines)
+            # Secrets-, Vulnerability- und Code-Quality-Scan in einem Durchlauf
+            self.scan_lines(file_path, lines, engine, suppressions=parse_suppressions(content))
             
         except Exception as error:
             self.logger.warning(f"⚠️ Fehler beim Scannen von {file_path}: {error}")
     
+    def scan_mapped_file(self, file_path: str, engine: RuleEngine):
+        """
+        🗺️ Scanne eine Datei über mmap direkt auf Bytes-Ebene
+        """
+        import mmap
+        
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if self.is_binary(buffer[:BINARY_SNIFF_SIZE]):
+                    self.logger.debug(f"Binärdatei übersprungen: {file_path}")
+                    return
+                # Alleinstehendes \r ist im Textmodus ein Zeilenumbruch - dann Textpfad
+                if _LONE_CR.search(buffer):
+                    content = buffer[:].decode('utf-8', errors='ignore')
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                    self.scan_lines(file_path, content.split('\n'), engine, suppressions=parse_suppressions(content))
+                    return
+                self.run_engine(file_path, lambda deadline: engine.scan_buffer(buffer, deadline), parse_suppressions(buffer))
+    
+    def scan_staged_files(self, added_lines_only: bool = False, paths: Optional[List[str]] = None):
+        """
+        📝 Scanne gestagte Dateien mit Inhalt aus dem Git-Index (optional nur paths)
+        """
+        if paths is None:
+            staged_files = self.find_staged_files()
+        else:
+            staged_files = [path for path in paths if path.endswith(SCAN_EXTENSIONS)]
+        staged_files = [path for path in staged_files if not self.is_own_output(path)]
+        self.logger.info(f"📁 {len(staged_files)} gestagte Dateien zum Scannen gefunden")
+        if not staged_files:
+            return
+        
+        added_lines = self.get_staged_added_lines() if added_lines_only else {}
+        contents = self.read_staged_contents(staged_files)
+        
+        for path in staged_files:
+            if path not in contents:
+                continue
+            if added_lines_only and not added_lines.get(path):
+                continue
+            file_path = os.path.join('.', path)
+            self.files_scanned += 1
+            if self.rule_profile is not None:
+                self.rule_profile.file = file_path
+            try:
+                engine = self.get_engine(file_path=file_path)
+                content = self.staged_contents[file_path] = contents[path]
+                suppressions = parse_suppressions(content)
+                if not added_lines_only and engine.locator is not None and not _LONE_CR.search(content):
+                    self.run_engine(file_path, lambda deadline: engine.scan_buffer(content, deadline), suppressions)
+                    continue
+                lines = content.decode('utf-8', errors='ignore').split('\n')
+                self.scan_lines(file_path, lines, engine, added_lines.get(path) if added_lines_only else None, suppressions)
+            except Exception as error:
+                self.logger.warning(f"⚠️ Fehler beim Scannen von {file_path}: {error}")
+            finally:
+                self.stream_issues()
+    
+    def find_staged_files(self) -> List[str]:
+        """
+        🔍 Gestagte (hinzugefügte/geänderte) Dateien relativ zum Arbeitsverzeichnis
+        """
+        import subprocess
+        
+        output = subprocess.run(
+            ["git", "diff", "--cached", "--name-only", "-z", "--relative", "--diff-filter=ACMR"],
+            capture_output=True,
+            check=True
+        ).stdout.decode('utf-8', errors='surrogateescape')
+        
+        return [path for path in output.split('\0') if path and path.endswith(SCAN_EXTENSIONS)]
+    
+    def get_staged_added_lines(self) -> Dict[str, List[int]]:
+        """
+        ➕ Zeilennummern (im Index-Stand) der hinzugefügten Zeilen pro Datei
+        """
+        import subprocess
+        
+        output = subprocess.run(
+            ["git", "-c", "core.quotepath=off", "diff", "--cached", "--relative", "--diff-filter=ACMR",
+             "--unified=0", "--no-color", "--no-ext-diff", "--no-prefix"],
+            capture_output=True,
+            check=True
+        ).stdout.decode('utf-8', errors='surrogateescape')
+        
+        added_lines: Dict[str, List[int]] = {}
+        hunk_header = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+        current: Optional[List[int]] = None
+        
+        for line in output.split('\n'):
+            if line.startswith('+++ '):
+                # git hängt bei Pfaden mit Leerzeichen einen Tab an
+                current = added_lines.setdefault(line[4:].rstrip('\t'), [])
+            elif line.startswith('@@') and current is not None:
+                match = hunk_header.match(line)
+                if match:
+                    start = int(match.group(1))
+                    count = int(match.group(2)) if match.group(2) is not None else 1
+                    current.extend(range(start, start + count))
+        
+        return added_lines
+    
+    def read_staged_contents(self, paths: List[str]) -> Dict[str, bytes]:
+        """
+        📥 Lese Datei-Inhalte aus dem Git-Index (ein git-Aufruf für alle Dateien)
+        """
+        import subprocess
+        
+        paths = [path for path in paths if '\n' not in path]
+        request = ''.join(f":./{path}\n" for path in paths).encode('utf-8', errors='surrogateescape')
+        output = subprocess.run(
+            ["git", "cat-file", "--batch"],
+            input=request,
+            capture_output=True,
+            check=True
+        ).stdout
+        
+        contents: Dict[str, bytes] = {}
+        offset = 0
+        for path in paths:
+            header_end = output.index(b'\n', offset)
+            header = output[offset:header_end].split()
+            offset = header_end + 1
+            if len(header) != 3 or header[1] != b'blob':
+                continue  # missing / kein Blob
+            size = int(header[2])
+            contents[path] = output[offset:offset + size]
+            offset += size + 1
+        
+        return contents
+    
+    def get_rules(self) -> Tuple[SecurityRule, ...]:
+        """
+        📋 Alle aktiven Regeln (Secrets, Vulnerabilities, Code-Qualität, Regel-Packs)
+        
+        Regel-Packs werden beim ersten Aufruf geladen und validiert
+        (RuleConfigError bei ungültigen Regeln).
+        """
+        if self.rules is None:
+            builtin = (
+                build_secret_rules(self.config.secret_patterns)
+                + build_vulnerability_rules()
+                + build_quality_rules()
+            )
+            sources = read_rule_sources(self.config.rule_packs)
+            if self.config.rules:
+                sources.append(("config.rules", json.dumps(self.config.rules, sort_keys=True).encode('utf-8')))
+            self.rules = builtin + load_rule_packs(sources, [rule.rule_id for rule in builtin], self.config.rule_cache_dir)
+        return self.rules
+    
+    def get_engines(self, rule_type: Optional[str] = None) -> Dict[str, RuleEngine]:
+        """
+        🗂️ Regel-Engines aller zu scannenden Dateiendungen (z.B. zum Vorkompilieren)
+        """
+        # Eine Endung allein ist ein gültiger Pfad für die Endungs-Erkennung
+        return {extension: self.get_engine(rule_type, extension) for extension in SCAN_EXTENSIONS}
+    
+    def get_engine(self, rule_type: Optional[str] = None, file_path: Optional[str] = None) -> RuleEngine:
+        """
+        ⚙️ Kompilierte Regel-Engine für alle Regeln oder einen Regel-Typ
+        
+        Mit file_path nur die Regeln, die für die Dateiendung (bzw. das
+        Lockfile) gelten - Engines werden erst für tatsächlich gescannte
+        Endungen gebaut.
+        """
+        key = (rule_type, None if file_path is None else file_dispatch_key(file_path))
+        engine = self.engines.get(key)
+        if engine is None:
+            rules = self.get_rules()
+            if rule_type is not None:
+                rules = tuple(rule for rule in rules if rule.type == rule_type)
+            if file_path is not None:
+                dispatch = get_rule_dispatch(rules)
+                rules = dispatch.get(key[1], dispatch[""])
+            engine = self.engines[key] = get_rule_engine(rules, self.config.max_line_length)
+        if engine.profile is not self.rule_profile:
+            # Engines sind prozessweit gecacht - Profil des aktuellen Agenten anhängen
+            engine.attach_profile(self.rule_profile)
+        return engine
+    
+    def scan_lines(self, file_path: str, lines: List[str], engine: RuleEngine, line_numbers: Optional[List[int]] = None,
+                   suppressions: Optional[Suppressions] = None):
+        """
+        ⚙️ Wende eine Regel-Engine auf Zeilen an (optional nur auf line_numbers)
+        """
+        if self.rule_profile is not None:
+            self.rule_profile.file = file_path
+        self.run_engine(file_path, lambda deadline: engine.scan(lines, line_numbers, deadline), suppressions)
+    
+    def run_engine(self, file_path: str, scan: Callable[[Optional[float]], List[Tuple[SecurityRule, int, "re.Match"]]],
+                   suppressions: Optional[Suppressions] = None):
+        """
+        ⏱️ Führe einen Engine-Scan im Zeitbudget der Datei aus
+        
+        Bei Überschreitung werden die Treffer bis dahin übernommen und ein
+        "Scan abgebrochen"-Finding erzeugt, statt den Commit-Hook zu blockieren.
+        """
+        budget = self.config.file_time_budget
+        try:
+            hits = scan(time.perf_counter() + budget if budget else None)
+        except ScanBudgetExceeded as truncated:
+            self.logger.warning(f"⏱️ Zeitbudget ({budget}s) überschritten: {file_path} ab Zeile {truncated.line_num} nicht geprüft")
+            self.scan_hits(file_path, truncated.hits, suppressions)
+            self.results.append(SecurityIssue(
+                file=file_path,
+                line=truncated.line_num,
+                column=1,
+                severity="medium",
+                type="scan",
+                message="Scan abgebrochen: Zeitbudget überschritten",
+                description=f"Die Datei wurde ab Zeile {truncated.line_num} nicht geprüft (Zeitbudget {budget}s)",
+                recommendation="Datei in .scanignore aufnehmen (z.B. generierter Code) oder teure Regeln entschärfen (--profile, --lint-rules)",
+                rule_id=SCAN_BUDGET_RULE_ID
+            ))
+            return
+        self.scan_hits(file_path, hits, suppressions)
+    
+    def scan_hits(self, file_path: str, hits: List[Tuple[SecurityRule, int, "re.Match"]],
+                  suppressions: Optional[Suppressions] = None):
+        """
+        📋 Übernehme Regel-Treffer als Security-Issues (ohne unterdrückte)
+        
+        Im Batch-Scan (collect_batch_issues) werden Secret-Treffer vorläufig
+        übernommen und erst am Ende des Batches bewertet.
+        """
+        secrets = [hit for hit in hits if hit[0].type == "secret"]
+        positions = None
+        if self.pending_secrets is not None:
+            positions = []
+            self.pending_secrets.append((secrets, positions))
+            verdicts = repeat(True)
+        else:
+            # Secret-Treffer der Datei werden in einem Batch bewertet
+            verdicts = iter(self.classify_secrets([secrets])[0])
+        for rule, line_num, match in hits:
+            secret = rule.type == "secret"
+            if secret and not next(verdicts):
+                continue
+            suppressed = suppressions is not None and suppressions.suppressed(rule.rule_id, line_num)
+            if secret and positions is not None:
+                positions.append(None if suppressed else len(self.results))
+            if not suppressed:
+                self.results.append(self.create_issue(rule, file_path, line_num, match))
+    
+    def classify_secrets(self, groups: List[List[Tuple[SecurityRule, int, "re.Match"]]]) -> List[List[bool]]:
+        """
+        🎯 Welche Secret-Treffer echt sind (Secret-Präfix oder Entropie)
+        
+        groups enthält die Secret-Treffer je Datei; bewertet werden alle
+        Gruppen in einem Batch. Treffer benannter Secret-Regeln gelten als
+        verankert (niedrigere Entropie-Schwelle). Ein Entropie-Treffer
+        entfällt, wenn in derselben Zeile der Datei schon ein anderer
+        Secret-Treffer echt ist.
+        """
+        hits = [hit for group in groups for hit in group]
+        if not hits:
+            return [[] for _ in groups]
+        candidates = []
+        for rule, _, match in hits:
+            name, value = secret_candidate(match)
+            candidates.append((name, value, rule.rule_id != ENTROPY_RULE_ID))
+        verdicts = score_secret_candidates(candidates)
+        # Benannte Secret-Regeln: ein Präfix irgendwo im Treffer genügt weiterhin
+        verdicts = [
+            real or (anchored and SECRET_INDICATOR_MATCHER.search(match.group()) is not None)
+            for real, (_, _, anchored), (_, _, match) in zip(verdicts, candidates, hits)
+        ]
+        
+        classified = []
+        start = 0
+        for group in groups:
+            group_verdicts = verdicts[start:start + len(group)]
+            start += len(group)
+            reported = {line_num for (rule, line_num, _), real in zip(group, group_verdicts) if real and rule.rule_id != ENTROPY_RULE_ID}
+            classified.append([
+                real and (rule.rule_id != ENTROPY_RULE_ID or line_num not in reported)
+                for (rule, line_num, _), real in zip(group, group_verdicts)
+            ])
+        return classified
+    
+    def create_issue(self, rule: SecurityRule, file_path: str, line_num: int, match: "re.Match") -> SecurityIssue:
+        """
+        📋 Erzeuge Security-Issue aus einem Regel-Treffer
+        """
+        if rule.find_all:
+            message = f"{rule.message}: {match.group()[:20]}..."
+            column = match.start() + 1
+        else:
+            message = rule.message
+            column = 1
+        
+        return SecurityIssue(
+            file=file_path,
+            line=line_num,
+            column=column,
+            severity=rule.severity,
+            type=rule.type,
+            message=message,
+            description=rule.description,
+            recommendation=rule.recommendation,
+            rule_id=rule.rule_id
+        )
+    
     def scan_secrets(self, file_path: str, lines: List[str]):
         """
         🔐 Scanne nach Secrets
         """
-        for line_num, line in enumerate(lines, 1):
-            for pattern in self.config.secret_patterns:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                
-                for match in matches:
-                    # Prüfe ob es sich um einen echten Secret handelt
-                    if self.is_real_secret(match.group()):
-                        issue = SecurityIssue(
-                            file=file_path,
-                            line=line_num,
-                            column=match.start() + 1,
-                            severity="critical",
-                            type="secret",
-                            message=f"Potentieller Secret gefunden: {match.group()[:20]}...",
-                            description="Ein Secret wurde im Code gefunden. Dies ist ein Sicherheitsrisiko.",
-                            recommendation="Secret in Umgebungsvariable oder Secrets-Manager verschieben"
-                        )
-                        self.results.append(issue)
+        self.scan_lines(file_path, lines, self.get_engine("secret", file_path), suppressions=find_suppressions(lines))
     
     def scan_vulnerabilities(self, file_path: str, lines: List[str]):
         """
         🚨 Scanne nach bekannten Vulnerabilities
         """
-        vulnerability_patterns = [
-            # SQL Injection
-            (r"execute\s*\(\s*[\"'].*\+.*[\"']", "SQL Injection Risk"),
-            (r"query\s*\(\s*[\"'].*\+.*[\"']", "SQL Injection Risk"),
-            
-            # XSS
-            (r"innerHTML\s*=\s*.*\+", "XSS Risk"),
-            (r"document\.write\s*\(\s*.*\+", "XSS Risk"),
-            
-            # Command Injection
-            (r"os\.system\s*\(\s*.*\+", "Command Injection Risk"),
-            (r"subprocess\.call\s*\(\s*.*\+", "Command Injection Risk"),
-            
-            # Hardcoded Credentials
-            (r"password\s*=\s*[\"'][^\"']{8,}[\"']", "Hardcoded Password"),
-            (r"api_key\s*=\s*[\"'][^\"']{8,}[\"']", "Hardcoded API Key"),
-            
-            # Weak Crypto
-            (r"md5\s*\(", "Weak Hash Function (MD5)"),
-            (r"sha1\s*\(", "Weak Hash Function (SHA1)"),
-            
-            # Debug Code
-            (r"console\.log\s*\(", "Debug Code in Production"),
-            (r"print\s*\(", "Debug Code in Production"),
-            (r"debugger;", "Debug Statement"),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message in vulnerability_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    severity = "high" if "Injection" in message else "medium"
-                    
-                    issue = SecurityIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=1,
-                        severity=severity,
-                        type="vulnerability",
-                        message=message,
-                        description=f"Potentielle Sicherheitslücke gefunden: {message}",
-                        recommendation="Code überprüfen und sichere Alternative verwenden"
-                    )
-                    self.results.append(issue)
+        self.scan_lines(file_path, lines, self.get_engine("vulnerability", file_path), suppressions=find_suppressions(lines))
     
     def scan_code_quality(self, file_path: str, lines: List[str]):
         """
         📊 Scanne Code-Qualität
         """
-        quality_patterns = [
-            # Unused Imports
-            (r"import\s+[^#\n]+", "Unused Import"),
-            
-            # Dead Code
-            (r"if\s+False:", "Dead Code"),
-            (r"if\s+0:", "Dead Code"),
-            
-            # Magic Numbers
-            (r"\b\d{4,}\b", "Magic Number"),
-            
-            # Long Functions
-            (r"def\s+\w+\s*\([^)]*\):", "Long Function"),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message in quality_patterns:
-                if re.search(pattern, line):
-                    issue = SecurityIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=1,
-                        severity="low",
-                        type="code_quality",
-                        message=message,
-                        description=f"Code-Qualitätsproblem: {message}",
-                        recommendation="Code refactoren und verbessern"
-                    )
-                    self.results.append(issue)
+        self.scan_lines(file_path, lines, self.get_engine("code_quality", file_path), suppressions=find_suppressions(lines))
     
     def scan_dependencies(self):
         """
         📦 Scanne Dependencies
+        
+        Geprüft werden alle beim Datei-Walk gefundenen Manifeste (ohne Walk,
+        z.B. im Commit-Modus, die des aktuellen Verzeichnisses).
         """
         try:
-            # Python Dependencies
-            if os.path.exists('requirements.txt'):
-                self.scan_python_dependencies()
-            
-            # Node.js Dependencies
-            if os.path.exists('package.json'):
-                self.scan_node_dependencies()
-                
+            manifests = self.manifests if self.manifests is not None else self.find_manifests()
+            self.scan_manifests(manifests)
         except Exception as error:
             self.logger.warning(f"⚠️ Fehler beim Dependency-Scan: {error}")
     
-    def scan_python_dependencies(self):
+    def find_manifests(self, directory: str = '.') -> List[str]:
         """
-        🐍 Scanne Python Dependencies
+        📦 Dependency-Manifeste eines Verzeichnisses (Lockfile vor Manifest)
         """
-        try:
-            with open('requirements.txt', 'r') as f:
-                requirements = f.read().split('\n')
-            
-            for requirement in requirements:
-                if requirement.strip() and not requirement.startswith('#'):
-                    package = requirement.split('==')[0].split('>=')[0].split('<=')[0]
-                    self.check_package_vulnerability(package)
-                    
-        except Exception as error:
-            self.logger.warning(f"⚠️ Fehler beim Python Dependency-Scan: {error}")
+        names = set(os.listdir(directory))
+        return [
+            os.path.join(directory, name) for name in DEPENDENCY_MANIFESTS
+            if name in names and MANIFEST_SUPERSEDED_BY.get(name) not in names
+        ]
+    
+    def scan_manifests(self, manifests: List[str]):
+        """
+        📦 Prüfe Manifeste: identische Inhalte einmal parsen, eine gebündelte Abfrage pro Ökosystem
+        """
+        groups: Dict[str, List[str]] = {}  # sha256 -> Manifeste mit diesem Inhalt
+        for manifest in manifests:
+            try:
+                groups.setdefault(file_sha256(manifest), []).append(manifest)
+            except OSError as error:
+                self.logger.warning(f"⚠️ Manifest nicht lesbar {manifest}: {error}")
+        if not groups:
+            return
+        
+        parsed = self.parse_manifests([paths[0] for paths in groups.values()])
+        self.logger.info(f"📦 {len(manifests)} Manifeste ({len(groups)} verschiedene) mit "
+                         f"{sum(len(packages) for packages in parsed.values())} Packages")
+        
+        queries: Dict[str, set] = {}
+        for manifest, packages in parsed.items():
+            package_manager = DEPENDENCY_MANIFESTS[os.path.basename(manifest)][0]
+            queries.setdefault(package_manager, set()).update((name, version) for name, version, _ in packages)
+        
+        matches = {
+            package_manager: self.lookup_packages(package_manager, packages)
+            for package_manager, packages in queries.items()
+        }
+        
+        for paths in groups.values():
+            packages = parsed.get(paths[0])
+            if packages is None:
+                continue
+            package_manager = DEPENDENCY_MANIFESTS[os.path.basename(paths[0])][0]
+            for manifest in paths:
+                self.add_package_issues(manifest, packages, matches[package_manager])
     
-    def scan_node_dependencies(self):
+    def parse_manifests(self, manifests: List[str]) -> Dict[str, List[Tuple[str, Optional[str], int]]]:
         """
-        🟢 Scanne Node.js Dependencies
+        📦 Parse Manifeste - parallel bei SecurityConfig.jobs > 1
         """
+        def collect(results) -> Dict[str, List[Tuple[str, Optional[str], int]]]:
+            parsed = {}
+            for manifest, packages, error in results:
+                if error:
+                    self.logger.warning(f"⚠️ Fehler beim Parsen von {manifest}: {error}")
+                else:
+                    parsed[manifest] = packages
+            return parsed
+        
+        jobs = min(self.config.jobs or os.cpu_count() or 1, len(manifests))
+        if jobs <= 1:
+            return collect(map(_parse_manifest, manifests))
+        
+        import multiprocessing
+        
+        with multiprocessing.Pool(jobs) as pool:
+            return collect(pool.imap(_parse_manifest, manifests))
+    
+    def open_vulnerability_db(self) -> Optional["VulnerabilityDatabase"]:
+        """
+        🗄️ Öffne die lokale Vulnerability-Datenbank (Import nur bei geänderten Feeds)
+        """
+        from vulndb import VulnerabilityDatabase
+        
+        if self.vulnerability_db is None:
+            database = VulnerabilityDatabase(self.config.vulnerability_db_path)
+            if database.sync(self.config.vulnerability_feeds) and database.advisory_count():
+                self.logger.info(f"📥 Vulnerability-Datenbank importiert: {database.advisory_count()} Advisories")
+            self.vulnerability_db = database
+        return self.vulnerability_db
+    
+    def check_packages(self, manifest: str, package_manager: str, packages: List[Tuple[str, Optional[str], int]]):
+        """
+        🔍 Prüfe alle Packages eines Manifests mit einer gebündelten Abfrage
+        
+        packages: (Name, Version oder None, Zeile im Manifest)
+        """
+        if not packages:
+            return
+        matches = self.lookup_packages(package_manager, [(name, version) for name, version, _ in packages])
+        self.add_package_issues(manifest, packages, matches)
+    
+    def open_advisory_client(self) -> Optional["AdvisoryClient"]:
+        """
+        🌐 Advisory-Client mit persistentem CVE-Cache (None wenn keine advisory_url konfiguriert)
+        """
+        from advisory import AdvisoryCache, AdvisoryClient
+        
+        if not self.config.advisory_url:
+            return None
+        if self.advisory_client is None:
+            self.cve_cache = AdvisoryCache(self.config.cve_cache_path, self.config.cve_cache_ttl)
+            self.cve_cache.load()
+            self.advisory_client = AdvisoryClient(
+                self.config.advisory_url, self.cve_cache,
+                workers=self.config.advisory_workers, rate_limit=self.config.advisory_rate_limit
+            )
+        return self.advisory_client
+    
+    def lookup_packages(self, package_manager: str, packages: Iterable[Tuple[str, Optional[str]]]) -> Dict[Tuple[str, Optional[str]], List["VulnerabilityMatch"]]:
+        """
+        🔍 Advisories für Packages: lokale Datenbank, ergänzt um die Advisory-API (falls konfiguriert)
+        
+        Packages ohne auflösbare Version (None) werden nicht abgefragt.
+        """
+        from advisory import AdvisoryLookupError
+        from vulndb import OSV_ECOSYSTEMS
+        
+        packages = [package for package in packages if package[1] is not None]
+        if not packages:
+            return {}
+        ecosystem = OSV_ECOSYSTEMS.get(package_manager, package_manager)
+        matches = self.open_vulnerability_db().lookup(ecosystem, packages)
+        
+        client = self.open_advisory_client()
+        if client is None:
+            return matches
+        
         try:
-            with open('package.json', 'r') as f:
-                package_data = json.load(f)
-            
-            dependencies = package_data.get('dependencies', {})
-            dev_dependencies = package_data.get('devDependencies', {})
-            
-            all_deps = {**dependencies, **dev_dependencies}
-            
-            for package, version in all_deps.items():
-                self.check_package_vulnerability(package, 'npm')
-                
-        except Exception as error:
-            self.logger.warning(f"⚠️ Fehler beim Node.js Dependency-Scan: {error}")
+            remote = client.lookup(ecosystem, packages)
+        except AdvisoryLookupError as error:
+            self.logger.warning(f"⚠️ {error}")
+            remote = error.results
+        finally:
+            try:
+                self.cve_cache.save()
+            except OSError as error:
+                self.logger.warning(f"⚠️ CVE-Cache konnte nicht gespeichert werden: {error}")
+        
+        for package, remote_matches in remote.items():
+            known = matches.setdefault(package, [])
+            known_ids = {match.advisory_id for match in known}
+            known.extend(match for match in remote_matches if match.advisory_id not in known_ids)
+        return matches
     
-    def check_package_vulnerability(self, package: str, package_manager: str = 'pip'):
+    def add_package_issues(self, manifest: str, packages: List[Tuple[str, Optional[str], int]],
+                           matches: Dict[Tuple[str, Optional[str]], List["VulnerabilityMatch"]]):
+        """
+        📋 Übernehme Vulnerability-Treffer eines Manifests als Security-Issues
+        
+        Packages ohne auflösbare Version bekommen statt CVE-Treffern ein
+        einzelnes Finding niedriger Severity (UNPINNED_RULE_ID).
+        """
+        for package, version, line_num in packages:
+            if version is None:
+                self.results.append(SecurityIssue(
+                    file=manifest,
+                    line=line_num,
+                    column=1,
+                    severity="low",
+                    type="dependency",
+                    message=f"Package ohne auflösbare Version: {package}",
+                    description=f"Die Version von {package} ist nicht gepinnt (z.B. latest, * oder Git-/URL-Abhängigkeit) - "
+                                "bekannte Vulnerabilities lassen sich nicht zuordnen",
+                    recommendation=f"Package {package} auf eine feste Version pinnen oder ein Lockfile committen",
+                    rule_id=UNPINNED_RULE_ID
+                ))
+                continue
+            for match in matches.get((package, version), []):
+                self.results.append(SecurityIssue(
+                    file=manifest,
+                    line=line_num,
+                    column=1,
+                    severity=match.severity,
+                    type="cve",
+                    message=f"Vulnerable Package: {package} {version} ({match.advisory_id})",
+                    cve_id=match.cve_id,
+                    description=match.summary or f"Package {package} hat bekannte Vulnerabilities",
+                    recommendation=(f"Package {package} auf Version {match.fixed_in} oder neuer aktualisieren"
+                                    if match.fixed_in else f"Package {package} auf eine nicht betroffene Version aktualisieren"),
+                    fixed_in=match.fixed_in
+                ))
+    
+    def check_package_vulnerability(self, package: str, package_manager: str = 'pip', version: Optional[str] = None):
         """
         🔍 Prüfe Package auf Vulnerabilities
         """
         try:
-            # Hier würde die echte CVE-Datenbank-Abfrage stattfinden
-            # Für Demo-Zwecke simulieren wir einige bekannte Vulnerabilities
-            
-            known_vulnerabilities = {
-                'requests': ['CVE-2021-33503'],
-                'urllib3': ['CVE-2021-33503'],
-                'lodash': ['CVE-2021-23337'],
-                'moment': ['CVE-2020-7720'],
-            }
-            
-            if package.lower() in known_vulnerabilities:
-                for cve_id in known_vulnerabilities[package.lower()]:
-                    issue = SecurityIssue(
-                        file=f"{package_manager}_dependencies",
-                        line=1,
-                        column=1,
-                        severity="high",
-                        type="cve",
-                        message=f"Vulnerable Package: {package}",
-                        cve_id=cve_id,
-                        description=f"Package {package} hat bekannte Vulnerabilities",
-                        recommendation=f"Package {package} auf neueste Version aktualisieren",
-                        fixed_in="latest"
-                    )
-                    self.results.append(issue)
-                    
+            self.check_packages(f"{package_manager}_dependencies", package_manager, [(package, version, 1)])
         except Exception as error:
             self.logger.debug(f"Fehler beim Prüfen von Package {package}: {error}")
     
     def scan_cves(self):
         """
-        🚨 Scanne nach CVEs
-        """
-        # Hier würde die echte CVE-Datenbank-Abfrage stattfinden
-        # Für Demo-Zwecke simulieren wir einige CVEs
+        🚨 Prüfe den Stand der CVE-Datenbank
         
-        simulated_cves = [
-            {
-                "cve_id": "CVE-2024-0001",
-                "severity": "critical",
-                "description": "Simulierte kritische Vulnerability",
-                "affected_packages": ["requests", "urllib3"]
-            }
-        ]
+        Die eigentlichen CVE-Treffer entstehen beim Dependency-Scan.
+        """
+        try:
+            database = self.open_vulnerability_db()
+            count = database.advisory_count()
+        except Exception as error:
+            self.logger.warning(f"⚠️ Vulnerability-Datenbank nicht verfügbar: {error}")
+            return
         
-        for cve in simulated_cves:
-            issue = SecurityIssue(
-                file="cve_scan",
-                line=1,
-                column=1,
-                severity=cve["severity"],
-                type="cve",
-                message=f"CVE gefunden: {cve['cve_id']}",
-                cve_id=cve["cve_id"],
-                description=cve["description"],
-                recommendation="Betroffene Packages aktualisieren"
+        if count == 0:
+            self.logger.warning(
+                f"⚠️ Keine Advisory-Daten gefunden ({', '.join(self.config.vulnerability_feeds)}) - "
+                "Dependency-Prüfung ohne CVE-Abgleich"
             )
-            self.results.append(issue)
+        else:
+            self.logger.info(f"🗄️ Vulnerability-Datenbank: {count} Advisories (Import: {database.get_meta('imported')})")
     
     def is_real_secret(self, match: str) -> bool:
         """
-        🔍 Prüfe ob es sich um einen echten Secret handelt
+        🔍 Prüfe ob es sich um einen echten Secret handelt (Einzelprüfung,
+        Scans bewerten alle Treffer eines Datei-Batches mit classify_secrets)
         """
-        # Einfache Heuristik - in der Praxis würde hier eine komplexere Logik stehen
-        secret_indicators = [
-            'sk_', 'pk_', 'AKIA', 'ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_',
-            'AIza', 'ya29.', '1//', '4/0A', 'AIzaSy'
-        ]
-        
-        return any(indicator in match for indicator in secret_indicators)
+        return is_real_secret(match)
     
     def generate_result(self) -> SecurityAuditResult:
         """
         📊 Generiere Security-Audit-Ergebnis
         """
-        critical_issues = len([i for i in self.results if i.severity == "critical"])
-        high_issues = len([i for i in self.results if i.severity == "high"])
-        medium_issues = len([i for i in self.results if i.severity == "medium"])
-        low_issues = len([i for i in self.results if i.severity == "low"])
+        # Alle Zahlen kommen aus der laufenden Aggregation - kein Durchlauf über die Issues
+        stats = self.results.stats
+        critical_issues = stats.by_severity["critical"]
+        high_issues = stats.by_severity["high"]
+        medium_issues = stats.by_severity["medium"]
+        low_issues = stats.by_severity["low"]
         
         total_issues = len(self.results)
         
@@ -433,13 +1400,23 @@ class SecurityAuditAgent:
         passed = critical_issues == 0 and high_issues <= 5
         
         summary = {
-            "total_files_scanned": len(set(i.file for i in self.results)),
-            "secrets_found": len([i for i in self.results if i.type == "secret"]),
-            "vulnerabilities_found": len([i for i in self.results if i.type == "vulnerability"]),
-            "cves_found": len([i for i in self.results if i.type == "cve"]),
+            "total_files_scanned": self.files_scanned,
+            "secrets_found": stats.by_type.get("secret", 0),
+            "vulnerabilities_found": stats.by_type.get("vulnerability", 0),
+            "cves_found": stats.by_type.get("cve", 0),
+            "scans_truncated": stats.by_type.get("scan", 0),
             "dependencies_scanned": True,
-            "recommendations": self.generate_recommendations()
+            "recommendations": self.generate_recommendations(),
+            "severity_histogram": dict(stats.by_severity),
+            "type_histogram": dict(stats.by_type),
+            "top_files": stats.top_files(),
+            "top_rules": stats.top_rules(),
+            "rules": stats.rule_breakdown()
         }
+        if self.rule_profile is not None:
+            summary["rule_profile"] = self.rule_profile.summary()
+        if self.baselined_count is not None:
+            summary["baseline_known_findings"] = self.baselined_count
         
         return SecurityAuditResult(
             timestamp=datetime.now().isoformat(),
@@ -453,16 +1430,91 @@ class SecurityAuditAgent:
             passed=passed
         )
     
+    def issue_fingerprints(self, issues: Sequence[SecurityIssue]) -> List[str]:
+        """
+        📌 Baseline-Fingerprints in Issue-Reihenfolge
+        
+        Jede Datei mit Findings wird einmal gelesen (gestagte Dateien aus dem
+        Git-Index-Stand des Scans).
+        """
+        file_lines: Dict[str, Optional[List[str]]] = {}
+        occurrences: Dict[Tuple[str, str, str], int] = {}
+        fingerprints = []
+        for issue in issues:
+            if issue.file not in file_lines:
+                try:
+                    if issue.file in self.staged_contents:
+                        text = self.staged_contents[issue.file].decode('utf-8', errors='ignore')
+                    else:
+                        with open(issue.file, 'r', encoding='utf-8', errors='ignore') as f:
+                            text = f.read()
+                    file_lines[issue.file] = text.split('\n')
+                except OSError:
+                    file_lines[issue.file] = None
+            lines = file_lines[issue.file]
+            line_text = lines[issue.line - 1] if lines is not None and 0 < issue.line <= len(lines) else None
+            key = (issue.file, issue.rule_id or issue.cve_id or issue.type, line_text if line_text is not None else issue.message)
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+            fingerprints.append(issue_fingerprint(issue, line_text, occurrence))
+        return fingerprints
+    
+    def apply_baseline(self, fingerprints: Optional[List[str]] = None):
+        """
+        📌 Neu-Findings-Modus: bekannte Findings (Baseline) herausfiltern
+        
+        Verdict, Auto-Block und Report beziehen sich danach nur auf neue Findings.
+        fingerprints: bereits berechnete Fingerprints der aktuellen Issues.
+        """
+        baseline = FindingBaseline(self.config.baseline_path)
+        if not baseline.load():
+            self.logger.warning(f"⚠️ Keine Baseline unter {self.config.baseline_path} - alle Findings gelten als neu")
+        issues = list(self.results)
+        if fingerprints is None:
+            fingerprints = self.issue_fingerprints(issues)
+        self.results = IssueStore(issue for issue, fingerprint in zip(issues, fingerprints) if fingerprint not in baseline)
+        self.baselined_count = len(issues) - len(self.results)
+        self.logger.info(f"📌 {self.baselined_count} bekannte Findings aus der Baseline, {len(self.results)} neu")
+    
+    def record_history(self) -> List[str]:
+        """
+        📈 Lauf mit allen Findings in der Scan-Historie ablegen (liefert die Fingerprints)
+        """
+        from history import HistoryStore
+        
+        issues = list(self.results)
+        fingerprints = self.issue_fingerprints(issues)
+        try:
+            history = HistoryStore(self.config.history_path)
+            try:
+                run_id = history.append_run(issues, fingerprints)
+            finally:
+                history.close()
+            self.logger.info(f"📈 Lauf {run_id} in der Scan-Historie gespeichert: {self.config.history_path}")
+        except Exception as error:
+            self.logger.warning(f"⚠️ Scan-Historie nicht aktualisiert: {error}")
+        return fingerprints
+    
+    def write_baseline(self) -> int:
+        """
+        💾 Alle aktuellen Findings als Baseline speichern (Anzahl Einträge)
+        """
+        issues = list(self.results)
+        FindingBaseline(self.config.baseline_path).save(issues, self.issue_fingerprints(issues))
+        self.logger.info(f"📌 Baseline mit {len(issues)} Findings gespeichert: {self.config.baseline_path}")
+        return len(issues)
+    
     def generate_recommendations(self) -> List[str]:
         """
         💡 Generiere Empfehlungen
         """
         recommendations = []
         
-        critical_count = len([i for i in self.results if i.severity == "critical"])
-        high_count = len([i for i in self.results if i.severity == "high"])
-        secret_count = len([i for i in self.results if i.type == "secret"])
-        cve_count = len([i for i in self.results if i.type == "cve"])
+        stats = self.results.stats
+        critical_count = stats.by_severity["critical"]
+        high_count = stats.by_severity["high"]
+        secret_count = stats.by_type.get("secret", 0)
+        cve_count = stats.by_type.get("cve", 0)
         
         if critical_count > 0:
             recommendations.append("Kritische Security-Issues sofort beheben")
@@ -481,45 +1533,44 @@ class SecurityAuditAgent:
         
         return recommendations
     
+    def open_report_stream(self):
+        """
+        📝 Öffne NDJSON-Report - Issues werden ab jetzt laufend geschrieben
+        """
+        os.makedirs('reports', exist_ok=True)
+        report_path = f"{REPORT_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S')}.ndjson"
+        self.report_stream = open(report_path, 'w', encoding='utf-8')
+        self.streamed_count = 0
+        self.report_stream.write(json.dumps({"record": "header", "version": NDJSON_REPORT_VERSION, "started": datetime.now().isoformat()}) + "\n")
+    
+    def stream_issues(self):
+        """
+        📝 Schreibe alle noch nicht gestreamten Issues in den NDJSON-Report
+        """
+        if self.report_stream is None:
+            return
+        write = self.report_stream.write
+        for issue in islice(self.results, self.streamed_count, None):
+            write(json.dumps({"record": "issue", **issue_to_dict(issue)}) + "\n")
+        self.streamed_count = len(self.results)
+    
     def save_report(self, result: SecurityAuditResult):
         """
         💾 Speichere Security-Report
         """
         try:
+            if self.report_stream is not None:
+                self.finish_report_stream(result)
+                self.print_summary(result)
+                return
+            
             # Erstelle Reports-Verzeichnis
             os.makedirs('reports', exist_ok=True)
             
-            # Konvertiere zu Dict für JSON-Serialisierung
-            report_data = {
-                "timestamp": result.timestamp,
-                "total_issues": result.total_issues,
-                "critical_issues": result.critical_issues,
-                "high_issues": result.high_issues,
-                "medium_issues": result.medium_issues,
-                "low_issues": result.low_issues,
-                "passed": result.passed,
-                "summary": result.summary,
-                "issues": [
-                    {
-                        "file": i.file,
-                        "line": i.line,
-                        "column": i.column,
-                        "severity": i.severity,
-                        "type": i.type,
-                        "message": i.message,
-                        "cve_id": i.cve_id,
-                        "description": i.description,
-                        "recommendation": i.recommendation,
-                        "fixed_in": i.fixed_in
-                    }
-                    for i in result.issues
-                ]
-            }
-            
             # Speichere JSON-Report
-            report_path = f"reports/security-audit-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+            report_path = f"{REPORT_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
             with open(report_path, 'w') as f:
-                json.dump(report_data, f, indent=2)
+                json.dump(self.report_data(result), f, indent=2)
             
             self.logger.info(f"📊 Security-Report gespeichert: {report_path}")
             
@@ -529,6 +1580,42 @@ class SecurityAuditAgent:
         except Exception as error:
             self.logger.error(f"❌ Fehler beim Speichern des Reports: {error}")
     
+    def report_data(self, result: SecurityAuditResult) -> Dict[str, any]:
+        """
+        📋 Report als Dict für die JSON-Serialisierung
+        """
+        return {
+            "timestamp": result.timestamp,
+            "total_issues": result.total_issues,
+            "critical_issues": result.critical_issues,
+            "high_issues": result.high_issues,
+            "medium_issues": result.medium_issues,
+            "low_issues": result.low_issues,
+            "passed": result.passed,
+            "summary": result.summary,
+            "issues": [issue_to_dict(i) for i in result.issues]
+        }
+    
+    def finish_report_stream(self, result: SecurityAuditResult):
+        """
+        💾 Restliche Issues und abschließenden Summary-Record schreiben
+        """
+        self.stream_issues()
+        self.report_stream.write(json.dumps({
+            "record": "summary",
+            "timestamp": result.timestamp,
+            "total_issues": result.total_issues,
+            "critical_issues": result.critical_issues,
+            "high_issues": result.high_issues,
+            "medium_issues": result.medium_issues,
+            "low_issues": result.low_issues,
+            "passed": result.passed,
+            "summary": result.summary
+        }) + "\n")
+        self.report_stream.close()
+        self.logger.info(f"📊 Security-Report gespeichert: {self.report_stream.name}")
+        self.report_stream = None
+    
     def print_summary(self, result: SecurityAuditResult):
         """
         📊 Drucke Zusammenfassung
@@ -539,9 +1626,25 @@ class SecurityAuditAgent:
         print(f"📅 Timestamp: {result.timestamp}")
         print(f"📊 Status: {'✅ BESTANDEN' if result.passed else '❌ NICHT BESTANDEN'}")
         print(f"📈 Issues: {result.total_issues} (🔴 {result.critical_issues} kritisch, 🟠 {result.high_issues} hoch)")
-        print(f"📋 Zusammenfassung: {result.summary}")
+        overview = {key: value for key, value in result.summary.items() if key not in SUMMARY_DETAIL_KEYS}
+        print(f"📋 Zusammenfassung: {overview}")
         print("="*60)
         
+        if result.summary.get("top_files"):
+            print("\n🏆 TOP-DATEIEN:")
+            for entry in result.summary["top_files"]:
+                print(f"{entry['issues']:>6}  {entry['file']}")
+        
+        if result.summary.get("top_rules"):
+            print("\n🏆 TOP-REGELN:")
+            rules = result.summary.get("rules", {})
+            for entry in result.summary["top_rules"]:
+                info = rules.get(entry["rule"], {})
+                print(f"{entry['issues']:>6}  {entry['rule']} ({info.get('severity', '?')}, {info.get('files', '?')} Dateien)")
+        
+        if result.summary.get("rule_profile"):
+            self.print_rule_profile(result.summary["rule_profile"])
+        
         if result.issues:
             print("\n🚨 GEFUNDENE ISSUES:")
             for issue in result.issues[:10]:  # Zeige nur die ersten 10
@@ -557,20 +1660,305 @@ class SecurityAuditAgent:
                 print(f"• {rec}")
         
         print("="*60)
+    
+    def print_rule_profile(self, profile: Dict[str, Dict[str, any]]):
+        """
+        ⏱️ Drucke Regel-Profil als Tabelle (teuerste Regel zuerst)
+        """
+        print("\n⏱️ REGEL-PROFIL:")
+        print(f"{'Regel':<10} {'Auswert.':>10} {'Treffer':>8} {'Zeit ms':>9} {'µs/Ausw.':>9} {'max ms':>8}  Langsamste Zeile")
+        for rule_id, entry in profile.items():
+            print(f"{rule_id:<10} {entry['evaluations']:>10} {entry['matches']:>8} {entry['time_ms']:>9.1f} "
+                  f"{entry['avg_us']:>9.2f} {entry['worst_line_ms']:>8.2f}  {entry['worst_location'] or '-'}")
+
+# 📄 NDJSON-Report lesen
+NDJSON_REPORT_VERSION = 1
+
+class NdjsonIssueList(Sequence):
+    """
+    📄 Lazy Issue-Liste über einem NDJSON-Report
+    
+    Iteration streamt die Datei; Index-Zugriffe bauen einmalig einen
+    Offset-Index der Issue-Zeilen auf.
+    """
+    
+    def __init__(self, path: str, count: int):
+        self.path = path
+        self.count = count
+        self._offsets: Optional[List[int]] = None
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __iter__(self) -> Iterator[SecurityIssue]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("record") == "issue":
+                    yield issue_from_dict(record)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.count)
+            if step == 1 and self._offsets is None:
+                return list(islice(iter(self), start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Issue-Index außerhalb des Reports")
+        with open(self.path, 'rb') as f:
+            f.seek(self.issue_offsets()[index])
+            return issue_from_dict(json.loads(f.readline()))
+    
+    def issue_offsets(self) -> List[int]:
+        """
+        📍 Byte-Offsets aller Issue-Zeilen
+        """
+        if self._offsets is None:
+            offsets = []
+            with open(self.path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if line.startswith(b'{"record": "issue"'):
+                        offsets.append(offset)
+                    offset += len(line)
+            self._offsets = offsets
+        return self._offsets
+
+def read_last_line(path: str, block_size: int = 65536) -> bytes:
+    """
+    📄 Letzte nicht-leere Zeile einer Datei (von hinten gelesen)
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+            stripped = data.rstrip(b'\n')
+            if b'\n' in stripped:
+                return stripped.rsplit(b'\n', 1)[1]
+        return data.rstrip(b'\n')
+
+def load_ndjson_report(path: str) -> SecurityAuditResult:
+    """
+    📄 Lade einen NDJSON-Report als SecurityAuditResult mit lazy Issue-Liste
+    """
+    summary = json.loads(read_last_line(path) or b'{}')
+    if summary.get("record") != "summary":
+        raise ValueError(f"Kein Summary-Record in {path} - Report unvollständig")
+    
+    return SecurityAuditResult(
+        timestamp=summary["timestamp"],
+        total_issues=summary["total_issues"],
+        critical_issues=summary["critical_issues"],
+        high_issues=summary["high_issues"],
+        medium_issues=summary["medium_issues"],
+        low_issues=summary["low_issues"],
+        issues=NdjsonIssueList(path, summary["total_issues"]),
+        summary=summary["summary"],
+        passed=summary["passed"]
+    )
+
+# ⚡ Worker für parallelen Datei-Scan
+_scan_worker: Optional[SecurityAuditAgent] = None
+
+def _parse_manifest(path: str) -> Tuple[str, Optional[List[Tuple[str, Optional[str], int]]], Optional[str]]:
+    """
+    📦 Manifest im Worker parsen: (Pfad, Packages, Fehler)
+    """
+    try:
+        return path, parse_manifest(path), None
+    except Exception as error:
+        return path, None, str(error)
+
+def _init_scan_worker(config: SecurityConfig):
+    """
+    ⚡ Initialisiere Worker-Prozess (einmal pro Prozess)
+    """
+    global _scan_worker
+    _scan_worker = SecurityAuditAgent(config)
+
+def _scan_batch(batch: List[Tuple[str, bool]]) -> Tuple[List[Tuple[str, Optional[List[tuple]]]], Optional[Dict[str, list]]]:
+    """
+    ⚡ Scanne einen Batch und liefere kompakte Issue-Records pro Datei
+    (None für Dateien, die der Hauptprozess aus dem Cache bedient)
+    sowie die Regel-Profil-Zähler des Batches (None ohne Profiling)
+    """
+    scanned = iter(_scan_worker.collect_batch_issues([file_path for file_path, needs_scan in batch if needs_scan]))
+    results = [
+        (file_path, [astuple(issue) for issue in next(scanned)] if needs_scan else None)
+        for file_path, needs_scan in batch
+    ]
+    profile = _scan_worker.rule_profile.take() if _scan_worker.rule_profile is not None else None
+    return results, profile
+
+def parse_args(argv: Optional[List[str]] = None):
+    """
+    ⚙️ Kommandozeilen-Argumente
+    """
+    import argparse
+    from history import HISTORY_DEFAULT_DAYS, HISTORY_QUERIES
+    from scan_server import SCAN_SOCKET_PATH
+    
+    parser = argparse.ArgumentParser(description="🛡️ Security-Audit-Agent")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Anzahl Worker-Prozesse für den Datei-Scan (0 = alle CPU-Kerne)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Scan-Cache deaktivieren und alle Dateien neu scannen")
+    parser.add_argument("--staged", action="store_true",
+                        help="Nur gestagte Dateien scannen (Inhalt aus dem Git-Index)")
+    parser.add_argument("--staged-lines", action="store_true",
+                        help="Nur hinzugefügte Zeilen gestagter Dateien scannen")
+    parser.add_argument("--report-format", choices=["json", "ndjson"], default="json",
+                        help="Report-Format (ndjson schreibt Issues laufend während des Scans)")
+    parser.add_argument("--advisories", action="append", metavar="PATH",
+                        help="OSV-/NVD-JSON-Dump (Datei, Verzeichnis, .zip, .json.gz); mehrfach möglich")
+    parser.add_argument("--vuln-db", metavar="PATH",
+                        help="Pfad der lokalen Vulnerability-Datenbank (SQLite)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Regel-Profiling: Auswertungen, Treffer und Zeit pro Regel im Report und als Tabelle")
+    parser.add_argument("--watch", action="store_true",
+                        help="Watch-Modus: geänderte Dateien laufend neu scannen und Live-Report aktualisieren")
+    parser.add_argument("--watch-interval", type=float, metavar="SECONDS",
+                        help="Polling-Intervall im Watch-Modus (ohne inotify)")
+    parser.add_argument("--time-budget", type=float, metavar="SECONDS",
+                        help="Zeitbudget pro Datei, danach wird der Scan der Datei abgebrochen (0 = kein Limit)")
+    parser.add_argument("--config", metavar="PATH",
+                        help="Agent-Konfiguration (Standard: agents/agent-config.json, falls vorhanden)")
+    parser.add_argument("--rules", action="append", metavar="PATH",
+                        help="Zusätzliches Regel-Pack (JSON-Datei oder Verzeichnis); mehrfach möglich")
+    parser.add_argument("--new-only", action="store_true",
+                        help="Nur Findings außerhalb der Baseline berichten; Verdict und Blockierung nur über neue Findings")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="Baseline-Datei (Standard: .security-audit-baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Scannen und alle aktuellen Findings als Baseline speichern (kein Verdict, kein Lauf in der Scan-Historie)")
+    parser.add_argument("--history", choices=HISTORY_QUERIES, metavar="QUERY",
+                        help=f"Scan-Historie abfragen und als JSON ausgeben ({', '.join(HISTORY_QUERIES)}); kein Audit")
+    parser.add_argument("--history-db", metavar="PATH",
+                        help="Pfad der Scan-Historie (SQLite, Standard: .security-audit-cache/history.sqlite)")
+    parser.add_argument("--since", metavar="DATE",
+                        help=f"Historie ab diesem Datum (ISO, Standard: letzte {HISTORY_DEFAULT_DAYS} Tage)")
+    parser.add_argument("--rule", metavar="RULE_ID",
+                        help="Historie (findings): nur Findings dieser Regel")
+    parser.add_argument("--file", metavar="PATH",
+                        help="Historie (findings): nur Findings dieser Datei")
+    parser.add_argument("--fingerprint", metavar="FINGERPRINT",
+                        help="Historie (findings): ein einzelnes Finding")
+    parser.add_argument("--lint-rules", action="store_true",
+                        help="Regeln auf Backtracking-Risiken prüfen und beenden (Exit-Code 1 bei Befunden)")
+    parser.add_argument("--advisory-url", metavar="URL",
+                        help="OSV-kompatible Advisory-API zusätzlich zur lokalen Datenbank abfragen")
+    parser.add_argument("--serve", nargs="?", const=SCAN_SOCKET_PATH, metavar="SOCKET",
+                        help=f"Scan-Server für Commit-Hooks auf einem Unix-Socket starten (Standard: {SCAN_SOCKET_PATH})")
+    parser.add_argument("--serve-advisories", metavar="[HOST:]PORT",
+                        help="Lokale Datenbank als OSV-kompatible API bereitstellen (kein Audit)")
+    return parser.parse_args(argv)
 
 # 📦 Haupt-Ausführung
 if __name__ == "__main__":
     try:
-        # Lade Konfiguration aus Umgebungsvariablen
-        config = SecurityConfig()
+        args = parse_args()
+        
+        # Lade Konfiguration (agent-config.json) und Kommandozeilen-Optionen
+        config = load_security_config(args.config)
+        config.jobs = args.jobs
+        config.report_format = args.report_format
+        config.profile_rules = args.profile
+        if args.rules:
+            config.rule_packs += args.rules
+        if args.no_cache:
+            config.cache_path = None
+        if args.staged_lines:
+            config.scan_scope = "staged-lines"
+        elif args.staged:
+            config.scan_scope = "staged"
+        if args.advisories:
+            config.vulnerability_feeds = args.advisories
+        if args.vuln_db:
+            config.vulnerability_db_path = args.vuln_db
+        if args.advisory_url:
+            config.advisory_url = args.advisory_url
+        if args.time_budget is not None:
+            config.file_time_budget = args.time_budget
+        if args.baseline:
+            config.baseline_path = args.baseline
+        if args.new_only:
+            config.new_findings_only = True
+        if args.update_baseline:
+            # Baseline umfasst alle Findings - ohne Filter und ohne Blockierung; die
+            # Baseline-Pflege ist kein eigener Lauf (sonst doppelte Läufe in der Historie)
+            config.new_findings_only = False
+            config.auto_block = False
+            config.record_history = False
+        if args.history_db:
+            config.history_path = args.history_db
+        
+        if args.history:
+            from history import query_history
+            
+            print(json.dumps(query_history(config.history_path, args), indent=2))
+            sys.exit(0)
         
-        # Erstelle und starte Security-Audit-Agent
+        if args.lint_rules:
+            lint = lint_rules(SecurityAuditAgent(config).get_rules())
+            for rule_id, findings in lint.items():
+                for finding in findings:
+                    print(f"🧯 {rule_id}: {finding}")
+            print(f"{'⚠️' if lint else '✅'} {len(lint)} Regeln mit Backtracking-Risiko")
+            sys.exit(1 if lint else 0)
+        
+        if args.serve_advisories:
+            from advisory import AdvisoryStandInServer
+            from vulndb import VulnerabilityDatabase
+            
+            host, _, port = args.serve_advisories.rpartition(':')
+            database = VulnerabilityDatabase(config.vulnerability_db_path)
+            database.sync(config.vulnerability_feeds)
+            server = AdvisoryStandInServer(database, host or "127.0.0.1", int(port))
+            print(f"🌐 Advisory-Server läuft auf {server.url} ({database.advisory_count()} Advisories)")
+            server.httpd.serve_forever()
+        
+        if args.watch_interval is not None:
+            config.watch_interval = args.watch_interval
+        
+        # Erstelle und starte Security-Audit-Agent (Regel-Packs vor dem Scan validieren)
         agent = SecurityAuditAgent(config)
+        agent.get_rules()
+        if args.serve:
+            from scan_server import ScanServer
+            
+            for engine in set(agent.get_engines().values()):
+                engine.locator  # Regeln und Bytes-Locator vorab kompilieren
+            server = ScanServer(agent, args.serve)
+            print(f"🔌 Scan-Server läuft auf {server.path} ({len(agent.get_rules())} Regeln)")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.stop()
+            sys.exit(0)
+        if args.watch:
+            agent.watch()
+            sys.exit(0)
         result = agent.run()
+        if args.update_baseline:
+            agent.write_baseline()
+            sys.exit(0)
         
         # Exit-Code basierend auf Ergebnis
         sys.exit(0 if result.passed else 1)
         
+    except RuleConfigError as error:
+        print(f"❌ Ungültige Regel-Konfiguration: {error}")
+        sys.exit(2)
     except Exception as error:
         print(f"❌ Security-Audit-Agent fehlgeschlagen: {error}")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1) 
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+💾 Scan-Cache des Security-Audit-Agenten
+
+Findings pro Datei-Inhalt (SHA-256) und Regelsatz; bei einem geänderten
+Regelsatz, geänderten Scan-Einstellungen oder einer neuen Scan-Logik
+(SCAN_CACHE_VERSION) wird verworfen.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import json
+from dataclasses import astuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import SCAN_BUDGET_RULE_ID, SecurityIssue, SecurityRule
+
+# Version der Scan-Logik - erhöhen, wenn sich Treffer bei gleichen Regeln ändern
+SCAN_CACHE_VERSION = 5
+
+def rule_fingerprint(rules: Tuple[SecurityRule, ...], settings: Optional[Dict[str, Any]] = None) -> str:
+    """
+    🔑 Fingerprint eines Regelsatzes (für Cache-Invalidierung)
+    
+    settings enthält die Scan-Einstellungen, die Findings bei gleichem
+    Regelsatz ändern (z.B. max_line_length, file_time_budget).
+    """
+    import hashlib
+    
+    payload = json.dumps([SCAN_CACHE_VERSION, settings or {}] + [astuple(rule) for rule in rules], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ScanCache:
+    """
+    💾 Persistenter Scan-Cache
+    
+    Findings werden pro Datei-Inhalt (SHA-256) und Regelsatz-Fingerprint
+    gespeichert. Über (mtime, Größe) wird der Hash unveränderter Dateien
+    wiederverwendet, ohne sie erneut zu lesen.
+    """
+    
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.files: Dict[str, Dict] = {}   # Pfad -> {mtime_ns, size, sha256}
+        self.results: Dict[str, List] = {}  # sha256 -> Issue-Records ohne Dateipfad
+        self.dirty = False
+    
+    def load(self):
+        """
+        📂 Lade Cache von Disk (bei anderem Regelsatz wird verworfen)
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if data.get("fingerprint") != self.fingerprint:
+            self.dirty = True
+            return
+        
+        self.files = data.get("files", {})
+        self.results = data.get("results", {})
+    
+    def file_hash(self, file_path: str) -> Optional[str]:
+        """
+        🔑 Content-Hash einer Datei (aus Cache, falls mtime und Größe passen)
+        """
+        import hashlib
+        
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        
+        entry = self.files.get(file_path)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["sha256"]
+        
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except OSError:
+            return None
+        
+        self.files[file_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest.hexdigest()}
+        self.dirty = True
+        return digest.hexdigest()
+    
+    def lookup(self, file_path: str) -> Optional[List[SecurityIssue]]:
+        """
+        🔍 Gecachte Findings einer Datei oder None
+        """
+        content_hash = self.file_hash(file_path)
+        if content_hash is None or content_hash not in self.results:
+            return None
+        return [SecurityIssue(file_path, *record) for record in self.results[content_hash]]
+    
+    def store(self, file_path: str, issues: List[SecurityIssue]):
+        """
+        💾 Findings einer gescannten Datei ablegen
+        
+        Per Zeitbudget abgebrochene Scans (SCAN-001) sind unvollständig und
+        werden nicht gecacht - die Datei wird beim nächsten Lauf neu gescannt.
+        """
+        entry = self.files.get(file_path)
+        if entry is None or any(issue.rule_id == SCAN_BUDGET_RULE_ID for issue in issues):
+            return
+        self.results[entry["sha256"]] = [astuple(issue)[1:] for issue in issues]
+        self.dirty = True
+    
+    def evict_stale(self):
+        """
+        🧹 Entferne gelöschte Dateien und nicht mehr referenzierte Inhalte
+        """
+        self.files = {path: entry for path, entry in self.files.items() if os.path.exists(path)}
+        live_hashes = {entry["sha256"] for entry in self.files.values()}
+        stale = [content_hash for content_hash in self.results if content_hash not in live_hashes]
+        for content_hash in stale:
+            del self.results[content_hash]
+        if stale:
+            self.dirty = True
+    
+    def save(self):
+        """
+        💾 Speichere Cache atomar
+        """
+        self.evict_stale()
+        if not self.dirty:
+            return
+        
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": self.fingerprint, "files": self.files, "results": self.results}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
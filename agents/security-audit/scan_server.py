@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+🔌 Scan-Server für Commit-Hooks
+
+Hält Regeln und Engines eines SecurityAuditAgent geladen und beantwortet
+Scan-Anfragen von client.py über einen Unix-Domain-Socket.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import json
+import errno
+import threading
+import time
+from typing import Dict
+
+# 🔌 Scan-Server für Commit-Hooks (Unix-Domain-Socket, siehe client.py)
+SCAN_SOCKET_PATH = ".security-audit-cache/scan.sock"
+SCAN_REQUEST_LIMIT = 1 << 20  # maximale Länge einer Anfrage-Zeile in Bytes
+
+class ScanServer:
+    """
+    🔌 Lokaler Scan-Server auf einem Unix-Domain-Socket
+    
+    Hält einen Agenten mit kompilierten Regeln warm, damit Commit-Hooks
+    (agents/security-audit/client.py) weder Interpreter-Start noch Imports
+    noch Regel-Kompilierung bezahlen. Protokoll: pro Verbindung eine
+    JSON-Zeile als Anfrage und eine als Antwort (siehe
+    SecurityAuditAgent.handle_scan_request). Anfragen laufen nacheinander,
+    da der Agent nicht threadsicher ist.
+    """
+    
+    def __init__(self, agent: "SecurityAuditAgent", path: str = SCAN_SOCKET_PATH):
+        import socketserver
+        
+        server = self
+        self.agent = agent
+        self.path = path
+        self.requests_handled = 0
+        
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(SCAN_REQUEST_LIMIT)
+                if not line.strip():
+                    return  # Verbindungstest (z.B. remove_stale_socket eines zweiten Servers)
+                try:
+                    response = server.handle(json.loads(line))
+                except Exception as error:
+                    response = {"error": str(error)}
+                try:
+                    self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+                except OSError:
+                    pass  # Client hat aufgegeben (Timeout)
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.remove_stale_socket()
+        self.unix_server = socketserver.UnixStreamServer(path, Handler)
+        os.chmod(path, 0o600)
+        self.thread = None
+    
+    def remove_stale_socket(self):
+        """
+        🧹 Verwaisten Socket eines beendeten Servers entfernen (OSError wenn noch einer läuft)
+        """
+        import socket
+        
+        if not os.path.exists(self.path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.unlink(self.path)
+                return
+        raise OSError(errno.EADDRINUSE, f"Scan-Server läuft bereits auf {self.path}")
+    
+    def handle(self, request: Dict[str, any]) -> Dict[str, any]:
+        """🔌 Anfrage beantworten (nur für das Repository, in dem der Server läuft)"""
+        if request.get("op") == "ping":
+            return {"ok": True, "requests_handled": self.requests_handled}
+        if request.get("cwd") and os.path.realpath(request["cwd"]) != os.getcwd():
+            raise ValueError(f"Server läuft für {os.getcwd()}, nicht für {request['cwd']}")
+        
+        start = time.perf_counter()
+        response = self.agent.handle_scan_request(request)
+        self.requests_handled += 1
+        self.agent.logger.info(f"🔌 {response['files_scanned']} Dateien in {(time.perf_counter() - start) * 1000:.0f} ms "
+                               f"- {response['total_issues']} Issues, {'blockiert' if response['blocked'] else 'ok'}")
+        return response
+    
+    def serve_forever(self):
+        self.unix_server.serve_forever()
+    
+    def start(self) -> "ScanServer":
+        """▶️ Im Hintergrund-Thread starten"""
+        self.thread = threading.Thread(target=self.unix_server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        if self.thread is not None:
+            self.unix_server.shutdown()
+        self.unix_server.server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
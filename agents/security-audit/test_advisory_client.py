@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests: AdvisoryClient gegen den lokalen AdvisoryStandInServer
+
+Prüft Ergebnisse und Fix-Versionen, Wiederholung bei 429/5xx, Abbruch bei
+4xx, Cache und Token-Bucket-Ratenbegrenzung - ohne Netzwerkzugriff.
+
+Verwendung:
+    python -m pytest agents/security-audit
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import json
+import time
+
+import pytest
+
+from advisory import AdvisoryCache, AdvisoryClient, AdvisoryLookupError, AdvisoryStandInServer
+from models import SecurityConfig
+from run import SecurityAuditAgent
+from vulndb import VulnerabilityDatabase
+
+# OSV-Feed: lodash hat zwei Advisories, minimist eines, express keines
+ADVISORIES = [
+    {"id": "GHSA-0001", "aliases": ["CVE-2021-0001"], "summary": "Prototype Pollution",
+     "database_specific": {"severity": "HIGH"},
+     "affected": [{"package": {"ecosystem": "npm", "name": "lodash"},
+                   "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}, {"fixed": "4.17.21"}]}]}]},
+    {"id": "GHSA-0002", "summary": "Command Injection",
+     "database_specific": {"severity": "CRITICAL"},
+     "affected": [{"package": {"ecosystem": "npm", "name": "lodash"},
+                   "ranges": [{"type": "SEMVER", "events": [{"introduced": "4.0.0"}, {"fixed": "4.17.12"}]}]}]},
+    {"id": "GHSA-0003", "summary": "Prototype Pollution",
+     "database_specific": {"severity": "MODERATE"},
+     "affected": [{"package": {"ecosystem": "npm", "name": "minimist"},
+                   "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}, {"fixed": "1.2.6"}]}]}]},
+]
+
+@pytest.fixture
+def server(tmp_path):
+    feed = tmp_path / "osv.json"
+    feed.write_text(json.dumps(ADVISORIES), encoding="utf-8")
+    database = VulnerabilityDatabase(":memory:")
+    database.sync([str(feed)])
+    with AdvisoryStandInServer(database) as stand_in:
+        yield stand_in
+    database.close()
+
+def make_client(server, **options) -> AdvisoryClient:
+    options.setdefault("rate_limit", 0)
+    options.setdefault("timeout", 5.0)
+    return AdvisoryClient(server.url, **options)
+
+def test_lookup_matches_database(server):
+    """🔍 Ergebnisse und Fix-Versionen wie die lokale Datenbank, nur betroffene Packages"""
+    packages = [("lodash", "4.17.11"), ("lodash", "4.17.20"), ("minimist", "1.2.5"), ("express", "4.18.2")]
+    client = make_client(server)
+    try:
+        results = client.lookup("npm", packages)
+    finally:
+        client.close()
+    
+    assert set(results) == {("lodash", "4.17.11"), ("lodash", "4.17.20"), ("minimist", "1.2.5")}
+    expected = server.database.lookup("npm", packages)
+    for package, matches in results.items():
+        assert [(m.advisory_id, m.severity, m.fixed_in) for m in matches] == \
+               [(m.advisory_id, m.severity, m.fixed_in) for m in expected[package]]
+    assert [m.advisory_id for m in results[("lodash", "4.17.11")]] == ["GHSA-0001", "GHSA-0002"]
+    assert results[("lodash", "4.17.11")][0].cve_id == "CVE-2021-0001"
+    assert client.requests_sent == len(packages)
+
+def test_unpinned_package_matches_no_advisory(server):
+    """📌 Packages ohne auflösbare Version treffen kein Advisory, sondern liefern ein DEP-001-Finding"""
+    agent = SecurityAuditAgent(SecurityConfig(cache_path=None, history_path=None))
+    agent.vulnerability_db = server.database
+    
+    agent.check_packages("package.json", "npm", [("lodash", None, 3), ("lodash", "4.17.20", 4)])
+    
+    assert server.database.lookup("npm", [("lodash", None)]) == {}
+    assert [(issue.line, issue.rule_id or issue.cve_id, issue.severity) for issue in agent.results] == \
+           [(3, "DEP-001", "low"), (4, "CVE-2021-0001", "high")]
+
+@pytest.mark.parametrize("faults", [[429], [503, 502], [429, 500, 503]])
+def test_retries_rate_limit_and_server_errors(server, faults):
+    """🔁 429/5xx werden wiederholt, bis die Antwort kommt"""
+    server.faults = list(faults)
+    client = make_client(server, retries=3)
+    try:
+        results = client.lookup("npm", [("minimist", "1.2.5")])
+    finally:
+        client.close()
+    
+    assert [m.advisory_id for m in results[("minimist", "1.2.5")]] == ["GHSA-0003"]
+    assert client.requests_sent == len(faults) + 1
+    assert server.faults == []
+
+def test_gives_up_after_retries(server):
+    """🛑 Nach retries + 1 Versuchen wird aufgegeben (Teilergebnis bleibt erhalten)"""
+    server.faults = [503, 503, 503]
+    client = make_client(server, retries=2, workers=1)
+    try:
+        with pytest.raises(AdvisoryLookupError) as error:
+            client.lookup("npm", [("lodash", "4.17.11")])
+    finally:
+        client.close()
+    assert client.requests_sent == 3
+    assert error.value.results == {}
+
+def test_client_errors_are_not_retried(server):
+    """🚫 Andere 4xx-Antworten werden nicht wiederholt"""
+    server.faults = [400]
+    client = make_client(server, retries=3)
+    try:
+        with pytest.raises(AdvisoryLookupError):
+            client.lookup("npm", [("lodash", "4.17.11")])
+    finally:
+        client.close()
+    assert client.requests_sent == 1
+
+def test_cache_answers_repeated_lookups(server, tmp_path):
+    """💾 Zweite Abfrage kommt aus dem Cache, ohne Anfrage an den Server"""
+    cache = AdvisoryCache(str(tmp_path / "cve-cache.json"), ttl=3600)
+    client = make_client(server, cache=cache)
+    try:
+        first = client.lookup("npm", [("lodash", "4.17.11"), ("express", "4.18.2")])
+        sent = client.requests_sent
+        second = client.lookup("npm", [("lodash", "4.17.11"), ("express", "4.18.2")])
+    finally:
+        client.close()
+    assert sent == 2
+    assert client.requests_sent == sent
+    assert first == second
+
+def test_rate_limit_caps_request_rate(server):
+    """⏱️ Token-Bucket: nach dem Anfangs-Burst höchstens rate_limit Anfragen pro Sekunde"""
+    rate = 20.0
+    count = 40
+    client = make_client(server, rate_limit=rate, workers=8)
+    try:
+        start = time.monotonic()
+        results = client.lookup("npm", [("express", f"4.{index}.0") for index in range(count)])
+        elapsed = time.monotonic() - start
+    finally:
+        client.close()
+    
+    assert results == {}
+    assert server.requests_handled == count
+    # Burst = rate Anfragen, die übrigen count - rate brauchen (count - rate) / rate Sekunden
+    assert elapsed >= (count - rate) / rate * 0.9
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests: Validierung des Blocks agents.security-audit.config
+
+Verwendung:
+    python -m pytest agents/security-audit
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import json
+
+import pytest
+
+from rule_config import AGENT_CONFIG_PATH, RuleConfigError, load_security_config
+
+def write_config(tmp_path, block) -> str:
+    path = tmp_path / "agent-config.json"
+    path.write_text(json.dumps({"agents": {"security-audit": {"config": block}}}), encoding="utf-8")
+    return str(path)
+
+def test_repository_config_is_valid():
+    """✅ Die mitgelieferte agent-config.json lädt ohne Fehler"""
+    config = load_security_config(AGENT_CONFIG_PATH)
+    assert config.auto_block is True
+    assert config.rule_packs
+
+def test_valid_values_are_applied(tmp_path):
+    """⚙️ Gültige Werte landen in der SecurityConfig, historyPath null schaltet die Historie ab"""
+    config = load_security_config(write_config(tmp_path, {
+        "autoBlock": False, "baselinePath": "baseline.json", "newFindingsOnly": True, "historyPath": None,
+    }))
+    assert (config.auto_block, config.baseline_path, config.new_findings_only, config.history_path) == \
+           (False, "baseline.json", True, None)
+
+@pytest.mark.parametrize("block, message", [
+    ({"autoBlock": "yes"}, "autoBlock muss vom Typ bool sein"),
+    ({"autoBlock": 1}, "autoBlock muss vom Typ bool sein"),
+    ({"newFindingsOnly": None}, "newFindingsOnly muss vom Typ bool sein"),
+    ({"baselinePath": ""}, "baselinePath darf nicht leer sein"),
+    ({"historyPath": 5}, "historyPath muss vom Typ str oder null sein"),
+    ({"rulePacks": "rules"}, "rulePacks muss eine Liste sein"),
+    ({"rulePacks": [""]}, "rulePacks darf nur nicht-leere Pfade enthalten"),
+    ({"secretPatterns": [3]}, "secretPatterns darf nur nicht-leere Texte enthalten"),
+    ({"vulnerabilityThreshold": "high"}, "unbekannte Felder vulnerabilityThreshold"),
+    ([], "'config' muss ein Objekt sein"),
+])
+def test_invalid_values_are_rejected(tmp_path, block, message):
+    """❌ Falsche Typen, leere Texte und unbekannte Schlüssel werden mit klarer Meldung abgelehnt"""
+    with pytest.raises(RuleConfigError, match=message):
+        load_security_config(write_config(tmp_path, block))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests: Baseline bekannter Findings (--update-baseline, --new-only)
+
+Die Baseline und die übrigen Ausgaben des Agenten dürfen im nächsten Lauf
+nicht mitgescannt werden und enthalten keine Meldungen mit Secret-Treffern.
+
+Verwendung:
+    python -m pytest agents/security-audit
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from baseline import BASELINE_VERSION
+from models import SecurityConfig
+from run import SecurityAuditAgent
+
+SECRET = 'password = "hunter2x"'
+RUN_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run.py")
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text(f"{SECRET}\ncursor.execute('SELECT ' + name + '')\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def make_agent(**options) -> SecurityAuditAgent:
+    options.setdefault("history_path", None)
+    options.setdefault("auto_block", False)
+    agent = SecurityAuditAgent(SecurityConfig(**options))
+    agent.logger.setLevel("CRITICAL")
+    return agent
+
+def update_baseline() -> SecurityAuditAgent:
+    agent = make_agent()
+    agent.run()
+    agent.write_baseline()
+    return agent
+
+def test_new_only_after_update_baseline_reports_nothing(project):
+    """📌 --new-only direkt nach --update-baseline: keine neuen Findings, Baseline und Reports ungescannt"""
+    known = len(update_baseline().results)
+    
+    agent = make_agent(new_findings_only=True)
+    result = agent.run()
+    
+    assert known > 0
+    assert result.total_issues == 0
+    assert agent.files_scanned == 1
+    assert agent.baselined_count == known
+
+def test_baseline_stores_no_messages(project):
+    """🔒 Baseline-Einträge: nur Fingerprint, Regel, Datei und Zeile - keine Secret-Treffer"""
+    update_baseline()
+    
+    content = (project / ".security-audit-baseline.json").read_text(encoding="utf-8")
+    data = json.loads(content)
+    assert data["version"] == BASELINE_VERSION
+    assert {tuple(sorted(entry)) for entry in data["findings"]} == {("file", "fingerprint", "line", "rule_id")}
+    assert "hunter2" not in content
+
+def test_own_outputs_are_never_walked(project):
+    """🙈 Baseline, Reports, Live-Report und Cache-Verzeichnis fallen aus dem Walk"""
+    for path in (".security-audit-baseline.json", "reports/security-audit-1.json", "reports/security-audit-live.json",
+                 "cache/scan-cache.json", "cache/notes.json", "reports/other.json"):
+        (project / path).parent.mkdir(exist_ok=True)
+        (project / path).write_text("{}", encoding="utf-8")
+    agent = make_agent(cache_path="cache/scan-cache.json")
+    
+    assert sorted(agent.find_files_to_scan()) == ["./reports/other.json", "./src/app.py"]
+    assert agent.is_own_output("cache/notes.json")
+    assert not agent.is_own_output("src/app.py")
+
+def run_cli(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, RUN_PY, *args], capture_output=True, text=True)
+
+def test_update_baseline_is_not_recorded_in_history(project):
+    """📈 Baseline-Pflege legt keinen Lauf in der Scan-Historie an, der folgende Scan genau einen"""
+    assert run_cli("--update-baseline").returncode == 0
+    assert run_cli("--new-only").returncode == 0
+    
+    runs = json.loads(run_cli("--history", "runs").stdout)
+    assert len(runs) == 1
+    assert runs[0]["total"] == 2
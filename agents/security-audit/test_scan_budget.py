@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests: Zeitbudget pro Datei (file_time_budget) bei pathologischen Eingaben
+
+Regex-Beinahe-Treffer mit Backtracking-Risiko, eine einzelne mehrere MB
+lange Zeile und ein langer Vorfilter-Durchlauf müssen kurz nach Ablauf
+des Budgets mit einem SCAN-001-Finding abbrechen.
+
+Verwendung:
+    python -m pytest agents/security-audit
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import time
+
+import pytest
+
+from models import SecurityConfig
+from rule_config import build_vulnerability_rules
+from rule_engine import RISKY_LINE_LENGTH, get_rule_engine
+from run import SecurityAuditAgent
+
+BUDGET = 0.3
+SLACK = 0.5  # Maximale Überschreitung des Budgets (ein Fenster bzw. eine Zeile)
+
+# Beinahe-Treffer für VUL-001 (execute(' ... + ohne schließendes Anführungszeichen)
+NEAR_MISS = "execute('" * 300 + "+" * 3000
+
+def make_agent(budget: float = BUDGET, cache_path=None) -> SecurityAuditAgent:
+    agent = SecurityAuditAgent(SecurityConfig(cache_path=cache_path, history_path=None, file_time_budget=budget))
+    agent.logger.setLevel("CRITICAL")
+    return agent
+
+def scan_with_budget(path, budget: float = BUDGET):
+    agent = make_agent(budget)
+    start = time.perf_counter()
+    agent.scan_file(str(path))
+    return list(agent.results), time.perf_counter() - start
+
+@pytest.mark.parametrize("name, content", [
+    ("near_miss_lines.py", (NEAR_MISS + "\n") * 50),
+    ("near_miss_single_line.py", NEAR_MISS * 300 + "\n"),
+    ("inner_html.js", "x.innerHTML = " + "a" * 4_000_000 + "\n"),
+], ids=["near-miss-lines", "near-miss-single-line", "inner-html-single-line"])
+def test_budget_stops_pathological_files(tmp_path, name, content):
+    """⏱️ Abbruch kurz nach Budget-Ende mit SCAN-001 statt minutenlangem Scan"""
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    
+    issues, elapsed = scan_with_budget(path)
+    
+    assert elapsed < BUDGET + SLACK
+    assert [issue.rule_id for issue in issues if issue.type == "scan"] == ["SCAN-001"]
+
+def test_risky_rules_still_match_in_windows():
+    """✂️ Regeln mit Backtracking-Risiko finden Treffer auch in langen Zeilen (fensterweise)"""
+    engine = get_rule_engine(build_vulnerability_rules())
+    padding = "x = 1; " * (RISKY_LINE_LENGTH // 2)
+    line = padding + "cursor.execute('SELECT * FROM t WHERE id = ' + user_id + '')" + padding
+    
+    hits = engine.match_line(line, deadline=time.perf_counter() + 10)
+    
+    assert "VUL-001" in {engine.rules[index].rule_id for index, _ in hits}
+
+def test_no_budget_scans_completely(tmp_path):
+    """♾️ Ohne Budget (0) wird nicht abgebrochen"""
+    path = tmp_path / "small.py"
+    path.write_text("cursor.execute('SELECT ' + name + '')\n" * 20, encoding="utf-8")
+    
+    issues, _ = scan_with_budget(path, budget=0)
+    
+    assert not [issue for issue in issues if issue.type == "scan"]
+    assert len([issue for issue in issues if issue.rule_id == "VUL-001"]) == 20
+
+def test_truncated_scan_is_not_cached(tmp_path):
+    """💾 Abgebrochene Scans landen nicht im Scan-Cache - der nächste Lauf scannt die Datei vollständig"""
+    path = tmp_path / "slow.py"
+    path.write_text((NEAR_MISS + "\n") * 50 + "cursor.execute('SELECT ' + name + '')\n", encoding="utf-8")
+    cache_path = str(tmp_path / "scan-cache.json")
+    
+    truncated = make_agent(budget=0.05, cache_path=cache_path)
+    truncated.scan_files([str(path)])
+    cached = truncated.open_scan_cache().lookup(str(path))
+    rescanned = make_agent(budget=0, cache_path=cache_path)
+    rescanned.scan_files([str(path)])
+    
+    assert "SCAN-001" in {issue.rule_id for issue in truncated.results}
+    assert "VUL-001" not in {issue.rule_id for issue in truncated.results}
+    assert cached is None
+    assert not [issue for issue in rescanned.results if issue.type == "scan"]
+    assert "VUL-001" in {issue.rule_id for issue in rescanned.results}
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests: Lazy Imports und Startzeit des Security-Audit-Agenten
+
+Import von run.py + SecurityAuditAgent() darf keine schweren Module laden,
+kein Logging einrichten und nicht deutlich langsamer werden als in der
+Benchmark-Baseline festgehalten.
+
+Verwendung:
+    python -m pytest agents/security-audit
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from benchmark import STARTUP_LAZY_MODULES, measure_startup
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(AGENT_DIR, "benchmark-baseline.json")
+TOLERANCE = 1.0  # Wie benchmark.py --tolerance (Standard)
+
+def probe(code: str) -> str:
+    """🚀 Code in einem frischen Interpreter mit run.py im Pfad ausführen"""
+    script = f"import sys; sys.path.insert(0, {AGENT_DIR!r}); {code}"
+    return subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                          cwd=AGENT_DIR).stdout.strip()
+
+def test_import_loads_no_heavy_modules():
+    """📦 Import + Konstruktion laden keines der Lazy-Module"""
+    output = probe("import run; run.SecurityAuditAgent(); "
+                   f"print(','.join(m for m in {STARTUP_LAZY_MODULES!r} if m in sys.modules))")
+    assert output == ""
+
+def test_logging_is_set_up_on_first_use():
+    """📝 Logger-Handler erst beim ersten Zugriff, nicht beim Konstruieren"""
+    output = probe("import run; agent = run.SecurityAuditAgent(); before = 'logging' in sys.modules; "
+                   "handlers = len(agent.logger.handlers); print(before, handlers > 0)")
+    assert output == "False True"
+
+def test_startup_within_baseline():
+    """⏱️ Startzeit relativ zum Interpreter-Start innerhalb der Baseline-Toleranz"""
+    with open(BASELINE, encoding="utf-8") as f:
+        expected = json.load(f)["startup"]
+    
+    startup = measure_startup(repeat=3)
+    
+    assert startup["eager_modules"] == []
+    assert startup["relative"] <= expected["relative"] * (1 + TOLERANCE), startup
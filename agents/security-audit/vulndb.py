@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+🗄️ Offline-Vulnerability-Datenbank (SQLite)
+
+Import von OSV- und NVD-Dumps (Dateien, Verzeichnisse, .zip, .json.gz),
+Versionsvergleich und Abgleich ganzer Package-Listen pro Ökosystem.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import re
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 🗄️ Offline-Vulnerability-Datenbank
+VULN_DB_VERSION = 2
+OSV_ECOSYSTEMS = {"pip": "PyPI", "npm": "npm"}
+# NVD: CPE-target_sw -> Ökosystem (andere CPEs lassen sich keinem Package zuordnen)
+CPE_TARGET_ECOSYSTEMS = {"node.js": "npm", "nodejs": "npm", "npm": "npm", "python": "PyPI", "pypi": "PyPI"}
+ADVISORY_SEVERITIES = {"CRITICAL": "critical", "HIGH": "high", "MODERATE": "medium", "MEDIUM": "medium", "LOW": "low"}
+DEFAULT_ADVISORY_SEVERITY = "high"
+_VERSION_TOKEN = re.compile(r"\d+|[a-z]+")
+_PRE_RELEASE_RANK = {"dev": 0, "a": 1, "alpha": 1, "b": 2, "beta": 2, "c": 3, "rc": 3, "pre": 3, "preview": 3}
+_POST_RELEASE = frozenset(["post", "rev", "r", "p"])
+_SQL_BATCH_SIZE = 500
+
+def normalize_package_name(ecosystem: str, name: str) -> str:
+    """
+    📦 Normalisierter Package-Name (PyPI: PEP 503, sonst Kleinschreibung)
+    """
+    name = name.strip().lower()
+    if ecosystem == "PyPI":
+        return re.sub(r"[-_.]+", "-", name)
+    return name
+
+@lru_cache(maxsize=65536)
+def version_key(version: str) -> tuple:
+    """
+    🔢 Vergleichsschlüssel für Versionen (SemVer und PEP 440, vereinfacht)
+    
+    Release-Nummern werden numerisch verglichen (1.0 == 1.0.0),
+    Pre-Releases (dev < alpha < beta < rc) liegen vor dem Release,
+    Post-Releases danach. Build-Metadaten (+...) werden ignoriert.
+    """
+    version = version.strip().lower()
+    if version.startswith('v'):
+        version = version[1:]
+    tokens = _VERSION_TOKEN.findall(version.split('+', 1)[0])
+    
+    release = []
+    while tokens and tokens[0].isdigit():
+        release.append(int(tokens.pop(0)))
+    while release and release[-1] == 0:
+        release.pop()
+    
+    key = [(3, number) for number in release]
+    for token in tokens:
+        if token.isdigit():
+            key.append((3, int(token)))
+        elif token in _POST_RELEASE:
+            key.append((2, 0))
+        else:
+            key.append((0, _PRE_RELEASE_RANK.get(token, 4), token))
+    key.append((1,))  # Ende: Release > Pre-Release, < Post-Release
+    return tuple(key)
+
+def version_in_range(version: str, lower: Optional[str], lower_inclusive: bool,
+                     upper: Optional[str], upper_inclusive: bool) -> bool:
+    """
+    🔢 Liegt version im Bereich [lower, upper] (Grenzen optional/exklusiv)?
+    """
+    key = version_key(version)
+    if lower:
+        lower_key = version_key(lower)
+        if key < lower_key or (key == lower_key and not lower_inclusive):
+            return False
+    if upper:
+        upper_key = version_key(upper)
+        if key > upper_key or (key == upper_key and not upper_inclusive):
+            return False
+    return True
+
+def advisory_severity(*candidates) -> str:
+    """
+    🚦 Severity aus Advisory-Angaben (Text wie HIGH/MODERATE oder CVSS-Score)
+    """
+    for candidate in candidates:
+        if not candidate:
+            continue
+        text = str(candidate).upper()
+        if text in ADVISORY_SEVERITIES:
+            return ADVISORY_SEVERITIES[text]
+        try:
+            score = float(text)
+        except ValueError:
+            continue
+        return "critical" if score >= 9.0 else "high" if score >= 7.0 else "medium" if score >= 4.0 else "low"
+    return DEFAULT_ADVISORY_SEVERITY
+
+def parse_osv_advisory(data: Dict) -> Tuple[tuple, List[tuple]]:
+    """
+    📄 OSV-Advisory -> (Advisory-Zeile, betroffene Bereiche)
+    
+    Bereiche sind (Ökosystem, Package, untere Grenze, inklusiv, obere Grenze,
+    inklusiv, Fix-Version). Explizit gelistete Versionen werden zu
+    Ein-Versions-Bereichen, GIT-Bereiche (Commits) werden ignoriert.
+    """
+    aliases = [data.get("id", "")] + list(data.get("aliases") or [])
+    cve_id = next((alias for alias in aliases if alias.startswith("CVE-")), data.get("id"))
+    cvss_scores = [entry.get("score") for entry in data.get("severity") or [] if entry.get("type", "").startswith("CVSS")]
+    severity = advisory_severity(
+        (data.get("database_specific") or {}).get("severity"),
+        *[score for score in cvss_scores if not str(score).startswith("CVSS:")]
+    )
+    advisory = (data["id"], cve_id, data.get("summary") or data.get("details", "")[:200], severity)
+    
+    ranges = []
+    for affected in data.get("affected") or []:
+        package = affected.get("package") or {}
+        ecosystem, name = package.get("ecosystem"), package.get("name")
+        if not ecosystem or not name:
+            continue
+        ecosystem = ecosystem.split(":", 1)[0]
+        name = normalize_package_name(ecosystem, name)
+        
+        for version_range in affected.get("ranges") or []:
+            if version_range.get("type") == "GIT":
+                continue
+            introduced, open_range = None, False
+            for event in version_range.get("events") or []:
+                if "introduced" in event:
+                    introduced = None if event["introduced"] == "0" else event["introduced"]
+                    open_range = True
+                elif "fixed" in event:
+                    ranges.append((ecosystem, name, introduced, 1, event["fixed"], 0, event["fixed"]))
+                    open_range = False
+                elif "last_affected" in event:
+                    ranges.append((ecosystem, name, introduced, 1, event["last_affected"], 1, None))
+                    open_range = False
+            if open_range:
+                ranges.append((ecosystem, name, introduced, 1, None, 0, None))
+        
+        for version in affected.get("versions") or []:
+            ranges.append((ecosystem, name, version, 1, version, 1, None))
+    
+    return advisory, ranges
+
+def parse_nvd_cve(cve: Dict, metrics: Optional[Dict] = None) -> Tuple[tuple, List[tuple]]:
+    """
+    📄 NVD-CVE (Feed 1.1 oder API 2.0) -> (Advisory-Zeile, betroffene Bereiche)
+    
+    NVD kennt keine Package-Ökosysteme: das Ökosystem kommt aus dem
+    target_sw-Feld der CPE (z.B. node.js -> npm, python -> PyPI), das
+    CPE-Produkt ist der Package-Name. CPEs ohne zuordenbares target_sw
+    werden übersprungen.
+    """
+    if "CVE_data_meta" in cve:
+        # Feed 1.1: {"cve": {...}, "impact": {...}, "configurations": {...}}
+        cve_id = cve["CVE_data_meta"]["ID"]
+        descriptions = (cve.get("description") or {}).get("description_data") or []
+        impact = metrics or {}
+        severity = advisory_severity(
+            ((impact.get("baseMetricV3") or {}).get("cvssV3") or {}).get("baseSeverity"),
+            (impact.get("baseMetricV2") or {}).get("severity")
+        )
+        nodes = (cve.get("configurations") or {}).get("nodes") or []
+    else:
+        cve_id = cve["id"]
+        descriptions = cve.get("descriptions") or []
+        cvss = [
+            entry.get("cvssData", {}).get("baseSeverity") or entry.get("baseSeverity")
+            for key in ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2")
+            for entry in (cve.get("metrics") or {}).get(key) or []
+        ]
+        severity = advisory_severity(*cvss)
+        nodes = [node for config in cve.get("configurations") or [] for node in config.get("nodes") or []]
+    
+    summary = next((entry.get("value", "") for entry in descriptions if entry.get("lang", "en") == "en"), "")
+    advisory = (cve_id, cve_id, summary[:200], severity)
+    
+    ranges = []
+    pending = list(nodes)
+    while pending:
+        node = pending.pop()
+        pending.extend(node.get("children") or [])
+        for match in node.get("cpeMatch") or node.get("cpe_match") or []:
+            if not match.get("vulnerable", True):
+                continue
+            # cpe:2.3:part:vendor:product:version:update:edition:language:sw_edition:target_sw:...
+            cpe = (match.get("criteria") or match.get("cpe23Uri") or "").replace("\\", "").split(":")
+            if len(cpe) < 11 or cpe[2] != "a":
+                continue
+            ecosystem = CPE_TARGET_ECOSYSTEMS.get(cpe[10].lower())
+            if ecosystem is None:
+                continue
+            name, version = normalize_package_name(ecosystem, cpe[4]), cpe[5]
+            if version not in ("*", "-", ""):
+                ranges.append((ecosystem, name, version, 1, version, 1, None))
+                continue
+            lower = match.get("versionStartIncluding") or match.get("versionStartExcluding")
+            upper = match.get("versionEndExcluding") or match.get("versionEndIncluding")
+            ranges.append((
+                ecosystem, name,
+                lower, 0 if "versionStartExcluding" in match else 1,
+                upper, 1 if "versionEndIncluding" in match else 0,
+                match.get("versionEndExcluding")
+            ))
+    
+    return advisory, ranges
+
+def iter_feed_documents(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    📂 JSON-Dokumente einer Feed-Datei (.json, .json.gz, .zip mit JSON-Dateien)
+    """
+    import gzip
+    import zipfile
+    
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for name in sorted(archive.namelist()):
+                if name.endswith('.json'):
+                    yield f"{path}:{name}", archive.read(name)
+    elif path.endswith('.json.gz'):
+        with gzip.open(path, 'rb') as f:
+            yield path, f.read()
+    elif path.endswith('.json'):
+        with open(path, 'rb') as f:
+            yield path, f.read()
+
+def parse_feed_document(data) -> Iterator[Tuple[tuple, List[tuple]]]:
+    """
+    📄 Advisories eines JSON-Dokuments (OSV einzeln/Liste, NVD 1.1, NVD API 2.0)
+    """
+    if isinstance(data, list):
+        for entry in data:
+            yield from parse_feed_document(entry)
+    elif not isinstance(data, dict):
+        return
+    elif "CVE_Items" in data:
+        for item in data["CVE_Items"]:
+            cve = dict(item.get("cve") or {})
+            cve["configurations"] = item.get("configurations")
+            yield parse_nvd_cve(cve, item.get("impact"))
+    elif "vulnerabilities" in data:
+        for item in data["vulnerabilities"]:
+            if "cve" in item:
+                yield parse_nvd_cve(item["cve"])
+            else:
+                yield from parse_feed_document(item)
+    elif "id" in data and "affected" in data:
+        yield parse_osv_advisory(data)
+
+def feed_files(sources: Iterable[str]) -> List[str]:
+    """
+    📂 Alle Feed-Dateien der konfigurierten Quellen
+    """
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, names in os.walk(source):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(('.json', '.json.gz', '.zip')))
+        elif os.path.isfile(source):
+            files.append(source)
+    return files
+
+@dataclass
+class VulnerabilityMatch:
+    advisory_id: str
+    cve_id: str
+    summary: str
+    severity: str
+    fixed_in: Optional[str] = None
+
+class VulnerabilityDatabase:
+    """
+    🗄️ Lokale, indizierte Vulnerability-Datenbank (SQLite)
+    
+    OSV-/NVD-JSON-Dumps werden einmalig in eine SQLite-Datei importiert und
+    nur neu eingelesen, wenn sich die Feed-Dateien (Pfad, Größe, mtime)
+    ändern. Abfragen laufen gebündelt über den Index (Ökosystem, Package);
+    die Versionsprüfung gegen die betroffenen Bereiche erfolgt in Python.
+    Es gibt keine Netzwerkzugriffe.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS advisories (id TEXT PRIMARY KEY, cve_id TEXT, summary TEXT, severity TEXT);
+        CREATE TABLE IF NOT EXISTS affected (
+            advisory_id TEXT, ecosystem TEXT, package TEXT,
+            lower TEXT, lower_inclusive INTEGER, upper TEXT, upper_inclusive INTEGER, fixed_in TEXT
+        );
+        CREATE INDEX IF NOT EXISTS affected_package ON affected (ecosystem, package);
+    """
+    
+    def __init__(self, path: str):
+        import sqlite3
+        
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def advisory_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM advisories").fetchone()[0]
+    
+    def sync(self, sources: Iterable[str]) -> bool:
+        """
+        🔄 Importiere die Feeds, falls sie sich seit dem letzten Import geändert haben
+        
+        Liefert True, wenn neu importiert wurde.
+        """
+        files = feed_files(sources)
+        signature = json.dumps([VULN_DB_VERSION] + [
+            [path, os.stat(path).st_size, os.stat(path).st_mtime_ns] for path in files
+        ])
+        if signature == self.get_meta("feeds"):
+            return False
+        self.import_feeds(files)
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('feeds', ?)", (signature,))
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('imported', ?)", (datetime.now().isoformat(),))
+        return True
+    
+    def import_feeds(self, files: List[str]):
+        """
+        📥 Datenbank vollständig aus den Feed-Dateien neu aufbauen
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM advisories")
+            self.connection.execute("DELETE FROM affected")
+            for file_path in files:
+                for name, raw in iter_feed_documents(file_path):
+                    try:
+                        document = json.loads(raw)
+                    except ValueError:
+                        continue
+                    for advisory, ranges in parse_feed_document(document):
+                        self.connection.execute("INSERT OR REPLACE INTO advisories VALUES (?, ?, ?, ?)", advisory)
+                        self.connection.executemany(
+                            "INSERT INTO affected VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            [(advisory[0],) + affected for affected in ranges]
+                        )
+    
+    def lookup(self, ecosystem: str, packages: Iterable[Tuple[str, Optional[str]]]) -> Dict[Tuple[str, Optional[str]], List[VulnerabilityMatch]]:
+        """
+        🔍 Gebündelte Abfrage: (Package, Version) -> betroffene Advisories
+        
+        Packages ohne auflösbare Version (None, z.B. "latest", "*" oder eine
+        Git-/URL-Abhängigkeit) werden übersprungen - ohne Version lässt sich
+        kein Advisory zuordnen.
+        """
+        wanted: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        for name, version in packages:
+            if version is None:
+                continue
+            wanted.setdefault(normalize_package_name(ecosystem, name), []).append((name, version))
+        
+        results: Dict[Tuple[str, Optional[str]], List[VulnerabilityMatch]] = {}
+        names = list(wanted)
+        for start in range(0, len(names), _SQL_BATCH_SIZE):
+            batch = names[start:start + _SQL_BATCH_SIZE]
+            rows = self.connection.execute(
+                "SELECT a.package, v.id, v.cve_id, v.summary, v.severity, "
+                "a.lower, a.lower_inclusive, a.upper, a.upper_inclusive, a.fixed_in "
+                "FROM affected a JOIN advisories v ON v.id = a.advisory_id "
+                f"WHERE a.ecosystem = ? AND a.package IN ({','.join('?' * len(batch))})",
+                [ecosystem] + batch
+            )
+            for package, advisory_id, cve_id, summary, severity, lower, lower_inc, upper, upper_inc, fixed_in in rows:
+                for name, version in wanted[package]:
+                    if not version_in_range(version, lower, lower_inc, upper, upper_inc):
+                        continue
+                    matches = results.setdefault((name, version), [])
+                    if all(match.advisory_id != advisory_id for match in matches):
+                        matches.append(VulnerabilityMatch(advisory_id, cve_id, summary, severity, fixed_in))
+        return results
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+👀 Datei-Watcher für den Watch-Modus
+
+inotify über ctypes (Linux), sonst mtime-Polling.
+
+@author Lopez IT Welt Team
+@version 1.0.0
+@date 2026-10-18
+"""
+
+import os
+import errno
+import struct
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# 👀 inotify-Ereignisse (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (danach der Name)
+# Nach dem ersten Ereignis kurz weitersammeln (Editoren schreiben oft in mehreren Schritten)
+WATCH_DEBOUNCE = 0.05
+
+class InotifyWatcher:
+    """
+    👀 Änderungserkennung über Linux-inotify (per ctypes, ohne Zusatzpaket)
+    
+    Überwacht die beim Walk besuchten Verzeichnisse. wait() liefert die
+    geänderten Pfade oder None, wenn ein vollständiger Abgleich nötig ist
+    (neue/gelöschte Verzeichnisse, Überlauf der Ereignis-Queue).
+    """
+    
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)  # AttributeError außerhalb von Linux
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.watches: Dict[int, str] = {}  # Watch-Deskriptor -> Verzeichnis
+        self.watched: Dict[str, int] = {}
+    
+    def close(self):
+        os.close(self.fd)
+    
+    def watch_directories(self, directories: Iterable[str]):
+        """
+        📁 Neue Verzeichnisse überwachen (OSError z.B. bei erschöpftem max_user_watches)
+        """
+        for directory in directories:
+            if directory in self.watched:
+                continue
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                error = self._ctypes.get_errno()
+                if error == errno.ENOENT:
+                    continue  # inzwischen gelöscht
+                raise OSError(error, f"inotify_add_watch {directory}: {os.strerror(error)}")
+            self.watches[wd] = directory
+            self.watched[directory] = wd
+    
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """
+        ⏳ Auf Änderungen warten (leere Menge bei Timeout, None = vollständiger Abgleich)
+        """
+        import select
+        
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        time.sleep(WATCH_DEBOUNCE)
+        
+        changed: Set[str] = set()
+        full_sync = False
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                name = data[offset + _INOTIFY_EVENT.size:offset + _INOTIFY_EVENT.size + length].rstrip(b'\0')
+                offset += _INOTIFY_EVENT.size + length
+                
+                if mask & IN_Q_OVERFLOW:
+                    full_sync = True
+                elif mask & IN_IGNORED:
+                    directory = self.watches.pop(wd, None)  # Verzeichnis gelöscht
+                    self.watched.pop(directory, None)
+                elif mask & IN_ISDIR:
+                    full_sync = True
+                elif wd in self.watches:
+                    changed.add(os.path.join(self.watches[wd], os.fsdecode(name)))
+        return None if full_sync else changed
+
+def watch_stat_key(path: str) -> Optional[Tuple[int, int]]:
+    """
+    🔑 Änderungsschlüssel (mtime_ns, Größe) einer Datei (None wenn nicht vorhanden)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class PollingWatcher:
+    """
+    🔄 Fallback ohne inotify: nach jedem Intervall vollständiger Abgleich
+    über mtime/Größe (nur geänderte Dateien werden neu gescannt)
+    """
+    
+    def close(self):
+        pass
+    
+    def watch_directories(self, directories: Iterable[str]):
+        pass
+    
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        time.sleep(timeout)
+        return None
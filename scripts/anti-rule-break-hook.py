@@ -46,6 +46,9 @@ PROTECTED_RULES = [
     "System-Zeit-Verwendung"
 ]
 
+# Security-Audit-Client (warmer Scan-Server, sonst in-process)
+SECURITY_AUDIT_CLIENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "agents", "security-audit", "client.py")
+
 # Blockierte Daten
 BLOCKED_DATES = [
     "2025-01-19",
@@ -310,6 +313,24 @@ class AntiRuleBreakHook:
         print("🧹 Anti-Regelbruch-Verstöße zurückgesetzt")
 
 
+def security_scan(changed_files: List[str]) -> Optional[Dict]:
+    """
+    🔐 Gestagte Dateien über den Security-Audit-Client prüfen
+    """
+    if not os.path.exists(SECURITY_AUDIT_CLIENT):
+        return None
+    
+    import importlib.util
+    
+    spec = importlib.util.spec_from_file_location("security_audit_client", SECURITY_AUDIT_CLIENT)
+    client = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(client)
+    
+    response = client.scan("staged", changed_files)
+    client.print_verdict(response)
+    return response
+
+
 def pre_commit_hook() -> None:
     """
     Pre-commit Hook Funktion
@@ -336,6 +357,11 @@ def pre_commit_hook() -> None:
                     print(f"❌ Pre-Commit Hook blockiert: {validation['reason']}")
                     sys.exit(1)
         
+        security = security_scan(changed_files)
+        if security is not None and security["blocked"]:
+            print("❌ Pre-Commit Hook blockiert: kritische Security-Issues in gestagten Dateien")
+            sys.exit(1)
+        
         print("✅ Pre-Commit Hook erfolgreich")
     except subprocess.CalledProcessError as e:
         print(f"❌ Pre-Commit Hook Fehler: {e}")